@@ -0,0 +1,11 @@
+-- aiogram FSM state and data per storage key, see telegram_bot/fsm_storage.py.
+-- A key without state or data has no row; expired rows are deleted by the storage's sweep.
+create table if not exists fsm_states
+(
+    key        TEXT    NOT NULL PRIMARY KEY,
+    state      TEXT,
+    data       TEXT,
+    expires_at INTEGER NOT NULL
+) without rowid;
+
+create index if not exists idx_fsm_states_expires_at on fsm_states (expires_at);
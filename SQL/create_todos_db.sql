@@ -3,7 +3,7 @@ create table if not exists todos
     id             INTEGER PRIMARY KEY AUTOINCREMENT,
     task           TEXT NOT NULL,
     category       TEXT DEFAULT 'BACKLOG',
-    date_added     TEXT NOT NULL,
-    date_completed TEXT,
-    status         TEXT DEFAULT 'UNDONE'
+    date_added     INTEGER NOT NULL,
+    date_completed INTEGER,
+    status         INTEGER DEFAULT 0
 )
@@ -0,0 +1,7 @@
+-- is_todo_exists looks todos up by task and category
+create index if not exists idx_todos_task_category on todos (task, category);
+
+-- Listing filters by status or category, newest first
+create index if not exists idx_todos_status_date_added on todos (status, date_added);
+create index if not exists idx_todos_category_date_added on todos (category, date_added);
+create index if not exists idx_todos_date_added on todos (date_added);
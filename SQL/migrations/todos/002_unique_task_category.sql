@@ -0,0 +1,7 @@
+-- A todo is identified by its task and category, so adds can use INSERT ... ON CONFLICT.
+-- Keep the oldest of any duplicates written before the constraint existed.
+delete from todos
+where id not in (select min(id) from todos group by task, category);
+
+drop index if exists idx_todos_task_category;
+create unique index if not exists ux_todos_task_category on todos (task, category);
@@ -0,0 +1,5 @@
+-- Todos belong to a user; listing a user's todos is a range scan of idx_todos_user_id.
+-- The reference is enforced when the todos and users tables share a database with foreign_keys on.
+alter table todos add column user_id INTEGER REFERENCES users (id) ON DELETE CASCADE;
+
+create index if not exists idx_todos_user_id on todos (user_id, id);
@@ -0,0 +1,4 @@
+-- inv_cli lists todos in id order a page at a time (WHERE ... AND id > ? ORDER BY id LIMIT ?).
+-- With these, a page filtered by status or category is an index range scan instead of a sort of every match.
+create index if not exists idx_todos_status_id on todos (status, id);
+create index if not exists idx_todos_category_id on todos (category, id);
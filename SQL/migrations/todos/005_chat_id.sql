@@ -0,0 +1,9 @@
+-- Todos added from a Telegram chat belong to that chat; 0 is the chat of the CLI and scripts.
+-- A task is unique per chat, so every chat can keep its own "Buy milk".
+alter table todos add column chat_id INTEGER NOT NULL DEFAULT 0;
+
+drop index if exists ux_todos_task_category;
+create unique index if not exists ux_todos_task_category_chat on todos (task, category, chat_id);
+
+-- The bot lists, completes and counts one chat's todos by status
+create index if not exists idx_todos_chat_status on todos (chat_id, status, id);
@@ -0,0 +1,28 @@
+-- Full-text index of the task text, used by todo_srv.search_todos. It stores no text of its own
+-- (external content): the triggers mirror every change of todos.task, keyed by the todo id.
+create virtual table if not exists todos_fts using fts5
+(
+    task,
+    content = 'todos',
+    content_rowid = 'id',
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+
+create trigger if not exists todos_fts_after_insert after insert on todos
+begin
+    insert into todos_fts (rowid, task) values (new.id, new.task);
+end;
+
+create trigger if not exists todos_fts_after_delete after delete on todos
+begin
+    insert into todos_fts (todos_fts, rowid, task) values ('delete', old.id, old.task);
+end;
+
+create trigger if not exists todos_fts_after_update after update of task on todos
+begin
+    insert into todos_fts (todos_fts, rowid, task) values ('delete', old.id, old.task);
+    insert into todos_fts (rowid, task) values (new.id, new.task);
+end;
+
+-- Index the todos that existed before this migration
+insert into todos_fts (todos_fts) values ('rebuild');
@@ -0,0 +1,83 @@
+-- Dates are epoch seconds and the status is its integer code (Status.value). Databases created before
+-- that declared date_added, date_completed and status as TEXT: their dates are 'YYYY-MM-DD HH:MM' local
+-- time and their status '0', '1', 'UNDONE' or 'DONE', and with TEXT affinity even new integers are
+-- stored as text, so epoch comparisons and sorting break. SQLite cannot change a column type in place:
+-- the table is rebuilt with INTEGER columns and every value converted. Ids are kept, so user and
+-- full-text references stay valid.
+create table todos_new
+(
+    id             INTEGER PRIMARY KEY AUTOINCREMENT,
+    task           TEXT NOT NULL,
+    category       TEXT DEFAULT 'BACKLOG',
+    date_added     INTEGER NOT NULL,
+    date_completed INTEGER,
+    status         INTEGER DEFAULT 0,
+    user_id        INTEGER REFERENCES users (id) ON DELETE CASCADE,
+    chat_id        INTEGER NOT NULL DEFAULT 0
+);
+
+insert into todos_new (id, task, category, date_added, date_completed, status, user_id, chat_id)
+select id,
+       task,
+       category,
+       -- A date_added that cannot be parsed falls back to the migration time, as the column is NOT NULL
+       coalesce(
+           case
+               when typeof(date_added) in ('integer', 'real') then cast(date_added as integer)
+               when date_added not glob '*[^0-9]*' and date_added <> '' then cast(date_added as integer)
+               else cast(strftime('%s', date_added, 'utc') as integer)
+           end,
+           cast(strftime('%s', 'now') as integer)
+       ),
+       case
+           when date_completed is null or date_completed = '' then null
+           when typeof(date_completed) in ('integer', 'real') then cast(date_completed as integer)
+           when date_completed not glob '*[^0-9]*' then cast(date_completed as integer)
+           else cast(strftime('%s', date_completed, 'utc') as integer)
+       end,
+       case upper(trim(coalesce(status, '0')))
+           when 'DONE' then 1
+           when 'UNDONE' then 0
+           else cast(status as integer)
+       end,
+       user_id,
+       chat_id
+from todos;
+
+-- Keep AUTOINCREMENT from reusing the ids of deleted todos
+update sqlite_sequence
+set seq = max(seq, coalesce((select seq from sqlite_sequence where name = 'todos'), 0))
+where name = 'todos_new';
+insert into sqlite_sequence (name, seq)
+select 'todos_new', seq from sqlite_sequence
+where name = 'todos' and not exists (select 1 from sqlite_sequence where name = 'todos_new');
+
+drop table todos;
+alter table todos_new rename to todos;
+
+-- Indexes of migrations 001 to 005, dropped with the old table
+create index idx_todos_status_date_added on todos (status, date_added);
+create index idx_todos_category_date_added on todos (category, date_added);
+create index idx_todos_date_added on todos (date_added);
+create unique index ux_todos_task_category_chat on todos (task, category, chat_id);
+create index idx_todos_user_id on todos (user_id, id);
+create index idx_todos_status_id on todos (status, id);
+create index idx_todos_category_id on todos (category, id);
+create index idx_todos_chat_status on todos (chat_id, status, id);
+
+-- Full-text triggers of migration 006, dropped with the old table
+create trigger todos_fts_after_insert after insert on todos
+begin
+    insert into todos_fts (rowid, task) values (new.id, new.task);
+end;
+
+create trigger todos_fts_after_delete after delete on todos
+begin
+    insert into todos_fts (todos_fts, rowid, task) values ('delete', old.id, old.task);
+end;
+
+create trigger todos_fts_after_update after update of task on todos
+begin
+    insert into todos_fts (todos_fts, rowid, task) values ('delete', old.id, old.task);
+    insert into todos_fts (rowid, task) values (new.id, new.task);
+end;
@@ -0,0 +1,29 @@
+-- A revision per chat, bumped by every change of the chat's todos in any process. The bot checks its
+-- cached lists and stats against it (telegram_bot/chat_cache.py), so several polling processes sharing
+-- the database never serve a list older than the last write.
+create table if not exists todo_chat_revisions
+(
+    chat_id  INTEGER PRIMARY KEY,
+    revision INTEGER NOT NULL
+);
+
+create trigger if not exists todos_chat_revision_after_insert after insert on todos
+begin
+    insert into todo_chat_revisions (chat_id, revision) values (new.chat_id, 1)
+    on conflict (chat_id) do update set revision = revision + 1;
+end;
+
+create trigger if not exists todos_chat_revision_after_delete after delete on todos
+begin
+    insert into todo_chat_revisions (chat_id, revision) values (old.chat_id, 1)
+    on conflict (chat_id) do update set revision = revision + 1;
+end;
+
+-- A todo moved to another chat changes both chats
+create trigger if not exists todos_chat_revision_after_update after update on todos
+begin
+    insert into todo_chat_revisions (chat_id, revision) values (old.chat_id, 1)
+    on conflict (chat_id) do update set revision = revision + 1;
+    insert into todo_chat_revisions (chat_id, revision) select new.chat_id, 1 where new.chat_id <> old.chat_id
+    on conflict (chat_id) do update set revision = revision + 1;
+end;
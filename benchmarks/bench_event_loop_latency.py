@@ -0,0 +1,91 @@
+"""
+Event-loop latency while 100 coroutines call `get_all_todos` concurrently.
+
+"blocking" reproduces the previous behaviour, where queries were coroutines that ran sqlite3
+directly on the event loop. "worker thread" goes through AsyncDatabaseManager.
+
+Run with: python -m benchmarks.bench_event_loop_latency [--rows N] [--calls N]
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+
+from lazy_orm.async_db_manager import AsyncDatabaseManager
+from lazy_orm.db_manager import DatabaseManager
+from service.todo_srv import TODOS_TABLE, get_all_todos
+
+TICK_INTERVAL = 0.001
+CREATE_TODOS_SQL = 'SQL/create_todos_db.sql'
+
+
+class BlockingDatabaseManager:
+    """The pre-AsyncDatabaseManager behaviour: an `async` method that blocks the loop."""
+
+    def __init__(self, manager: DatabaseManager) -> None:
+        self._manager = manager
+
+    async def run(self, function, *args, **kwargs):
+        return function(self._manager, *args, **kwargs)
+
+
+def _populate(db_dir: str, rows: int) -> None:
+    manager = DatabaseManager(TODOS_TABLE, db_dir)
+    with open(CREATE_TODOS_SQL) as script_file, manager.connection() as connection:
+        connection.executescript(script_file.read())
+    manager.insert_rows(TODOS_TABLE, (
+        {'task': f'Task {i}', 'category': 'BACKLOG', 'date_added': 1735689600, 'status': 0}
+        for i in range(rows)
+    ))
+    manager.close()
+
+
+async def _measure(db_manager, calls: int) -> dict:
+    lags = []
+    stop = asyncio.Event()
+
+    async def heartbeat():
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(TICK_INTERVAL)
+            lags.append(time.perf_counter() - started - TICK_INTERVAL)
+
+    ticker = asyncio.create_task(heartbeat())
+    started = time.perf_counter()
+    await asyncio.gather(*(get_all_todos(db_manager) for _ in range(calls)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+
+    lags.sort()
+    return {
+        'total_s': elapsed,
+        'ticks': len(lags),
+        'p50_lag_ms': lags[len(lags) // 2] * 1000 if lags else 0.0,
+        'max_lag_ms': lags[-1] * 1000 if lags else 0.0,
+    }
+
+
+async def main(rows: int, calls: int) -> None:
+    with tempfile.TemporaryDirectory() as db_dir:
+        _populate(db_dir, rows)
+
+        blocking_manager = DatabaseManager(TODOS_TABLE, db_dir)
+        before = await _measure(BlockingDatabaseManager(blocking_manager), calls)
+        blocking_manager.close()
+
+        async with AsyncDatabaseManager(TODOS_TABLE, db_dir) as async_manager:
+            after = await _measure(async_manager, calls)
+
+    print(f'{calls} concurrent get_all_todos over {rows} rows')
+    for label, result in (('blocking', before), ('worker thread', after)):
+        print(f"{label:>14}: total {result['total_s']:.3f}s, heartbeat ticks {result['ticks']}, "
+              f"p50 lag {result['p50_lag_ms']:.2f}ms, max lag {result['max_lag_ms']:.2f}ms")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--calls', type=int, default=100)
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.rows, arguments.calls))
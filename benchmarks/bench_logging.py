@@ -0,0 +1,113 @@
+"""
+Caller-side cost of logging, with handlers attached directly and behind the logging queue.
+
+Two cases run per configuration: a bare `logging.info` call, and a one-row insert_rows, the
+query path that logs two INFO lines per call. Every operation is timed on the logging thread and
+the mean, 99th percentile and maximum are reported in microseconds. With the queue, formatting
+and writing happen on the listener thread: on a single core that work still competes for the
+interpreter, so the mean moves little, while the tail no longer contains file writes and
+rotations. The timed loop logs faster than any handler writes, so the queue fills up: with
+blocking the caller then waits for the listener, while with dropping, the default, it never
+waits and the number of dropped records is reported. The console goes to os.devnull and the log
+files to a temporary directory.
+
+Run with: python -m benchmarks.bench_logging [--calls 20000]
+"""
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict
+
+from lazy_orm.db_manager import DatabaseManager
+from utils.logging_simp_inv import DEFAULT_QUEUE_SIZE, build_handlers, setup_logging, stop_logging
+
+CREATE_TABLE_SQL = 'CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT NOT NULL)'
+
+
+def _direct(log_dir: str, devnull) -> None:
+    # The former setup: the handlers write on the thread that logs
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    for handler in build_handlers(os.path.join(log_dir, 'direct.log'), stream=devnull):
+        root.addHandler(handler)
+
+
+def _reset_direct() -> None:
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+
+def _null() -> None:
+    # Without any handler, logging.info would install a console handler through basicConfig
+    logging.getLogger().addHandler(logging.NullHandler())
+
+
+def _time_us(operation: Callable[[int], None], calls: int) -> Dict[str, float]:
+    timings = []
+    for number in range(calls):
+        started = time.perf_counter()
+        operation(number)
+        timings.append((time.perf_counter() - started) * 1e6)
+    timings.sort()
+    return {'mean': statistics.fmean(timings), 'p99': timings[int(calls * 0.99)], 'max': timings[-1]}
+
+
+def _queue(log_file: str, devnull, queue_size: int, **options) -> Callable[[], None]:
+    return lambda: setup_logging(log_file=log_file, queue_size=queue_size, stream=devnull, **options)
+
+
+def run(calls: int, queue_size: int) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Returns the timing statistics of every case under every configuration, in microseconds, and the
+    number of dropped records.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, 'w') as devnull:
+        configurations: Dict[str, Callable[[], None]] = {
+            'no handlers': _null,
+            'direct handlers': lambda: _direct(log_dir, devnull),
+            'queue, blocking': _queue(os.path.join(log_dir, 'block.log'), devnull, queue_size, block=True),
+            'queue, dropping': _queue(os.path.join(log_dir, 'drop.log'), devnull, queue_size),
+            'queue, JSON lines, dropping': _queue(os.path.join(log_dir, 'json.log'), devnull, queue_size,
+                                                  json_lines=True),
+        }
+        for name, configure in configurations.items():
+            logging.getLogger().setLevel(logging.INFO)
+            configure()
+            manager = DatabaseManager('bench', DatabaseManager.IN_MEMORY_DIRECTORY)
+            manager._execute_query(CREATE_TABLE_SQL)
+            try:
+                results[name] = {
+                    'logging.info': _time_us(lambda number: logging.info(f'Logged call {number}.'), calls),
+                    'insert_rows (2 INFO lines)': _time_us(
+                        lambda number: manager.insert_rows('items', [{'name': f'item {number}'}]), calls
+                    ),
+                }
+            finally:
+                manager.close()
+                results[name]['dropped records'] = stop_logging()
+                _reset_direct()
+    return results
+
+
+def main(args: argparse.Namespace) -> None:
+    results = run(args.calls, args.queue_size)
+    for name, cases in results.items():
+        print(name)
+        dropped = cases.pop('dropped records')
+        for case, timing in cases.items():
+            print(f"  {case:<28} mean {timing['mean']:8.2f}  p99 {timing['p99']:8.2f}  max {timing['max']:9.2f} us")
+        if dropped:
+            print(f'  {dropped} records dropped')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--calls', type=int, default=20_000, help='operations timed per case')
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE)
+    main(parser.parse_args())
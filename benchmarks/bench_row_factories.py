@@ -0,0 +1,65 @@
+"""
+Time and memory per fetched row for each row factory.
+
+Every factory fetches the same todos; memory is the peak traced allocation while holding the
+whole result, divided by the row count.
+
+Run with: python -m benchmarks.bench_row_factories [--rows N]
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+
+from lazy_orm.db_manager import DatabaseManager
+from lazy_orm.row_factories import dict_rows, namedtuple_rows, sqlite_rows, tuple_rows
+from service.todo_srv import TODO_COLUMNS, TODO_MODEL_ROWS, TODOS_TABLE
+
+CREATE_TODOS_SQL = 'SQL/create_todos_db.sql'
+ROW_FACTORIES = {
+    'tuple': tuple_rows,
+    'sqlite3.Row': sqlite_rows,
+    'namedtuple': namedtuple_rows,
+    'dict': dict_rows,
+    'Todo model': TODO_MODEL_ROWS,
+}
+
+
+def _populate(manager: DatabaseManager, rows: int) -> None:
+    with open(CREATE_TODOS_SQL) as script_file, manager.connection() as connection:
+        connection.executescript(script_file.read())
+    manager.insert_rows(TODOS_TABLE, (
+        {'task': f'Task {i}', 'category': 'BACKLOG', 'date_added': 1735689600, 'status': 0}
+        for i in range(rows)
+    ))
+
+
+def _measure(manager: DatabaseManager, row_factory, rows: int) -> dict:
+    started = time.perf_counter()
+    manager.fetch_all_rows(TODOS_TABLE, TODO_COLUMNS, row_factory)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    result = manager.fetch_all_rows(TODOS_TABLE, TODO_COLUMNS, row_factory)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    return {'us_per_row': elapsed / rows * 1e6, 'bytes_per_row': peak / rows}
+
+
+def main(rows: int) -> None:
+    with tempfile.TemporaryDirectory() as db_dir:
+        manager = DatabaseManager(TODOS_TABLE, db_dir)
+        _populate(manager, rows)
+        print(f'fetch_all_rows over {rows} todos')
+        for name, row_factory in ROW_FACTORIES.items():
+            result = _measure(manager, row_factory, rows)
+            print(f"{name:>12}: {result['us_per_row']:.2f} us/row, {result['bytes_per_row']:.0f} bytes/row")
+        manager.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    main(parser.parse_args().rows)
@@ -0,0 +1,195 @@
+"""
+Reproducible benchmarks of DatabaseManager, the service layer and the model conversions.
+
+Every case runs against a fresh database per table size, on disk (a temporary directory) and in
+memory, and reports microseconds per operation (per row for bulk cases). Results are written as
+JSON; given a baseline file from an earlier run, cases slower than the baseline by more than the
+threshold are reported and the exit status is 1.
+
+Email validation is replaced by lowercasing while benchmarking add_user, so no DNS lookups are timed.
+
+Run with: python -m benchmarks.bench_suite [--sizes 1000 100000 1000000] [--storage disk memory]
+          [--output results.json] [--baseline previous.json] [--threshold 0.25]
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from typing import Callable, Dict, Iterable, List
+from unittest.mock import patch
+
+from lazy_orm.async_db_manager import AsyncDatabaseManager
+from lazy_orm.db_manager import DatabaseManager
+from lazy_orm.row_factories import tuple_rows
+from model.todo_model import Todo
+from model.user_model import User
+from service.todo_srv import TODO_COLUMNS, TODO_MODEL_ROWS, TODOS_TABLE, add_todo, get_all_todos
+from service.user_srv import USER_COLUMNS, USER_MODEL_ROWS, USERS_TABLE, add_user, get_all_users, insert_users
+from utils.email import EmailCheck
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+STORAGES = ('disk', 'memory')
+# Number of single-row operations timed per case, capped by the table size
+SINGLE_ROW_OPERATIONS = 1_000
+COUNT_REPEATS = 100
+DATE_ADDED = 1735689600
+
+
+def _best_of(repeat: int, function: Callable[[], object], operations: int) -> float:
+    """Returns the fastest of `repeat` runs in microseconds per operation."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best / operations * 1e6
+
+
+def _once(function: Callable[[], object], operations: int) -> float:
+    return _best_of(1, function, operations)
+
+
+def _todo_rows(start: int, count: int):
+    return (
+        {'task': f'Task {i}', 'category': 'BACKLOG', 'date_added': DATE_ADDED, 'status': 0}
+        for i in range(start, start + count)
+    )
+
+
+def _user_rows(start: int, count: int):
+    return ({'username': f'user{i}', 'email': f'user{i}@example.com', 'age': 30} for i in range(start, start + count))
+
+
+def _open(db_name: str, storage: str, db_dir: str) -> AsyncDatabaseManager:
+    return AsyncDatabaseManager(db_name, DatabaseManager.IN_MEMORY_DIRECTORY if storage == 'memory' else db_dir)
+
+
+def bench_todos(db: AsyncDatabaseManager, size: int, repeat: int) -> Dict[str, float]:
+    manager = db.manager
+    operations = min(SINGLE_ROW_OPERATIONS, size)
+    results = {'insert_rows': _once(lambda: manager.insert_rows(TODOS_TABLE, _todo_rows(0, size)), size)}
+
+    results['insert_row'] = _once(lambda: [
+        manager.insert_row(TODOS_TABLE, row) for row in _todo_rows(size, operations)
+    ], operations)
+    results['add_todo'] = _once(lambda: [
+        add_todo(manager, Todo(f'Service task {i}', date_added=DATE_ADDED)) for i in range(operations)
+    ], operations)
+    rows = manager.get_row_count(TODOS_TABLE)
+
+    results['get_row_count'] = _best_of(repeat, lambda: [
+        manager.get_row_count(TODOS_TABLE, use_cache=False) for _ in range(COUNT_REPEATS)
+    ], COUNT_REPEATS)
+    results['fetch_all_rows[dict]'] = _best_of(repeat, lambda: manager.fetch_all_rows(TODOS_TABLE, TODO_COLUMNS), rows)
+    results['get_all_todos[Todo]'] = _best_of(
+        repeat, lambda: asyncio.run(get_all_todos(db, TODO_MODEL_ROWS)), rows
+    )
+
+    tuples = manager.fetch_all_rows(TODOS_TABLE, TODO_COLUMNS, tuple_rows)
+    todos = list(map(Todo.from_row, tuples))
+    results['Todo.from_row'] = _best_of(repeat, lambda: list(map(Todo.from_row, tuples)), rows)
+    results['Todo.to_row'] = _best_of(repeat, lambda: [todo.to_row() for todo in todos], rows)
+
+    results['update_rows'] = _once(lambda: [
+        manager.update_rows(TODOS_TABLE, {'status': 1}, 'id = ?', [row_id]) for row_id in range(1, operations + 1)
+    ], operations)
+    results['delete_row'] = _once(lambda: [
+        manager.delete_row(TODOS_TABLE, row_id) for row_id in range(1, operations + 1)
+    ], operations)
+    return results
+
+
+def bench_users(db: AsyncDatabaseManager, size: int, repeat: int) -> Dict[str, float]:
+    manager = db.manager
+    operations = min(SINGLE_ROW_OPERATIONS, size)
+    results = {'insert_users': _once(lambda: insert_users(manager, _user_rows(0, size)), size)}
+    results['add_user'] = _once(lambda: [
+        add_user(manager, f'user{i}', f'user{i}@example.com', 30) for i in range(size, size + operations)
+    ], operations)
+    rows = manager.get_row_count(USERS_TABLE)
+
+    results['get_all_users[User]'] = _best_of(
+        repeat, lambda: asyncio.run(get_all_users(db, USER_MODEL_ROWS)), rows
+    )
+    tuples = manager.fetch_all_rows(USERS_TABLE, USER_COLUMNS, tuple_rows)
+    results['User.from_row'] = _best_of(repeat, lambda: list(map(User.from_row, tuples)), rows)
+    return results
+
+
+def _lowercase_emails(emails: Iterable[str]) -> List[EmailCheck]:
+    return [EmailCheck(email, email.lower(), None) for email in emails]
+
+
+def run(sizes: List[int], storages: List[str], repeat: int) -> Dict[str, float]:
+    """
+    Runs every case and returns microseconds per operation keyed by 'storage/size/case'.
+    """
+    results = {}
+    for storage in storages:
+        for size in sizes:
+            with tempfile.TemporaryDirectory() as db_dir, ExitStack() as stack:
+                stack.enter_context(patch('service.user_srv.validate_and_normalize_email', str.lower))
+                stack.enter_context(patch('service.user_srv.validate_many', _lowercase_emails))
+                for db_name, bench in ((TODOS_TABLE, bench_todos), (USERS_TABLE, bench_users)):
+                    db = _open(db_name, storage, db_dir)
+                    try:
+                        for case, value in bench(db, size, repeat).items():
+                            results[f'{storage}/{size}/{case}'] = value
+                            print(f'{storage:>6} {size:>9} {case:<22} {value:10.3f} us/op', flush=True)
+                    finally:
+                        asyncio.run(db.close())
+    return results
+
+
+def compare(baseline: Dict[str, float], current: Dict[str, float], threshold: float) -> List[str]:
+    """
+    Returns a description of every case slower than its baseline by more than `threshold` (0.25 = 25%).
+    """
+    regressions = []
+    for case, value in current.items():
+        previous = baseline.get(case)
+        if previous and value > previous * (1 + threshold):
+            regressions.append(f'{case}: {previous:.3f} -> {value:.3f} us/op (+{(value / previous - 1) * 100:.0f}%)')
+    return regressions
+
+
+def main(args: argparse.Namespace) -> int:
+    results = run(args.sizes, args.storage, args.repeat)
+    report = {
+        'environment': {
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+        },
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+        print(f'Results written to {args.output}')
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as baseline_file:
+        regressions = compare(json.load(baseline_file)['results'], results, args.threshold)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    print(f'{len(regressions)} regressions past {args.threshold:.0%} against {args.baseline}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--storage', choices=STORAGES, nargs='+', default=list(STORAGES))
+    parser.add_argument('--repeat', type=int, default=3, help='runs per read case; the fastest is kept')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='JSON results of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown, 0.25 = 25%%')
+    sys.exit(main(parser.parse_args()))
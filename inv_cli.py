@@ -1,75 +1,333 @@
-import typer
-from rich.console import Console
-from rich.table import Table
+"""
+Todo list command line interface, backed by the application database.
 
-from model.todo_model import Todo, Category
+Run with: python inv_cli.py --help
 
-console = Console()
+Only click and the todo model are imported at startup. The database layer and rich are imported
+by the commands that use them, so --help and argument errors never pay for them, and listings
+rendered as TSV or JSON never import rich at all.
+"""
+import logging
+import sys
+from typing import Dict, Optional
 
-app = typer.Typer()
+import click
 
-todos = [
-    Todo('Buy groceries'),
-    Todo('Complete Python project'),
-    Todo('Go for a run')
-]
+from model.todo_model import CATEGORY_BY_NAME, Status, Todo, format_timestamp
 
+CATEGORY_CHOICE = click.Choice(list(CATEGORY_BY_NAME), case_sensitive=False)
+STATUS_CHOICE = click.Choice([status.lower() for status in Status.__members__], case_sensitive=False)
+IMPORT_FORMATS = ('csv', 'json')
+LIST_FORMATS = ('table', 'tsv', 'json')
+DATE_TYPE = click.DateTime(formats=['%Y-%m-%d', '%Y-%m-%d %H:%M'])
+COLUMN_TITLES = ('ID', 'Task', 'Category', 'Date Added', 'Date Completed', 'Status')
+# Placed around matched words by search; characters no task contains, turned into rich styles by _print_table
+HIGHLIGHT_MARKERS = ('\x02', '\x03')
+
+
+@click.group(context_settings={'help_option_names': ['-h', '--help']})
+@click.option('--db-dir', envvar='INV_DB_DIR', default='data', show_default=True,
+              help='Directory holding the database file (env: INV_DB_DIR).')
+@click.option('-v', '--verbose', is_flag=True, help='Log database activity.')
+@click.pass_context
+def app(context: click.Context, db_dir: str, verbose: bool) -> None:
+    """Manage your todo list."""
+    logging.basicConfig(level=logging.INFO if verbose else logging.ERROR)
+    context.obj = {'db_dir': db_dir}
+
+
+def _database():
+    """
+    Opens the database on first use and closes it when the command finishes.
+    """
+    context = click.get_current_context().find_root()
+    if 'db' not in context.obj:
+        from service.app_db import open_app_database
+
+        context.obj['db'] = open_app_database(context.obj['db_dir'])
+        context.call_on_close(context.obj['db'].close)
+    return context.obj['db']
 
-@app.command('new', short_help='Create a new task')
-def create_task(name: str, cat: str = 'BACKLOG'):
-    if cat.upper() not in Category.__members__:
-        console.print(
-            f"[red]Error: '{cat}' is not a valid category. Valid options are: {', '.join(Category.__members__.keys())}[/red]")
-        return
 
-    cat = Category[cat.upper()]
-    todos.append(Todo(name, category=cat))
-    console.print(f"Task '{name}' created successfully!")
-    list_tasks()
-
-
-@app.command('list', short_help='List all tasks')
-def list_tasks():
-    table = Table(title="To-Do List")
-    table.add_column("ID", justify="right", style="cyan", no_wrap=True)
-    table.add_column("Task", style="magenta")
-    table.add_column("Category", style="green")
-    table.add_column("Date Added", style="yellow")
-    table.add_column("Date Completed", style="blue")
-    table.add_column("Status", style="red")
-
-    for todo_item in todos:
-        table.add_row(
-            str(todo_item.position),
-            todo_item.task,
-            str(todo_item.category.name),
-            str(todo_item.date_added) if todo_item.date_added else "N/A",
-            str(todo_item.date_completed) if todo_item.date_completed else "N/A",
-            str(todo_item.status.name),
+def _todo_cells(todo_item: Todo) -> tuple:
+    """
+    Returns the displayed text of a Todo, one string per COLUMN_TITLES entry.
+    """
+    return (
+        str(todo_item._id),
+        todo_item.task,
+        str(todo_item.category.name),
+        format_timestamp(todo_item.date_added) if todo_item.date_added else "N/A",
+        format_timestamp(todo_item.date_completed) if todo_item.date_completed else "N/A",
+        str(todo_item.status.name),
+    )
 
+
+def _print_table(pages, title: str, highlighted_tasks: Optional[Dict[int, str]] = None) -> None:
+    """
+    Renders pages of Todo objects as a rich table, printing every page as soon as it is fetched.
+
+    Each page is its own table; fixed column widths and a header on the first page only make the
+    pages read as one table, and no more than one page is held in memory. `highlighted_tasks` maps
+    todo ids to task text with HIGHLIGHT_MARKERS around the words to emphasize.
+    """
+    from rich import box
+    from rich.console import Console
+    from rich.markup import escape
+    from rich.table import Table
+
+    def page_table(first: bool) -> Table:
+        table = Table(
+            title=title if first else None, show_header=first, box=box.SIMPLE_HEAD, show_edge=False, expand=True,
+            collapse_padding=True, pad_edge=False
         )
+        table.add_column(COLUMN_TITLES[0], justify="right", style="cyan", no_wrap=True, width=5)
+        table.add_column(COLUMN_TITLES[1], style="magenta", ratio=1, min_width=10)
+        table.add_column(COLUMN_TITLES[2], style="green", width=11)
+        table.add_column(COLUMN_TITLES[3], style="yellow", width=16)
+        table.add_column(COLUMN_TITLES[4], style="blue", width=16)
+        table.add_column(COLUMN_TITLES[5], style="red", width=6)
+        return table
+
+    console = Console()
+    first = True
+    for todos in pages:
+        table = page_table(first)
+        for todo_item in todos:
+            cells = _todo_cells(todo_item)
+            if highlighted_tasks and todo_item._id in highlighted_tasks:
+                task = escape(highlighted_tasks[todo_item._id])
+                cells = (cells[0], task.replace(HIGHLIGHT_MARKERS[0], '[reverse]').replace(HIGHLIGHT_MARKERS[1], '[/]'),
+                         *cells[2:])
+            table.add_row(*cells)
+        console.print(table)
+        first = False
+    if first:
+        console.print(page_table(first))
+
+
+def _print_tsv(pages) -> None:
+    """
+    Writes pages of Todo objects as tab-separated values with a header line.
+    """
+    write = sys.stdout.write
+    write('\t'.join(COLUMN_TITLES) + '\n')
+    for todos in pages:
+        write(''.join('\t'.join(cell.replace('\t', ' ') for cell in _todo_cells(todo_item)) + '\n'
+                      for todo_item in todos))
+        sys.stdout.flush()
+
+
+def _print_json(pages) -> None:
+    """
+    Writes pages of Todo objects as one JSON array, streamed as it is built. Dates are epoch seconds.
+    """
+    import json
+
+    write = sys.stdout.write
+    separator = '[\n'
+    for todos in pages:
+        for todo_item in todos:
+            write(separator + json.dumps({
+                'id': todo_item._id,
+                'task': todo_item.task,
+                'category': todo_item.category.name,
+                'date_added': todo_item.date_added,
+                'date_completed': todo_item.date_completed,
+                'status': todo_item.status.name,
+            }))
+            separator = ',\n'
+        sys.stdout.flush()
+    write('[]\n' if separator == '[\n' else '\n]\n')
+
+
+def _print_todos(pages, title: str, output_format: str = 'table') -> None:
+    """
+    Prints pages (lists) of Todo objects in the requested format.
+    """
+    if output_format == 'tsv':
+        _print_tsv(pages)
+    elif output_format == 'json':
+        _print_json(pages)
+    else:
+        _print_table(pages, title)
+
+
+def _report(outcome, success: str, missing: str) -> None:
+    """
+    Prints the outcome of a single-task command; a failed or missing task ends with exit status 1.
+    """
+    if outcome is None:
+        raise click.ClickException('Database error, see the log for details.')
+    if not outcome:
+        raise click.ClickException(missing)
+    click.echo(success)
+
+
+@app.command('new', short_help='Create a new task')
+@click.argument('name')
+@click.option('--cat', 'category', type=CATEGORY_CHOICE, default='BACKLOG', show_default=True, help='Task category.')
+def create_task(name: str, category: str) -> None:
+    """Create a new task called NAME."""
+    from service.todo_srv import add_todo
+
+    result = add_todo(_database(), Todo(name, category=CATEGORY_BY_NAME[category]))
+    if result is None:
+        raise click.ClickException('Database error, see the log for details.')
+    click.echo(f"Task '{name}': {result}")
+
 
-    console.print(table)
+@app.command('list', short_help='List tasks')
+@click.option('--status', type=STATUS_CHOICE, help='Only tasks with this status.')
+@click.option('--cat', 'category', type=CATEGORY_CHOICE, help='Only tasks in this category.')
+@click.option('--since', type=DATE_TYPE, help='Only tasks added at or after this date.')
+@click.option('--until', type=DATE_TYPE, help='Only tasks added before this date.')
+@click.option('--page-size', type=click.IntRange(min=1), default=50, show_default=True,
+              help='Tasks fetched and printed at a time.')
+@click.option('--page', type=click.IntRange(min=1), help='Show only this page (1 is the first).')
+@click.option('--limit', type=click.IntRange(min=1), help='Show at most this many tasks.')
+@click.option('--format', 'output_format', type=click.Choice(LIST_FORMATS), default='table', show_default=True,
+              help='tsv and json print plain text without loading rich.')
+def list_tasks(status: str, category: str, since, until, page_size: int, page: int, limit: int,
+               output_format: str) -> None:
+    """
+    List tasks in the order they were created.
+
+    Tasks are read and printed a page at a time, so the first rows appear at once whatever the size
+    of the list.
+    """
+    from service.todo_srv import TODO_MODEL_ROWS, iter_todo_pages, query_todos
+
+    filters = {
+        'status': Status[status.upper()] if status else None,
+        'category': CATEGORY_BY_NAME[category] if category else None,
+        'added_between': (since and int(since.timestamp()), until and int(until.timestamp())),
+    }
+    if page is None:
+        pages = iter_todo_pages(_database(), **filters, page_size=page_size, limit=limit, row_factory=TODO_MODEL_ROWS)
+    else:
+        # Jumping to a page has SQLite skip the rows of the pages before it
+        pages = [query_todos(
+            _database(), **filters, order_by=['id'], limit=min(page_size, limit or page_size),
+            offset=(page - 1) * page_size, row_factory=TODO_MODEL_ROWS
+        )]
+    _print_todos(pages, "To-Do List", output_format)
 
 
 @app.command('del', short_help='Delete a task by ID')
-def delete_task(task_id: int):
-    if 0 < task_id <= len(todos):
-        removed_task = todos.pop(task_id - 1)
-        console.print(f"Task '{removed_task}' deleted successfully!")
-        list_tasks()
+@click.argument('task_id', type=int)
+def delete_task(task_id: int) -> None:
+    """Delete the task TASK_ID."""
+    from service.todo_srv import delete_todo
+
+    _report(delete_todo(_database(), task_id), f"Task #{task_id} deleted successfully!", f"No task #{task_id}.")
+
+
+@app.command('update', short_help='Rename a task by ID')
+@click.argument('task_id', type=int)
+@click.argument('new_name')
+def update_task(task_id: int, new_name: str) -> None:
+    """Rename the task TASK_ID to NEW_NAME."""
+    from service.todo_srv import rename_todo
+
+    _report(rename_todo(_database(), task_id, new_name),
+            f"Task #{task_id} updated to '{new_name}' successfully!", f"No task #{task_id}.")
+
+
+@app.command('done', short_help='Mark tasks as done')
+@click.argument('task_ids', metavar='TASK_ID...', type=int, nargs=-1, required=True)
+def complete_tasks(task_ids: tuple) -> None:
+    """Mark the tasks TASK_ID... as done, all in one transaction."""
+    from service.todo_srv import complete_todos
+
+    completed = complete_todos(_database(), task_ids)
+    if len(task_ids) == 1:
+        _report(completed, f"Task #{task_ids[0]} done!", f"No undone task #{task_ids[0]}.")
     else:
-        console.print("Invalid task ID!")
+        _report(completed, f"{completed} of {len(task_ids)} tasks done!", "None of these tasks is undone.")
+
+
+@app.command('purge', short_help='Delete done tasks')
+@click.option('--before', type=DATE_TYPE, help='Only tasks completed before this date.')
+@click.confirmation_option(prompt='Delete the done tasks for good?')
+def purge_tasks(before) -> None:
+    """Delete the done tasks, all of them or those completed before a date."""
+    from service.todo_srv import purge_done_todos
+
+    deleted = purge_done_todos(_database(), int(before.timestamp()) if before else None)
+    if deleted is None:
+        raise click.ClickException('Database error, see the log for details.')
+    click.echo(f"{deleted} done tasks deleted.")
 
 
-@app.command('update', short_help='Update a task by ID')
-def update_task(task_id: int, new_name: str):
-    if 0 < task_id <= len(todos):
-        todos[task_id - 1].task = new_name
-        console.print(f"Task #{task_id} updated to '{new_name}' successfully!")
-        list_tasks()
+@app.command('search', short_help='Find tasks by words')
+@click.argument('text')
+@click.option('--status', type=STATUS_CHOICE, help='Only tasks with this status.')
+@click.option('--cat', 'category', type=CATEGORY_CHOICE, help='Only tasks in this category.')
+@click.option('--limit', type=click.IntRange(min=1), default=20, show_default=True, help='Show at most this many.')
+@click.option('--format', 'output_format', type=click.Choice(LIST_FORMATS), default='table', show_default=True)
+def search_tasks(text: str, status: str, category: str, limit: int, output_format: str) -> None:
+    """
+    List the tasks containing every word of TEXT, best match first.
+
+    The last word also matches words it starts, so 'buy mil' finds 'Buy milk'. Case and accents are ignored.
+    """
+    from service.todo_srv import TODO_MATCH_ROWS, search_todos
+
+    matches = search_todos(
+        _database(), text, CATEGORY_BY_NAME[category] if category else None, Status[status.upper()] if status else None,
+        limit, TODO_MATCH_ROWS, markers=HIGHLIGHT_MARKERS
+    )
+    todos = [todo_item for todo_item, _ in matches]
+    if output_format == 'table':
+        _print_table([todos], f"Tasks matching '{text}'", {todo_item._id: snippet for todo_item, snippet in matches})
     else:
-        console.print("Invalid task ID!")
+        _print_todos([todos], f"Tasks matching '{text}'", output_format)
+
+
+def _read_records(path: str, file_format: str):
+    """
+    Yields one dictionary per task of a CSV file (with a header row) or a JSON array of objects.
+    """
+    if file_format == 'json':
+        import json
+
+        with open(path, encoding='utf-8') as json_file:
+            records = json.load(json_file)
+        if not isinstance(records, list):
+            raise click.ClickException('A JSON import must be an array of task objects.')
+        yield from records
+        return
+
+    import csv
+
+    with open(path, newline='', encoding='utf-8') as csv_file:
+        yield from csv.DictReader(csv_file)
+
+
+@app.command('import', short_help='Bulk import tasks from CSV or JSON')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'file_format', type=click.Choice(IMPORT_FORMATS),
+              help='File format; guessed from the file extension by default.')
+def import_tasks(path: str, file_format: str) -> None:
+    """
+    Import the tasks in PATH in a single transaction; existing tasks are skipped.
+
+    Columns (CSV) or keys (JSON): task, and optionally category, status, date_added, date_completed.
+    """
+    from service.todo_srv import add_todos, todo_from_record
+
+    file_format = file_format or path.rsplit('.', 1)[-1].lower()
+    if file_format not in IMPORT_FORMATS:
+        raise click.ClickException(f"Cannot guess the format of '{path}'; pass --format csv or --format json.")
+
+    try:
+        result = add_todos(_database(), map(todo_from_record, _read_records(path, file_format)))
+    except ValueError as error:
+        raise click.ClickException(f"Nothing imported: {error}")
+    if result is None:
+        raise click.ClickException('Database error, nothing imported; see the log for details.')
+    click.echo(result)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,409 @@
+import asyncio
+import copy
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+from lazy_orm.cache import QueryCacheStats
+from lazy_orm.db_manager import DatabaseManager, RowList
+from lazy_orm.pool import ConnectionPool
+from lazy_orm.row_factories import RowFactory, tracking_key
+
+T = TypeVar('T')
+
+
+class AsyncDatabaseManager:
+    """
+    An awaitable facade over DatabaseManager.
+
+    This class owns a small pool of worker threads on which every query runs, so coroutines
+    awaiting a query yield to the event loop while SQLite works. With more than one worker,
+    reads run in parallel on separate pooled connections.
+    """
+
+    DEFAULT_WORKERS = 1
+
+    def __init__(
+            self,
+            db_name: str,
+            db_dir: str = DatabaseManager.DEFAULT_DATABASE_DIRECTORY,
+            workers: int = DEFAULT_WORKERS,
+            **manager_options: Any
+    ) -> None:
+        """
+        Initializes the AsyncDatabaseManager instance and its worker threads.
+
+        Args:
+            db_name (str): The name of the SQLite database file.
+            db_dir (str): The directory path where the database file is stored.
+            workers (int): The number of worker threads. One worker keeps statements strictly ordered.
+            **manager_options: Passed on to DatabaseManager (pool_size, settings, retry_policy, query_cache,
+                query_hooks).
+        """
+        manager_options.setdefault('pool_size', max(workers, ConnectionPool.DEFAULT_POOL_SIZE))
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'lazy_orm-{db_name}')
+        self._manager = DatabaseManager(db_name, db_dir, **manager_options)
+        self._in_transaction = False
+
+    async def __aenter__(self) -> 'AsyncDatabaseManager':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator['AsyncDatabaseManager']:
+        """
+        Runs the statements awaited through the yielded manager as one transaction. See DatabaseManager.transaction.
+
+        A SQLite transaction belongs to one connection, and so to one thread: the yielded manager runs
+        everything on a dedicated worker thread that holds the transaction until the block exits.
+        Statements awaited through `self` meanwhile run outside the transaction, and their writes wait
+        for it to finish. Nested blocks opened on the yielded manager become savepoints.
+
+        Yields:
+            AsyncDatabaseManager: A manager bound to the transaction, to hand to service functions.
+
+        Raises:
+            DatabaseError: If the transaction cannot be started or committed.
+        """
+        loop = asyncio.get_running_loop()
+        if self._in_transaction:
+            bound = self
+        else:
+            bound = copy.copy(self)
+            bound._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='lazy_orm-transaction')
+            bound._in_transaction = True
+
+        context = self._manager.transaction()
+        try:
+            await loop.run_in_executor(bound._executor, context.__enter__)
+            try:
+                yield bound
+            except BaseException as error:
+                if not await loop.run_in_executor(
+                        bound._executor, context.__exit__, type(error), error, error.__traceback__
+                ):
+                    raise
+            else:
+                await loop.run_in_executor(bound._executor, context.__exit__, None, None, None)
+        finally:
+            if bound is not self:
+                bound._executor.shutdown(wait=False)
+
+    @property
+    def manager(self) -> DatabaseManager:
+        """
+        The wrapped DatabaseManager, for synchronous use outside the event loop (scripts, benchmarks).
+        """
+        return self._manager
+
+    async def run(self, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Runs `function(manager, *args, **kwargs)` on a worker thread.
+
+        This lets synchronous code written against DatabaseManager, such as the service
+        helpers, be awaited without blocking the event loop.
+
+        Args:
+            function (Callable[..., T]): A callable taking the DatabaseManager as its first argument.
+
+        Returns:
+            T: The value returned by the callable.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(function, self._manager, *args, **kwargs)
+        )
+
+    async def insert_row(self, table_name: str, column_values: Dict[str, Any]) -> None:
+        """
+        Inserts a row into the specified table. See DatabaseManager.insert_row.
+        """
+        await self.run(DatabaseManager.insert_row, table_name, column_values)
+
+    async def insert_or_ignore(
+            self, table_name: str, column_values: Dict[str, Any], unique_keys: Sequence[Sequence[str]] = ()
+    ) -> Optional[int]:
+        """
+        Inserts a row unless it conflicts with a UNIQUE constraint. See DatabaseManager.insert_or_ignore.
+        """
+        return await self.run(DatabaseManager.insert_or_ignore, table_name, column_values, unique_keys)
+
+    async def upsert_row(
+            self,
+            table_name: str,
+            column_values: Dict[str, Any],
+            conflict_columns: List[str],
+            update_columns: Optional[List[str]] = None
+    ) -> int:
+        """
+        Inserts or updates a row in one statement. See DatabaseManager.upsert_row.
+        """
+        return await self.run(DatabaseManager.upsert_row, table_name, column_values, conflict_columns, update_columns)
+
+    async def insert_rows(
+            self,
+            table_name: str,
+            rows: Iterable[Dict[str, Any]],
+            chunk_size: int = DatabaseManager.DEFAULT_INSERT_CHUNK_SIZE,
+            ignore_conflicts: bool = False,
+            unique_keys: Sequence[Sequence[str]] = ()
+    ) -> List[Optional[int]]:
+        """
+        Inserts many rows in a single transaction. See DatabaseManager.insert_rows.
+        """
+        return await self.run(
+            DatabaseManager.insert_rows, table_name, rows, chunk_size, ignore_conflicts, unique_keys
+        )
+
+    async def upsert_rows(
+            self,
+            table_name: str,
+            rows: Iterable[Dict[str, Any]],
+            conflict_columns: List[str],
+            update_columns: Optional[List[str]] = None,
+            chunk_size: int = DatabaseManager.DEFAULT_INSERT_CHUNK_SIZE
+    ) -> int:
+        """
+        Inserts or updates many rows in a single transaction. See DatabaseManager.upsert_rows.
+        """
+        return await self.run(
+            DatabaseManager.upsert_rows, table_name, rows, conflict_columns, update_columns, chunk_size
+        )
+
+    def query_cache_stats(self) -> Optional[QueryCacheStats]:
+        """
+        Returns the query cache counters, or None if no cache is configured. See DatabaseManager.query_cache_stats.
+        """
+        return self._manager.query_cache_stats()
+
+    async def fetch_all_rows(
+            self,
+            table_name: str,
+            column_names: List[str],
+            row_factory: Optional[RowFactory] = None,
+            use_cache: bool = True
+    ) -> RowList:
+        """
+        Fetches all rows from the specified table. See DatabaseManager.fetch_all_rows.
+        """
+        return await self.run(DatabaseManager.fetch_all_rows, table_name, column_names, row_factory, use_cache)
+
+    async def fetch_rows_if(
+            self,
+            table_name: str,
+            condition: str,
+            column_names: Optional[List[str]] = None,
+            params: Optional[List[Any]] = None,
+            row_factory: Optional[RowFactory] = None,
+            use_cache: bool = True
+    ) -> RowList:
+        """
+        Fetches rows that match a given condition. See DatabaseManager.fetch_rows_if.
+        """
+        return await self.run(
+            DatabaseManager.fetch_rows_if, table_name, condition, column_names, params, row_factory, use_cache
+        )
+
+    async def fetch_rows_where(
+            self,
+            table_name: str,
+            column_matches: Dict[str, Any],
+            column_names: Optional[List[str]] = None,
+            match_any: bool = False,
+            row_factory: Optional[RowFactory] = None,
+            use_cache: bool = True
+    ) -> RowList:
+        """
+        Fetches rows whose columns equal the given values. See DatabaseManager.fetch_rows_where.
+        """
+        return await self.run(
+            DatabaseManager.fetch_rows_where, table_name, column_matches, column_names, match_any, row_factory,
+            use_cache
+        )
+
+    async def fetch_rows(
+            self,
+            table_name: str,
+            column_names: Optional[List[str]] = None,
+            where: Optional[Dict[str, Any]] = None,
+            condition: Optional[str] = None,
+            params: Optional[List[Any]] = None,
+            order_by: Sequence[str] = (),
+            limit: Optional[int] = None,
+            offset: Optional[int] = None,
+            row_factory: Optional[RowFactory] = None,
+            use_cache: bool = True
+    ) -> RowList:
+        """
+        Fetches filtered, sorted and limited rows. See DatabaseManager.fetch_rows.
+        """
+        return await self.run(
+            DatabaseManager.fetch_rows, table_name, column_names, where, condition, params, order_by, limit, offset,
+            row_factory, use_cache
+        )
+
+    async def search_rows(
+            self,
+            table_name: str,
+            fts_table: str,
+            match: str,
+            column_names: Optional[List[str]] = None,
+            where: Optional[Dict[str, Any]] = None,
+            limit: Optional[int] = None,
+            snippet_markers: Optional[Tuple[str, str]] = None,
+            snippet_tokens: int = DatabaseManager.DEFAULT_SNIPPET_TOKENS,
+            row_factory: Optional[RowFactory] = None,
+            use_cache: bool = True
+    ) -> RowList:
+        """
+        Fetches the rows matching a full-text query, best match first. See DatabaseManager.search_rows.
+        """
+        return await self.run(
+            DatabaseManager.search_rows, table_name, fts_table, match, column_names, where, limit, snippet_markers,
+            snippet_tokens, row_factory, use_cache
+        )
+
+    async def count_rows_by(
+            self,
+            table_name: str,
+            group_by: Sequence[str],
+            where: Optional[Dict[str, Any]] = None,
+            condition: Optional[str] = None,
+            params: Optional[List[Any]] = None,
+            use_cache: bool = True
+    ) -> Dict[Any, int]:
+        """
+        Counts the matching rows per group. See DatabaseManager.count_rows_by.
+        """
+        return await self.run(DatabaseManager.count_rows_by, table_name, group_by, where, condition, params, use_cache)
+
+    async def iter_rows(
+            self,
+            table_name: str,
+            column_names: Optional[List[str]] = None,
+            where: Optional[Dict[str, Any]] = None,
+            batch_size: int = DatabaseManager.DEFAULT_FETCH_BATCH_SIZE,
+            key_column: str = 'id',
+            row_factory: Optional[RowFactory] = None
+    ) -> AsyncIterator[Any]:
+        """
+        Streams rows ordered by `key_column`, fetching `batch_size` rows per worker round trip.
+
+        Each batch is a separate keyset query, so no cursor or read transaction is held open
+        between batches and any worker thread can serve the next one. When `column_names` is
+        given it must include `key_column`. Batches bypass the query cache.
+        """
+        if column_names is not None and key_column not in column_names:
+            raise ValueError(f"column_names must include the key column '{key_column}'.")
+
+        last_key = [None]
+        page_factory = tracking_key(row_factory or self._manager.row_factory, key_column, last_key)
+        while True:
+            rows = await self.fetch_page(
+                table_name, column_names, where, last_key[0], batch_size, key_column, page_factory, use_cache=False
+            )
+            for row in rows:
+                yield row
+            if len(rows) < batch_size:
+                return
+
+    async def fetch_page(
+            self,
+            table_name: str,
+            column_names: Optional[List[str]] = None,
+            where: Optional[Dict[str, Any]] = None,
+            after_id: Optional[int] = None,
+            limit: int = DatabaseManager.DEFAULT_PAGE_SIZE,
+            key_column: str = 'id',
+            row_factory: Optional[RowFactory] = None,
+            use_cache: bool = True
+    ) -> RowList:
+        """
+        Fetches one page of rows using keyset pagination. See DatabaseManager.fetch_page.
+        """
+        return await self.run(
+            DatabaseManager.fetch_page, table_name, column_names, where, after_id, limit, key_column, row_factory,
+            use_cache
+        )
+
+    async def row_exists(
+            self, table_name: str, column_matches: Dict[str, Any], match_any: bool = False, use_cache: bool = True
+    ) -> bool:
+        """
+        Checks whether any row matches the given values. See DatabaseManager.row_exists.
+        """
+        return await self.run(DatabaseManager.row_exists, table_name, column_matches, match_any, use_cache)
+
+    async def update_rows(
+            self,
+            table_name: str,
+            column_values: Dict[str, Any],
+            condition: str,
+            params: Optional[List[Any]] = None
+    ) -> int:
+        """
+        Updates rows that match a condition. See DatabaseManager.update_rows.
+        """
+        return await self.run(DatabaseManager.update_rows, table_name, column_values, condition, params)
+
+    async def update_rows_by_ids(
+            self,
+            table_name: str,
+            ids: Iterable[int],
+            column_values: Dict[str, Any],
+            condition: Optional[str] = None,
+            params: Optional[List[Any]] = None,
+            chunk_size: int = DatabaseManager.DEFAULT_ID_CHUNK_SIZE
+    ) -> int:
+        """
+        Updates the rows with the given ids in one transaction. See DatabaseManager.update_rows_by_ids.
+        """
+        return await self.run(
+            DatabaseManager.update_rows_by_ids, table_name, list(ids), column_values, condition, params, chunk_size
+        )
+
+    async def delete_row(self, table_name: str, row_id: int) -> int:
+        """
+        Deletes a row by its ID. See DatabaseManager.delete_row.
+        """
+        return await self.run(DatabaseManager.delete_row, table_name, row_id)
+
+    async def delete_rows(
+            self,
+            table_name: str,
+            ids: Iterable[int],
+            condition: Optional[str] = None,
+            params: Optional[List[Any]] = None,
+            chunk_size: int = DatabaseManager.DEFAULT_ID_CHUNK_SIZE
+    ) -> int:
+        """
+        Deletes the rows with the given ids in one transaction. See DatabaseManager.delete_rows.
+        """
+        return await self.run(DatabaseManager.delete_rows, table_name, list(ids), condition, params, chunk_size)
+
+    async def delete_rows_if(self, table_name: str, condition: str, params: Optional[List[Any]] = None) -> int:
+        """
+        Deletes the rows that match a condition. See DatabaseManager.delete_rows_if.
+        """
+        return await self.run(DatabaseManager.delete_rows_if, table_name, condition, params)
+
+    async def get_row_count(self, table_name: str, use_cache: bool = True) -> int:
+        """
+        Retrieves the total number of rows in the specified table. See DatabaseManager.get_row_count.
+        """
+        return await self.run(DatabaseManager.get_row_count, table_name, use_cache)
+
+    async def close(self) -> None:
+        """
+        Closes the pooled connections and shuts the worker threads down.
+        """
+        if self._manager is None:
+            return
+        await self.run(DatabaseManager.close)
+        self._manager = None
+        self._executor.shutdown(wait=False)
+        logging.info('Async database worker stopped.')
@@ -0,0 +1,140 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+
+@dataclass(frozen=True)
+class QueryCacheStats:
+    """A snapshot of the query cache counters."""
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+    size: int
+
+
+class QueryCache:
+    """
+    An in-process LRU + TTL cache of query results, grouped by table.
+
+    DatabaseManager looks results up here before running a read and invalidates a table's
+    entries whenever it writes to that table. A per-table generation counter makes sure a read
+    that raced with a write never stores its (possibly stale) result.
+
+    Cached results are shared between callers and must not be mutated.
+    """
+
+    DEFAULT_MAX_ENTRIES = 256
+    DEFAULT_TTL_SECONDS = 30.0
+
+    def __init__(
+            self,
+            max_entries: int = DEFAULT_MAX_ENTRIES,
+            ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+            clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        Args:
+            max_entries (int): The maximum number of cached results; the least recently used is evicted.
+            ttl_seconds (Optional[float]): How long a result stays valid. None keeps results until evicted
+                or invalidated.
+            clock (Callable[[], float]): The time source, replaceable in tests.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]' = OrderedDict()
+        self._keys_by_table: Dict[str, Set[Hashable]] = {}
+        self._generations: Dict[str, int] = {}
+        self._hits = self._misses = self._evictions = self._expirations = self._invalidations = 0
+
+    def generation(self, table_name: str) -> int:
+        """
+        Returns the table's write generation; pass it to `put` to detect writes that happened meanwhile.
+        """
+        with self._lock:
+            return self._generations.get(table_name, 0)
+
+    def get(self, table_name: str, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Looks a result up.
+
+        Returns:
+            Tuple[bool, Any]: (True, result) on a hit, (False, None) on a miss.
+        """
+        entry_key = (table_name, key)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is None:
+                self._misses += 1
+                return False, None
+
+            expires_at, value = entry
+            if expires_at < self._clock():
+                self._remove(entry_key)
+                self._expirations += 1
+                self._misses += 1
+                return False, None
+
+            self._entries.move_to_end(entry_key)
+            self._hits += 1
+            return True, value
+
+    def put(self, table_name: str, key: Hashable, value: Any, generation: int) -> None:
+        """
+        Stores a result unless the table was written to since `generation` was read.
+        """
+        entry_key = (table_name, key)
+        expires_at = self._clock() + self.ttl_seconds if self.ttl_seconds is not None else float('inf')
+        with self._lock:
+            if self._generations.get(table_name, 0) != generation:
+                return
+
+            self._entries[entry_key] = (expires_at, value)
+            self._entries.move_to_end(entry_key)
+            self._keys_by_table.setdefault(table_name, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def invalidate(self, table_name: str) -> None:
+        """
+        Drops every cached result of a table and bumps its generation.
+        """
+        with self._lock:
+            self._generations[table_name] = self._generations.get(table_name, 0) + 1
+            for key in self._keys_by_table.pop(table_name, ()):
+                self._entries.pop((table_name, key), None)
+            self._invalidations += 1
+
+    def clear(self) -> None:
+        """
+        Drops every cached result.
+        """
+        with self._lock:
+            for table_name in list(self._keys_by_table):
+                self._generations[table_name] = self._generations.get(table_name, 0) + 1
+            self._entries.clear()
+            self._keys_by_table.clear()
+
+    def stats(self) -> QueryCacheStats:
+        """
+        Returns the cache counters.
+        """
+        with self._lock:
+            return QueryCacheStats(
+                self._hits, self._misses, self._evictions, self._expirations, self._invalidations, len(self._entries)
+            )
+
+    def _remove(self, entry_key: Tuple[str, Hashable]) -> None:
+        table_name, key = entry_key
+        del self._entries[entry_key]
+        table_keys = self._keys_by_table.get(table_name)
+        if table_keys is not None:
+            table_keys.discard(key)
+            if not table_keys:
+                del self._keys_by_table[table_name]
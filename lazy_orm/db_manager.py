@@ -1,7 +1,20 @@
 import os
 import sqlite3
-from typing import Any, Dict, List, Optional, TypeAlias
+import threading
+import time
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeAlias, Union
 import logging
+from dataclasses import dataclass
+
+from lazy_orm.cache import QueryCache, QueryCacheStats
+from lazy_orm.instrumentation import QueryEvent, QueryHook
+from lazy_orm.migrations import adopt_user_version, apply_migrations, discover_migrations
+from lazy_orm.pool import ConnectionPool, ConnectionSettings, PoolStats, PoolTimeoutError, RetryPolicy
+from lazy_orm.query import QuerySet
+from lazy_orm.row_factories import RowFactory, dict_rows, tuple_rows
+from lazy_orm.statements import ALL_COLUMNS, StatementBuilder, StatementCacheStats
 
 # A custom type alias for better readability of return types
 RowList: TypeAlias = List[Dict[str, Any]]
@@ -18,6 +31,19 @@ class DatabaseError(Exception):
         super().__init__(message)
 
 
+@dataclass(frozen=True)
+class WriteResult:
+    """The outcome of a data-modifying statement."""
+    rows_affected: int
+    last_row_id: Optional[int]
+
+
+class _TransactionState(threading.local):
+    """The calling thread's transaction nesting depth and the tables it wrote to."""
+    depth = 0
+    written_tables = None
+
+
 class DatabaseManager:
     """
     A manager class to handle SQLite database operations.
@@ -26,43 +52,220 @@ class DatabaseManager:
     CRUD operations (create, read, update, delete), and manage tables
     efficiently. It includes error handling, logging, and an initialization
     mechanism to prepare new databases if needed.
+
+    Connections come from a ConnectionPool, so one instance can be shared between threads:
+    every operation checks out the calling thread's connection for its duration.
+
+    One database file can hold several tables, see `tables`, so related entities share one
+    connection pool and can be joined. Each write is committed on its own unless it runs inside
+    `transaction()`.
     """
 
     DEFAULT_DATABASE_DIRECTORY = 'data'
-    DEFAULT_SQL_SCRIPT_DIRECTORY = 'sql'
-    SQL_WILDCARD_ALL_COLUMNS = '*'
+    # Pass as db_dir to keep the database in memory; it lives until the manager is closed
+    IN_MEMORY_DIRECTORY = ':memory:'
+    DEFAULT_SQL_SCRIPT_DIRECTORY = 'SQL'
+    MIGRATIONS_SUBDIRECTORY = 'migrations'
+    # Selects every column when passed as the whole column list, like None
+    SQL_WILDCARD_ALL_COLUMNS = ALL_COLUMNS
+    DEFAULT_INSERT_CHUNK_SIZE = 1000
+    DEFAULT_FETCH_BATCH_SIZE = 500
+    DEFAULT_PAGE_SIZE = 50
+    # Ids bound per statement by delete_rows and update_rows_by_ids, well below SQLite's variable limit
+    DEFAULT_ID_CHUNK_SIZE = 500
+    DEFAULT_SNIPPET_TOKENS = 12
+    SNIPPET_ELLIPSIS = '…'
 
-    def __init__(self, db_name: str, db_dir: str = DEFAULT_DATABASE_DIRECTORY) -> None:
+    def __init__(
+            self,
+            db_name: str,
+            db_dir: str = DEFAULT_DATABASE_DIRECTORY,
+            pool_size: int = ConnectionPool.DEFAULT_POOL_SIZE,
+            settings: ConnectionSettings = ConnectionSettings(),
+            retry_policy: RetryPolicy = RetryPolicy(),
+            statement_cache_size: int = StatementBuilder.DEFAULT_CACHE_SIZE,
+            row_factory: RowFactory = dict_rows,
+            query_cache: Optional[QueryCache] = None,
+            query_hooks: Iterable[QueryHook] = (),
+            tables: Optional[Sequence[str]] = None
+    ) -> None:
         """
         Initializes the DatabaseManager instance.
 
         Args:
             db_name (str): The name of the SQLite database file.
-            db_dir (str): The directory path where the database file is stored.
+            db_dir (str): The directory path where the database file is stored, or IN_MEMORY_DIRECTORY.
+                In-memory databases are shared between the pooled connections through SQLite's shared
+                cache, which locks whole tables; use pool_size=1 if several threads write concurrently.
+            pool_size (int): The maximum number of pooled connections.
+            settings (ConnectionSettings): Settings (journal mode, synchronous, cache and mmap sizes,
+                busy timeout, sqlite3 cached_statements) applied to each connection.
+            retry_policy (RetryPolicy): How statements failing with "database is locked" are retried.
+            statement_cache_size (int): How many generated SQL strings are cached.
+            row_factory (RowFactory): The default representation of fetched rows, see lazy_orm.row_factories.
+            query_cache (Optional[QueryCache]): Caches read results until the table is written to.
+                None disables caching.
+            query_hooks (Iterable[QueryHook]): Called with a QueryEvent after every executed statement,
+                e.g. a lazy_orm.instrumentation.QueryStats. Without hooks statements are not timed.
+            tables (Optional[Sequence[str]]): The tables kept in this database, created from their
+                SQL/create_<table>_db.sql scripts and migrated in this order (referenced tables first).
+                Defaults to a single table named after the database.
         """
-        self.database_path = os.path.join(db_dir, db_name)
+        self.in_memory = db_dir == self.IN_MEMORY_DIRECTORY
+        if self.in_memory:
+            self.database_path = f'file:{db_name}-{os.urandom(16).hex()}?mode=memory&cache=shared'
+        else:
+            self.database_path = os.path.join(db_dir, db_name)
         self._db_name = db_name
+        self.tables = tuple(tables) if tables is not None else (db_name,)
+        self.retry_policy = retry_policy
+        self.statements = StatementBuilder(statement_cache_size)
+        self.row_factory = row_factory
+        self.query_cache = query_cache
+        self._query_hooks: Tuple[QueryHook, ...] = tuple(query_hooks)
+        self._transaction_state = _TransactionState()
+        self.pool = None
         self._ensure_db_directory()
-        self.connection = self._initialize_database_connection()
-        self.cursor = self.connection.cursor()
+        self.pool = self._initialize_connection_pool(pool_size, settings)
         self._ensure_database_existence()
 
     def __del__(self) -> None:
         """
-        Destructor to cleanly close the SQLite connection when the instance is destroyed.
+        Destructor to cleanly close the SQLite connections when the instance is destroyed.
+        """
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes every pooled connection. Calling it more than once is harmless.
+        """
+        if self.pool:
+            logging.info('Closing the database connections.')
+            self.pool.close()
+            self.pool = None
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Checks out the calling thread's pooled connection for the duration of the block.
+
+        Nested blocks on the same thread reuse the same connection.
+        """
+        with self.pool.connection() as connection:
+            yield connection
+
+    @contextmanager
+    def transaction(self) -> Iterator['DatabaseManager']:
+        """
+        Runs the statements of the block as one unit of work, committed once when the block exits.
+
+        Statements the calling thread executes inside the block are not committed one by one. The
+        outermost block is a `BEGIN IMMEDIATE` transaction; nested blocks are savepoints, so a failing
+        inner block only undoes its own statements. Any exception leaving a block rolls that block back
+        and is re-raised.
+
+        Yields:
+            DatabaseManager: This manager, to hand to service functions taking part in the transaction.
+
+        Raises:
+            DatabaseError: If the transaction cannot be started or committed.
+        """
+        state = self._transaction_state
+        with self.connection() as connection:
+            depth = state.depth
+            savepoint = f'lazy_orm_savepoint_{depth}'
+            try:
+                if depth:
+                    connection.execute(f'SAVEPOINT {savepoint}')
+                else:
+                    connection.execute('BEGIN IMMEDIATE')
+                    state.written_tables = set()
+            except sqlite3.Error as error:
+                logging.exception('Starting a transaction failed.')
+                raise DatabaseError(f"Starting a transaction failed: {error}")
+
+            state.depth = depth + 1
+            try:
+                yield self
+            except BaseException:
+                state.depth = depth
+                self._end_transaction(connection, depth, savepoint, commit=False)
+                raise
+            state.depth = depth
+            self._end_transaction(connection, depth, savepoint, commit=True)
+
+    @property
+    def in_transaction(self) -> bool:
+        """
+        Whether the calling thread is inside a `transaction()` block.
         """
-        if self.connection:
-            logging.info('Closing the database connection.')
-            self.connection.close()
+        return self._transaction_state.depth > 0
 
-    def _initialize_database_connection(self) -> sqlite3.Connection:
+    def _end_transaction(self, connection: sqlite3.Connection, depth: int, savepoint: str, commit: bool) -> None:
         """
-        Establishes the SQLite database connection.
+        Commits or rolls back the transaction or savepoint opened at `depth`.
+
+        When the outermost transaction ends, the cached reads of every table it wrote to are dropped
+        once more, since other threads may have cached the pre-commit rows in the meantime.
+        """
+        try:
+            if depth:
+                if not commit:
+                    connection.execute(f'ROLLBACK TO {savepoint}')
+                connection.execute(f'RELEASE {savepoint}')
+            elif commit:
+                connection.commit()
+            else:
+                connection.rollback()
+        except sqlite3.Error as error:
+            if not depth and connection.in_transaction:
+                connection.rollback()
+            logging.exception('Ending a transaction failed.')
+            raise DatabaseError(f"{'Committing' if commit else 'Rolling back'} a transaction failed: {error}")
+        finally:
+            if not depth:
+                written_tables, self._transaction_state.written_tables = self._transaction_state.written_tables, None
+                for table_name in written_tables:
+                    self._invalidate_cache(table_name)
+
+    def pool_stats(self) -> PoolStats:
+        """
+        Returns the connection pool usage counters: checkouts, waits and total wait time.
+        """
+        return self.pool.stats()
+
+    def statement_cache_stats(self) -> StatementCacheStats:
+        """
+        Returns the SQL text cache hit/miss counters.
+        """
+        return self.statements.stats()
+
+    def query_cache_stats(self) -> Optional[QueryCacheStats]:
+        """
+        Returns the query cache hit/miss/eviction counters, or None if no cache is configured.
+        """
+        return self.query_cache.stats() if self.query_cache is not None else None
+
+    def add_query_hook(self, hook: QueryHook) -> None:
+        """
+        Registers a hook called with a QueryEvent after every executed statement.
+        """
+        self._query_hooks = self._query_hooks + (hook,)
+
+    def remove_query_hook(self, hook: QueryHook) -> None:
+        """
+        Unregisters a hook added with add_query_hook or passed to the constructor.
+        """
+        self._query_hooks = tuple(registered for registered in self._query_hooks if registered != hook)
+
+    def _initialize_connection_pool(self, pool_size: int, settings: ConnectionSettings) -> ConnectionPool:
+        """
+        Creates the connection pool for the database.
 
         If the database directory does not exist, it will create it.
 
         Returns:
-            sqlite3.Connection: The connection object for the database.
+            ConnectionPool: The pool handing out connections to the database.
 
         Raises:
             DatabaseError: If the connection fails due to unexpected errors.
@@ -70,15 +273,28 @@ class DatabaseManager:
 
         try:
             logging.info(f"Connecting to the database at {self.database_path}...")
-            return sqlite3.connect(self.database_path)
+            return ConnectionPool(self.database_path, pool_size, settings)
         except sqlite3.OperationalError as operational_error:
             logging.exception(f"SQLite Operational Error: {operational_error}. Creating the database directory.")
             os.makedirs(os.path.dirname(self.database_path), exist_ok=True)
-            return sqlite3.connect(self.database_path)
+            return ConnectionPool(self.database_path, pool_size, settings)
         except Exception as exception:
             logging.exception("Unexpected error occurred during database connection.")
             raise DatabaseError(f"Failed to connect to the database: {exception}")
 
+    def table(self, table_name: str) -> QuerySet:
+        """
+        Returns a lazy query over every row of a table, to be narrowed with where(), order_by(),
+        only() or slicing and evaluated with fetch(), count() or exists(). See QuerySet.
+
+        Args:
+            table_name (str): The table to query.
+
+        Returns:
+            QuerySet: The query; nothing runs until it is evaluated.
+        """
+        return QuerySet(self, table_name)
+
     def insert_row(self, table_name: str, column_values: Dict[str, Any]) -> None:
         """
         Inserts a row into the specified table.
@@ -90,40 +306,372 @@ class DatabaseManager:
         Raises:
             DatabaseError: If the insert operation fails.
         """
-        columns = ', '.join(column_values.keys())
-        placeholders = ', '.join(['?'] * len(column_values))
+        query = self.statements.insert(table_name, column_values.keys())
         values = list(column_values.values())
-        query = f'INSERT INTO {table_name} ({columns}) VALUES ({placeholders})'
-        self._execute_query(query, values, operation_context=f"Insertion into table '{table_name}' failed.")
+        self._execute_query(query, values, operation_context=f"Inserting into table '{table_name}'")
+        self._invalidate_cache(table_name)
+
+    def insert_or_ignore(
+            self, table_name: str, column_values: Dict[str, Any], unique_keys: Sequence[Sequence[str]] = ()
+    ) -> Optional[int]:
+        """
+        Inserts a row unless it conflicts with a UNIQUE constraint, in a single statement.
+
+        Without `unique_keys`, a skipped row still uses up an AUTOINCREMENT id, leaving a gap in the ids.
+
+        Args:
+            table_name (str): The name of the database table.
+            column_values (Dict[str, Any]): A dictionary mapping column names to values.
+            unique_keys (Sequence[Sequence[str]]): The column sets of the table's UNIQUE constraints,
+                all among `column_values`. They are checked before the insert, so no id is used up.
+
+        Returns:
+            Optional[int]: The rowid of the new row, or None if a conflicting row already existed.
+
+        Raises:
+            DatabaseError: If the insert operation fails.
+        """
+        query = self.statements.insert(table_name, column_values.keys(), ignore_conflicts=True, unique_keys=unique_keys)
+        result = self._execute_query(
+            query, list(column_values.values()), operation_context=f"Inserting into table '{table_name}'"
+        )
+        if result.rows_affected:
+            self._invalidate_cache(table_name)
+        return result.last_row_id if result.rows_affected else None
+
+    def upsert_row(
+            self,
+            table_name: str,
+            column_values: Dict[str, Any],
+            conflict_columns: List[str],
+            update_columns: Optional[List[str]] = None
+    ) -> int:
+        """
+        Inserts a row or, if it collides on `conflict_columns`, updates the existing row (INSERT ... ON CONFLICT).
+
+        Args:
+            table_name (str): The name of the database table.
+            column_values (Dict[str, Any]): A dictionary mapping column names to values.
+            conflict_columns (List[str]): Columns of a UNIQUE constraint or index identifying the row.
+            update_columns (Optional[List[str]]): Columns overwritten on conflict. Defaults to every
+                column of `column_values` not in `conflict_columns`.
+
+        Returns:
+            int: The id of the inserted or updated row.
+
+        Raises:
+            DatabaseError: If the operation fails.
+        """
+        if update_columns is None:
+            update_columns = [column for column in column_values if column not in conflict_columns]
+        if not update_columns:
+            raise ValueError('upsert_row needs at least one column to update; use insert_or_ignore instead.')
+
+        query = self.statements.upsert(table_name, column_values.keys(), conflict_columns, update_columns)
+        result = self._execute_query(
+            query, list(column_values.values()), fetch_mode=True,
+            operation_context=f"Upsert into table '{table_name}'", row_factory=tuple_rows
+        )
+        self._invalidate_cache(table_name)
+        return result[0][0]
+
+    def insert_rows(
+            self,
+            table_name: str,
+            rows: Iterable[Dict[str, Any]],
+            chunk_size: int = DEFAULT_INSERT_CHUNK_SIZE,
+            ignore_conflicts: bool = False,
+            unique_keys: Sequence[Sequence[str]] = ()
+    ) -> List[Optional[int]]:
+        """
+        Inserts many rows into the specified table within a single transaction.
+
+        Rows are consumed from the iterable in chunks of `chunk_size`. Inside each chunk the
+        rows are grouped by their column set and every group is written with one
+        `executemany` call. The transaction is committed once, after the last chunk; inside
+        `transaction()` the rows become a savepoint of the enclosing transaction instead.
+
+        With `ignore_conflicts`, rows violating a UNIQUE constraint are skipped. Because
+        `executemany` cannot tell which rows were skipped, those rows are executed one by one
+        (still in the same transaction, with the same cached statement).
+
+        Args:
+            table_name (str): The name of the database table.
+            rows (Iterable[Dict[str, Any]]): Dictionaries mapping column names to values.
+            chunk_size (int): The maximum number of rows passed to a single `executemany` call.
+            ignore_conflicts (bool): Skip conflicting rows instead of failing the whole batch.
+            unique_keys (Sequence[Sequence[str]]): With `ignore_conflicts`, the column sets of the
+                table's UNIQUE constraints, checked before each insert so that skipped rows do not use
+                up AUTOINCREMENT ids. See insert_or_ignore.
+
+        Returns:
+            List[Optional[int]]: The rowids of the inserted rows, in the order the rows were given;
+                None for rows skipped because of a conflict.
+
+        Raises:
+            DatabaseError: If the insert operation fails. No rows are inserted in that case.
+        """
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be a positive integer.')
+
+        row_iterator = iter(rows)
+        inserted_row_ids: List[Optional[int]] = []
+        try:
+            logging.info(f"Bulk inserting rows into table '{table_name}'...")
+            with self.transaction(), self.connection() as connection:
+                cursor = connection.cursor()
+                while chunk := list(islice(row_iterator, chunk_size)):
+                    if ignore_conflicts:
+                        inserted_row_ids.extend(
+                            self._insert_chunk_ignoring_conflicts(cursor, table_name, chunk, unique_keys)
+                        )
+                    else:
+                        inserted_row_ids.extend(self._insert_chunk(cursor, table_name, chunk))
+        except (sqlite3.Error, PoolTimeoutError) as error:
+            logging.exception(f"Bulk insertion into table '{table_name}' failed.")
+            raise DatabaseError(f"Bulk insertion into table '{table_name}' failed: {error}")
+
+        self._invalidate_cache(table_name)
+        logging.info(f"Inserted {len(inserted_row_ids)} rows into table '{table_name}'.")
+        return inserted_row_ids
+
+    insert_many = insert_rows
+
+    def upsert_rows(
+            self,
+            table_name: str,
+            rows: Iterable[Dict[str, Any]],
+            conflict_columns: List[str],
+            update_columns: Optional[List[str]] = None,
+            chunk_size: int = DEFAULT_INSERT_CHUNK_SIZE
+    ) -> int:
+        """
+        Inserts or updates many rows within a single transaction (INSERT ... ON CONFLICT DO UPDATE).
+
+        Rows are consumed in chunks of `chunk_size`; inside each chunk they are grouped by their
+        column set and every group is written with one `executemany` call. Unlike upsert_row no ids
+        are returned, so tables without an `id` column, such as WITHOUT ROWID tables, work too.
+
+        Args:
+            table_name (str): The name of the database table.
+            rows (Iterable[Dict[str, Any]]): Dictionaries mapping column names to values.
+            conflict_columns (List[str]): Columns of a UNIQUE constraint or index identifying a row.
+            update_columns (Optional[List[str]]): Columns overwritten on conflict. Defaults to every
+                column of a row not in `conflict_columns`.
+            chunk_size (int): The maximum number of rows passed to a single `executemany` call.
+
+        Returns:
+            int: The number of rows written.
 
-    async def fetch_all_rows(self, table_name: str, column_names: List[str]) -> RowList:
+        Raises:
+            DatabaseError: If the operation fails. No row is written in that case.
+        """
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be a positive integer.')
+
+        row_iterator = iter(rows)
+        written = 0
+        try:
+            with self.transaction(), self.connection() as connection:
+                cursor = connection.cursor()
+                while chunk := list(islice(row_iterator, chunk_size)):
+                    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+                    for row in chunk:
+                        groups.setdefault(tuple(sorted(row)), []).append(row)
+                    for columns, group in groups.items():
+                        updated_columns = update_columns if update_columns is not None else [
+                            column for column in columns if column not in conflict_columns
+                        ]
+                        if not updated_columns:
+                            raise ValueError('upsert_rows needs at least one column to update.')
+                        query = self.statements.upsert(
+                            table_name, columns, conflict_columns, updated_columns, returning=None
+                        )
+                        cursor.executemany(query, ([row[column] for column in columns] for row in group))
+                        written += len(group)
+        except (sqlite3.Error, PoolTimeoutError) as error:
+            logging.exception(f"Bulk upsert into table '{table_name}' failed.")
+            raise DatabaseError(f"Bulk upsert into table '{table_name}' failed: {error}")
+
+        self._invalidate_cache(table_name)
+        return written
+
+    def _insert_chunk(self, cursor: sqlite3.Cursor, table_name: str, chunk: List[Dict[str, Any]]) -> List[int]:
+        """
+        Inserts one chunk of rows, issuing one `executemany` per distinct column set.
+
+        Must be called inside an open transaction so that rowids assigned to a group are contiguous.
+        Rows that supply an explicit `id` report that id.
+
+        Args:
+            cursor (sqlite3.Cursor): A cursor on the connection holding the transaction.
+            table_name (str): The name of the database table.
+            chunk (List[Dict[str, Any]]): The rows to insert.
+
+        Returns:
+            List[int]: The rowids of the inserted rows, in chunk order.
+        """
+        groups: Dict[Tuple[str, ...], List[int]] = {}
+        for position, row in enumerate(chunk):
+            groups.setdefault(tuple(sorted(row)), []).append(position)
+
+        row_ids: List[int] = [0] * len(chunk)
+        for columns, positions in groups.items():
+            query = self.statements.insert(table_name, columns)
+            cursor.executemany(query, ([chunk[position][column] for column in columns] for position in positions))
+
+            if 'id' in columns:
+                for position in positions:
+                    row_ids[position] = chunk[position]['id']
+                continue
+
+            last_row_id = cursor.execute('SELECT last_insert_rowid()').fetchone()[0]
+            first_row_id = last_row_id - len(positions) + 1
+            for offset, position in enumerate(positions):
+                row_ids[position] = first_row_id + offset
+
+        return row_ids
+
+    def _insert_chunk_ignoring_conflicts(
+            self,
+            cursor: sqlite3.Cursor,
+            table_name: str,
+            chunk: List[Dict[str, Any]],
+            unique_keys: Sequence[Sequence[str]] = ()
+    ) -> List[Optional[int]]:
+        """
+        Inserts one chunk of rows one statement at a time, skipping rows that conflict.
+
+        Returns:
+            List[Optional[int]]: The rowid of each inserted row, None for skipped rows.
+        """
+        row_ids: List[Optional[int]] = []
+        for row in chunk:
+            query = self.statements.insert(table_name, row.keys(), ignore_conflicts=True, unique_keys=unique_keys)
+            cursor.execute(query, list(row.values()))
+            row_ids.append(cursor.lastrowid if cursor.rowcount else None)
+        return row_ids
+
+    def fetch_all_rows(
+            self,
+            table_name: str,
+            column_names: List[str],
+            row_factory: Optional[RowFactory] = None,
+            use_cache: bool = True
+    ) -> RowList:
         """
         Fetches all rows from the specified table.
 
+        This call blocks; use AsyncDatabaseManager.fetch_all_rows from coroutines.
+
         Args:
             table_name (str): The name of the table to fetch rows from.
             column_names (List[str]): The list of column names to retrieve.
+            row_factory (Optional[RowFactory]): Overrides the manager's row factory for this call.
+            use_cache (bool): Whether the query cache may serve this call, if one is configured.
 
         Returns:
-            RowList: A list of dictionaries representing each row of the result.
+            RowList: The rows of the result, dictionaries unless another row factory is used.
 
         Raises:
             DatabaseError: If the fetch operation fails.
         """
-        columns_str = ', '.join(column_names)
-        query = f"SELECT {columns_str} FROM {table_name}"
-        return self._execute_query(query, fetch_mode=True, operation_context="Fetch all rows")
+        query = self.statements.select(table_name, column_names)
+        return self._fetch_cached(
+            table_name, use_cache, query, operation_context="Fetch all rows", row_factory=row_factory
+        )
 
     def fetch_rows_if(
-            self, table_name: str, condition: str, column_names: Optional[List[str]] = None
+            self,
+            table_name: str,
+            condition: str,
+            column_names: Optional[List[str]] = None,
+            params: Optional[List[Any]] = None,
+            row_factory: Optional[RowFactory] = None,
+            use_cache: bool = True
     ) -> RowList:
         """
         Fetches rows from the specified table that match a given condition.
 
         Args:
             table_name (str): The name of the table to query.
-            condition (str): The WHERE clause condition for the query.
+            condition (str): The WHERE clause condition for the query, with `?` placeholders for values.
+            column_names (Optional[List[str]]): A list of specific columns to retrieve. Defaults to all columns.
+            params (Optional[List[Any]]): Values bound to the placeholders in `condition`.
+            row_factory (Optional[RowFactory]): Overrides the manager's row factory for this call.
+            use_cache (bool): Whether the query cache may serve this call, if one is configured.
+
+        Returns:
+            RowList: A list of dictionaries for each matching row.
+
+        Raises:
+            DatabaseError: If the operation fails.
+        """
+        query = self.statements.select(table_name, column_names, condition=condition)
+        return self._fetch_cached(
+            table_name, use_cache, query, params,
+            operation_context=f"Fetch rows from table '{table_name}' by condition", row_factory=row_factory
+        )
+
+    def fetch_rows_where(
+            self,
+            table_name: str,
+            column_matches: Dict[str, Any],
+            column_names: Optional[List[str]] = None,
+            match_any: bool = False,
+            row_factory: Optional[RowFactory] = None,
+            use_cache: bool = True
+    ) -> RowList:
+        """
+        Fetches rows whose columns equal the given values. Values are always bound as parameters.
+
+        Args:
+            table_name (str): The name of the table to query.
+            column_matches (Dict[str, Any]): A dictionary mapping columns to the values they must equal.
+            column_names (Optional[List[str]]): A list of specific columns to retrieve. Defaults to all columns.
+            match_any (bool): If True, a row matches when any column matches instead of all of them.
+            row_factory (Optional[RowFactory]): Overrides the manager's row factory for this call.
+            use_cache (bool): Whether the query cache may serve this call, if one is configured.
+
+        Returns:
+            RowList: A list of dictionaries for each matching row.
+
+        Raises:
+            DatabaseError: If the operation fails.
+        """
+        query = self.statements.select(table_name, column_names, column_matches.keys(), match_any)
+        return self._fetch_cached(
+            table_name, use_cache, query, list(column_matches.values()),
+            operation_context=f"Fetch rows from table '{table_name}'", row_factory=row_factory
+        )
+
+    def fetch_rows(
+            self,
+            table_name: str,
+            column_names: Optional[List[str]] = None,
+            where: Optional[Dict[str, Any]] = None,
+            condition: Optional[str] = None,
+            params: Optional[List[Any]] = None,
+            order_by: Sequence[str] = (),
+            limit: Optional[int] = None,
+            offset: Optional[int] = None,
+            row_factory: Optional[RowFactory] = None,
+            use_cache: bool = True
+    ) -> RowList:
+        """
+        Fetches filtered, sorted and limited rows in one parameterized query.
+
+        Args:
+            table_name (str): The name of the table to query.
             column_names (Optional[List[str]]): A list of specific columns to retrieve. Defaults to all columns.
+            where (Optional[Dict[str, Any]]): A dictionary mapping columns to the values they must equal.
+            condition (Optional[str]): A raw condition with `?` placeholders, ANDed with `where`.
+            params (Optional[List[Any]]): Values bound to the placeholders in `condition`.
+            order_by (Sequence[str]): Sort columns; a leading '-' sorts that column descending.
+            limit (Optional[int]): The maximum number of rows. None returns every matching row.
+            offset (Optional[int]): The number of matching rows to skip.
+            row_factory (Optional[RowFactory]): Overrides the manager's row factory for this call.
+            use_cache (bool): Whether the query cache may serve this call, if one is configured.
 
         Returns:
             RowList: A list of dictionaries for each matching row.
@@ -131,11 +679,216 @@ class DatabaseManager:
         Raises:
             DatabaseError: If the operation fails.
         """
-        columns_str = self.SQL_WILDCARD_ALL_COLUMNS if column_names is None else ', '.join(column_names)
-        query = f"SELECT {columns_str} FROM {table_name} WHERE {condition}"
-        return self._execute_query(query, fetch_mode=True, operation_context=f"Fetch rows with condition '{condition}'")
+        where = where or {}
+        # SQLite only accepts OFFSET after a LIMIT; -1 means no limit
+        if offset and limit is None:
+            limit = -1
+        query = self.statements.select(
+            table_name, column_names, where.keys(), condition=condition, order_by=order_by,
+            limit=limit is not None, offset=bool(offset)
+        )
+        values = list(where.values()) + list(params or [])
+        values += ([limit] if limit is not None else []) + ([offset] if offset else [])
+        return self._fetch_cached(
+            table_name, use_cache, query, values, operation_context=f"Querying table '{table_name}'",
+            row_factory=row_factory
+        )
+
+    def search_rows(
+            self,
+            table_name: str,
+            fts_table: str,
+            match: str,
+            column_names: Optional[List[str]] = None,
+            where: Optional[Dict[str, Any]] = None,
+            limit: Optional[int] = None,
+            snippet_markers: Optional[Tuple[str, str]] = None,
+            snippet_tokens: int = DEFAULT_SNIPPET_TOKENS,
+            row_factory: Optional[RowFactory] = None,
+            use_cache: bool = True
+    ) -> RowList:
+        """
+        Fetches the rows matching a full-text query, best match (lowest bm25 rank) first.
+
+        `fts_table` must be an external-content FTS5 table over `table_name` whose rowid is the `id`
+        of the table, kept in sync by triggers; see SQL/migrations/todos/006_full_text_search.sql.
+
+        Args:
+            table_name (str): The table holding the rows.
+            fts_table (str): Its FTS5 index.
+            match (str): An FTS5 query, such as '"buy" "mil"*'.
+            column_names (Optional[List[str]]): Columns of `table_name` to return. Defaults to all columns.
+            where (Optional[Dict[str, Any]]): Columns of `table_name` mapped to the values they must equal.
+            limit (Optional[int]): The maximum number of rows. None returns every match.
+            snippet_markers (Optional[Tuple[str, str]]): Text placed before and after every matched
+                term. When given, a last column `snippet` holds the best matching fragment.
+            snippet_tokens (int): The maximum number of tokens in a snippet.
+            row_factory (Optional[RowFactory]): Overrides the manager's row factory for this call.
+            use_cache (bool): Whether the query cache may serve this call, if one is configured.
+
+        Returns:
+            RowList: The matching rows.
+
+        Raises:
+            DatabaseError: If the operation fails, including when `match` is not a valid FTS5 query.
+        """
+        where = where or {}
+        query = self.statements.search(
+            table_name, fts_table, column_names, where.keys(), snippet=snippet_markers is not None,
+            limit=limit is not None
+        )
+        values = [*snippet_markers, self.SNIPPET_ELLIPSIS, snippet_tokens] if snippet_markers is not None else []
+        values += [match, *where.values()] + ([limit] if limit is not None else [])
+        return self._fetch_cached(
+            table_name, use_cache, query, values, operation_context=f"Searching table '{table_name}'",
+            row_factory=row_factory
+        )
+
+    def count_rows_by(
+            self,
+            table_name: str,
+            group_by: Sequence[str],
+            where: Optional[Dict[str, Any]] = None,
+            condition: Optional[str] = None,
+            params: Optional[List[Any]] = None,
+            use_cache: bool = True
+    ) -> Dict[Any, int]:
+        """
+        Counts the matching rows per distinct value of the `group_by` columns (GROUP BY).
+
+        Args:
+            table_name (str): The name of the table to query.
+            group_by (Sequence[str]): The columns to group by.
+            where (Optional[Dict[str, Any]]): A dictionary mapping columns to the values they must equal.
+            condition (Optional[str]): A raw condition with `?` placeholders, ANDed with `where`.
+            params (Optional[List[Any]]): Values bound to the placeholders in `condition`.
+            use_cache (bool): Whether the query cache may serve this call, if one is configured.
+
+        Returns:
+            Dict[Any, int]: The row count of each group, keyed by the group value, or by a tuple of
+                values when grouping by several columns.
+
+        Raises:
+            DatabaseError: If the operation fails.
+        """
+        where = where or {}
+        query = self.statements.count(table_name, where.keys(), group_by=group_by, condition=condition)
+        rows = self._fetch_cached(
+            table_name, use_cache, query, list(where.values()) + list(params or []),
+            operation_context=f"Counting groups in table '{table_name}'", row_factory=tuple_rows
+        )
+        if len(group_by) == 1:
+            return {row[0]: row[1] for row in rows}
+        return {row[:-1]: row[-1] for row in rows}
 
-    def delete_row(self, table_name: str, row_id: int) -> None:
+    def iter_rows(
+            self,
+            table_name: str,
+            column_names: Optional[List[str]] = None,
+            where: Optional[Dict[str, Any]] = None,
+            batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
+            row_factory: Optional[RowFactory] = None
+    ) -> Iterator[Any]:
+        """
+        Streams rows from the specified table, fetching `batch_size` rows at a time.
+
+        Only one batch is held in memory, so memory use does not grow with the table size.
+        The calling thread keeps its pooled connection checked out until the iterator is exhausted or closed.
+
+        Args:
+            table_name (str): The name of the table to query.
+            column_names (Optional[List[str]]): A list of specific columns to retrieve. Defaults to all columns.
+            where (Optional[Dict[str, Any]]): A dictionary mapping columns to the values they must equal.
+            batch_size (int): The number of rows requested from SQLite per `fetchmany` call.
+            row_factory (Optional[RowFactory]): Overrides the manager's row factory for this call.
+
+        Yields:
+            Any: One row per result row, a dictionary unless another row factory is used.
+
+        Raises:
+            DatabaseError: If the query fails.
+        """
+        where = where or {}
+        query = self.statements.select(table_name, column_names, where.keys())
+        try:
+            logging.debug("Streaming query: %s", query)
+            with self.connection() as connection:
+                cursor = connection.execute(query, list(where.values()))
+                convert = (row_factory or self.row_factory)(cursor)
+                while rows := cursor.fetchmany(batch_size):
+                    yield from (rows if convert is None else map(convert, rows))
+        except (sqlite3.Error, PoolTimeoutError) as error:
+            logging.exception(f"Streaming rows from table '{table_name}' failed.")
+            raise DatabaseError(f"Streaming rows from table '{table_name}' failed: {error}")
+
+    def fetch_page(
+            self,
+            table_name: str,
+            column_names: Optional[List[str]] = None,
+            where: Optional[Dict[str, Any]] = None,
+            after_id: Optional[int] = None,
+            limit: int = DEFAULT_PAGE_SIZE,
+            key_column: str = 'id',
+            row_factory: Optional[RowFactory] = None,
+            use_cache: bool = True
+    ) -> RowList:
+        """
+        Fetches one page of rows using keyset pagination.
+
+        Rows are ordered by `key_column` and the page starts right after `after_id`, so every page
+        is an index range scan no matter how deep into the table it is. Pass the key of the last row
+        of a page as `after_id` to get the next one.
+
+        Args:
+            table_name (str): The name of the table to query.
+            column_names (Optional[List[str]]): A list of specific columns to retrieve. Defaults to all columns.
+            where (Optional[Dict[str, Any]]): A dictionary mapping columns to the values they must equal.
+            after_id (Optional[int]): The key of the last row already seen. None starts from the beginning.
+            limit (int): The maximum number of rows in the page.
+            key_column (str): The unique, indexed column the pages are ordered by.
+            row_factory (Optional[RowFactory]): Overrides the manager's row factory for this call.
+            use_cache (bool): Whether the query cache may serve this call, if one is configured.
+
+        Returns:
+            RowList: A list of dictionaries for each row of the page.
+
+        Raises:
+            DatabaseError: If the operation fails.
+        """
+        where = where or {}
+        query = self.statements.page(table_name, column_names, where.keys(), key_column, after_id is not None)
+        params = list(where.values()) + ([after_id] if after_id is not None else []) + [limit]
+        return self._fetch_cached(
+            table_name, use_cache, query, params, operation_context=f"Fetching a page from table '{table_name}'",
+            row_factory=row_factory
+        )
+
+    def row_exists(
+            self, table_name: str, column_matches: Dict[str, Any], match_any: bool = False, use_cache: bool = True
+    ) -> bool:
+        """
+        Checks whether any row has columns equal to the given values, without fetching the rows.
+
+        Args:
+            table_name (str): The name of the table to query.
+            column_matches (Dict[str, Any]): A dictionary mapping columns to the values they must equal.
+            match_any (bool): If True, a row matches when any column matches instead of all of them.
+            use_cache (bool): Whether the query cache may serve this call, if one is configured.
+
+        Returns:
+            bool: True if at least one row matches.
+
+        Raises:
+            DatabaseError: If the operation fails.
+        """
+        query = self.statements.exists(table_name, column_matches.keys(), match_any)
+        result = self._fetch_cached(
+            table_name, use_cache, query, list(column_matches.values()),
+            operation_context=f"Checking row existence in table '{table_name}'", row_factory=tuple_rows
+        )
+        return bool(result)
+
+    def delete_row(self, table_name: str, row_id: int) -> int:
         """
         Deletes a row from the specified table by its ID.
 
@@ -143,35 +896,177 @@ class DatabaseManager:
             table_name (str): The name of the table.
             row_id (int): The ID of the row to delete.
 
+        Returns:
+            int: The number of deleted rows, 0 if no row had that ID.
+
+        Raises:
+            DatabaseError: If the delete operation fails.
+        """
+        query = self.statements.delete(table_name, ('id',))
+        result = self._execute_query(query, [row_id], operation_context=f"Deleting a row from table '{table_name}'")
+        self._invalidate_cache(table_name)
+        return result.rows_affected
+
+    def delete_rows_if(self, table_name: str, condition: str, params: Optional[List[Any]] = None) -> int:
+        """
+        Deletes the rows of the specified table that match a condition.
+
+        Args:
+            table_name (str): The name of the table.
+            condition (str): The WHERE clause condition for the deletion, with `?` placeholders for values.
+            params (Optional[List[Any]]): Values bound to the placeholders in `condition`.
+
+        Returns:
+            int: The number of deleted rows.
+
         Raises:
             DatabaseError: If the delete operation fails.
         """
-        query = f"DELETE FROM {table_name} WHERE id = ?"
-        self._execute_query(query, [row_id], operation_context=f"Deletion of row with ID '{row_id}' failed.")
+        query = self.statements.delete(table_name, condition=condition)
+        result = self._execute_query(
+            query, params, operation_context=f"Deleting rows from table '{table_name}'"
+        )
+        self._invalidate_cache(table_name)
+        return result.rows_affected
+
+    def delete_rows(
+            self,
+            table_name: str,
+            ids: Iterable[int],
+            condition: Optional[str] = None,
+            params: Optional[List[Any]] = None,
+            chunk_size: int = DEFAULT_ID_CHUNK_SIZE
+    ) -> int:
+        """
+        Deletes the rows with the given ids within a single transaction.
+
+        Ids are bound in chunks of `chunk_size` (`id IN (?, ...)`), so any number of ids fits SQLite's
+        limit on bound variables, and the whole set is committed once.
+
+        Args:
+            table_name (str): The name of the table.
+            ids (Iterable[int]): The ids of the rows to delete.
+            condition (Optional[str]): A raw condition the rows must also meet, with `?` placeholders.
+            params (Optional[List[Any]]): Values bound to the placeholders in `condition`.
+            chunk_size (int): The maximum number of ids bound to one statement.
+
+        Returns:
+            int: The number of deleted rows.
+
+        Raises:
+            DatabaseError: If the operation fails. No row is deleted in that case.
+        """
+        return self._run_by_id_chunks(
+            table_name, ids, lambda id_condition: self.statements.delete(table_name, condition=id_condition), [],
+            condition, params, chunk_size, f"Deleting rows from table '{table_name}'"
+        )
+
+    def update_rows_by_ids(
+            self,
+            table_name: str,
+            ids: Iterable[int],
+            column_values: Dict[str, Any],
+            condition: Optional[str] = None,
+            params: Optional[List[Any]] = None,
+            chunk_size: int = DEFAULT_ID_CHUNK_SIZE
+    ) -> int:
+        """
+        Sets the same column values on the rows with the given ids within a single transaction.
+
+        Ids are bound in chunks of `chunk_size`, as in delete_rows.
+
+        Args:
+            table_name (str): The name of the table to update.
+            ids (Iterable[int]): The ids of the rows to update.
+            column_values (Dict[str, Any]): A dictionary mapping columns to their new values.
+            condition (Optional[str]): A raw condition the rows must also meet, with `?` placeholders.
+            params (Optional[List[Any]]): Values bound to the placeholders in `condition`.
+            chunk_size (int): The maximum number of ids bound to one statement.
+
+        Returns:
+            int: The number of updated rows.
+
+        Raises:
+            DatabaseError: If the operation fails. No row is updated in that case.
+        """
+        return self._run_by_id_chunks(
+            table_name, ids,
+            lambda id_condition: self.statements.update(table_name, column_values.keys(), condition=id_condition),
+            list(column_values.values()), condition, params, chunk_size, f"Updating rows in table '{table_name}'"
+        )
+
+    def _run_by_id_chunks(
+            self,
+            table_name: str,
+            ids: Iterable[int],
+            build_statement: Callable[[str], str],
+            leading_params: List[Any],
+            condition: Optional[str],
+            params: Optional[List[Any]],
+            chunk_size: int,
+            operation_context: str
+    ) -> int:
+        """
+        Runs a statement restricted to `id IN (...)` once per chunk of ids, in one transaction.
 
-    def update_rows(self, table_name: str, column_values: Dict[str, Any], condition: str) -> None:
+        `build_statement` receives the WHERE condition; every run binds `leading_params`, the chunk of
+        ids, then `params`.
+        """
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be a positive integer.')
+
+        ids = list(ids)
+        affected = 0
+        try:
+            with self.transaction():
+                for start in range(0, len(ids), chunk_size):
+                    chunk = ids[start:start + chunk_size]
+                    id_condition = self.statements.in_list('id', len(chunk))
+                    query = build_statement(f'{id_condition} AND ({condition})' if condition else id_condition)
+                    result = self._execute_query(
+                        query, leading_params + chunk + list(params or []), operation_context=operation_context
+                    )
+                    affected += result.rows_affected
+        finally:
+            self._invalidate_cache(table_name)
+        logging.info(f"{operation_context}: {affected} of {len(ids)} rows affected.")
+        return affected
+
+    def update_rows(
+            self,
+            table_name: str,
+            column_values: Dict[str, Any],
+            condition: str,
+            params: Optional[List[Any]] = None
+    ) -> int:
         """
         Updates rows in the specified table that match a condition.
 
         Args:
             table_name (str): The name of the table to update.
             column_values (Dict[str, Any]): A dictionary mapping columns to their new values.
-            condition (str): The WHERE clause condition for the update.
+            condition (str): The WHERE clause condition for the update, with `?` placeholders for values.
+            params (Optional[List[Any]]): Values bound to the placeholders in `condition`.
+
+        Returns:
+            int: The number of updated rows.
 
         Raises:
             DatabaseError: If the update operation fails.
         """
-        set_clause = ', '.join([f"{col} = ?" for col in column_values.keys()])
-        values = list(column_values.values())
-        query = f"UPDATE {table_name} SET {set_clause} WHERE {condition}"
-        self._execute_query(query, values, operation_context=f"Updating rows in table '{table_name}' failed.")
+        query = self.statements.update(table_name, column_values.keys(), condition=condition)
+        values = list(column_values.values()) + list(params or [])
+        result = self._execute_query(query, values, operation_context=f"Updating rows in table '{table_name}'")
+        self._invalidate_cache(table_name)
+        return result.rows_affected
 
-    def get_row_count(self, table_name: str) -> int:
+    def get_row_count(self, table_name: str, use_cache: bool = True) -> int:
         """
         Retrieves the total number of rows in the specified table.
 
         Args:
             table_name (str): The name of the table.
+            use_cache (bool): Whether the query cache may serve this call, if one is configured.
 
         Returns:
             int: The count of rows in the table.
@@ -179,66 +1074,153 @@ class DatabaseManager:
         Raises:
             DatabaseError: If the row count query fails.
         """
-        query = f"SELECT COUNT(*) AS row_count FROM {table_name}"
-        result = self._execute_query(query, fetch_mode=True, operation_context=f"Counting rows in table '{table_name}'")
-        return result[0]['row_count'] if result else 0
+        query = self.statements.count(table_name)
+        result = self._fetch_cached(
+            table_name, use_cache, query, operation_context=f"Counting rows in table '{table_name}'",
+            row_factory=tuple_rows
+        )
+        return result[0][0] if result else 0
 
     def _ensure_database_existence(self) -> None:
         """
-        Checks if the database exists and initializes it if necessary.
+        Checks that every managed table exists and initializes the missing ones, in order.
         """
 
         try:
 
-            query = f"SELECT name FROM sqlite_master WHERE type='table' AND name='{self._db_name}'"
-            self.cursor.execute(query)
-
-            table_exists = self.cursor.fetchall()
-            if not table_exists:
-                logging.warning('Table does not exist! ')
-                self._initialize_database()
-            else:
-                logging.info(f'Database {self.database_path} exists and checked!')
+            query = "SELECT name FROM sqlite_master WHERE type='table' AND name=?"
+            for table_name in self.tables:
+                with self.connection() as connection:
+                    table_exists = connection.execute(query, [table_name]).fetchall()
+                if not table_exists:
+                    logging.warning(f"Table '{table_name}' does not exist!")
+                else:
+                    logging.info(f"Table '{table_name}' in {self.database_path} exists and checked!")
+                self._initialize_table(table_name, create_schema=not table_exists)
         except sqlite3.Error as e:
             raise DatabaseError(f"Check database existence operation failed: {e.args[0]}")
 
-    def _initialize_database(self) -> None:
+    def _initialize_table(self, table_name: str, create_schema: bool = True) -> None:
         """
-        Performs initial database setup using an SQL script if available.
+        Creates a table with its SQL/create_<table>_db.sql script if available, then applies its pending migrations.
+
+        Migrations live in SQL/migrations/<table>/ and the applied version is tracked per table in the
+        schema_versions table.
+
+        Args:
+            table_name (str): The table to initialize.
+            create_schema (bool): Whether to run the initialization script. False for existing tables.
         """
 
         try:
-            init_script_path = os.path.join(self.DEFAULT_SQL_SCRIPT_DIRECTORY, f'create_{self._db_name}_db.sql')
+            init_script_path = os.path.join(self.DEFAULT_SQL_SCRIPT_DIRECTORY, f'create_{table_name}_db.sql')
 
-            if os.path.exists(init_script_path):
+            if create_schema and os.path.exists(init_script_path):
                 logging.info(f"Running initialization script: {init_script_path}")
                 with open(init_script_path, 'r') as script_file:
                     sql_script = script_file.read()
-                self.cursor.executescript(sql_script)
-                self.connection.commit()
-                logging.info("Database initialized successfully.")
-            else:
-                logging.warning("No initialization script found. Skipping setup.")
+                with self.connection() as connection:
+                    connection.executescript(sql_script)
+                    connection.commit()
+                logging.info(f"Table '{table_name}' initialized successfully.")
+            elif create_schema:
+                logging.warning(f"No initialization script found for table '{table_name}'. Skipping setup.")
+
+            migrations = discover_migrations(
+                os.path.join(self.DEFAULT_SQL_SCRIPT_DIRECTORY, self.MIGRATIONS_SUBDIRECTORY, table_name)
+            )
+            if not migrations:
+                return
+            with self.connection() as connection:
+                if table_name == self._db_name:
+                    adopt_user_version(connection, table_name)
+                schema_version = apply_migrations(connection, migrations, component=table_name)
+            logging.info(f"Table '{table_name}' schema is at version {schema_version}.")
 
         except sqlite3.Error as error:
-            logging.exception("Database initialization failed.")
-            raise DatabaseError(f"Failed to initialize database: {error}")
+            logging.exception(f"Initialization of table '{table_name}' failed.")
+            raise DatabaseError(f"Failed to initialize table '{table_name}': {error}")
+
+    def explain(self, query: str, params: Optional[List[Any]] = None) -> List[str]:
+        """
+        Returns SQLite's query plan for a statement, one line per plan step.
+
+        Useful to check that a query is served by an index (e.g. "SEARCH todos USING INDEX ...")
+        rather than a full table scan ("SCAN todos").
+
+        Args:
+            query (str): The SQL statement to explain.
+            params (Optional[List[Any]]): Parameters for the query placeholders.
+
+        Returns:
+            List[str]: The detail column of EXPLAIN QUERY PLAN.
+
+        Raises:
+            DatabaseError: If the statement cannot be planned.
+        """
+        plan = self._execute_query(
+            f"EXPLAIN QUERY PLAN {query}", params, fetch_mode=True,
+            operation_context="Explaining query", row_factory=tuple_rows
+        )
+        return [detail for _, _, _, detail in plan]
 
     def _ensure_db_directory(self) -> None:
         """
         Ensures the database directory exists before connecting.
         """
+        if self.in_memory:
+            return
         if not os.path.exists(os.path.dirname(self.database_path)):
             logging.info(f"Creating database directory: {os.path.dirname(self.database_path)}")
             os.makedirs(os.path.dirname(self.database_path), exist_ok=True)
 
+    def _fetch_cached(
+            self,
+            table_name: str,
+            use_cache: bool,
+            query: str,
+            params: Optional[List[Any]] = None,
+            operation_context: str = "SQL Operation",
+            row_factory: Optional[RowFactory] = None
+    ) -> RowList:
+        """
+        Runs a read through the query cache, if one is configured and `use_cache` is True.
+
+        Results are keyed by table, SQL text, parameters and row factory, and are only stored if
+        the table was not written to while the query ran.
+        """
+        row_factory = row_factory or self.row_factory
+        # Reads inside a transaction may see uncommitted rows, which must not be shared through the cache
+        if self.query_cache is None or not use_cache or self.in_transaction:
+            return self._execute_query(query, params, True, operation_context, row_factory)
+
+        cache_key = (query, tuple(params or ()), row_factory)
+        hit, rows = self.query_cache.get(table_name, cache_key)
+        if hit:
+            return rows
+
+        generation = self.query_cache.generation(table_name)
+        rows = self._execute_query(query, params, True, operation_context, row_factory)
+        self.query_cache.put(table_name, cache_key, rows, generation)
+        return rows
+
+    def _invalidate_cache(self, table_name: str) -> None:
+        """
+        Drops the cached reads of a table after a write to it.
+        """
+        if self.query_cache is not None:
+            self.query_cache.invalidate(table_name)
+            if self._transaction_state.depth:
+                self._transaction_state.written_tables.add(table_name)
+
     def _execute_query(
             self,
             query: str,
             params: Optional[List[Any]] = None,
             fetch_mode: bool = False,
-            operation_context: str = "SQL Operation"
-    ) -> Optional[RowList]:
+            operation_context: str = "SQL Operation",
+            row_factory: Optional[RowFactory] = None
+    ) -> Union[RowList, WriteResult]:
         """
         Executes a given SQL query with optional parameter binding and result fetching.
 
@@ -246,27 +1228,91 @@ class DatabaseManager:
             query (str): The SQL query to execute.
             params (Optional[List[Any]]): Parameters for the query placeholders.
             fetch_mode (bool): If True, fetches and returns results.
-            operation_context (str): A description of the specific operation for logging.
+            operation_context (str): A description of the specific operation for logging. Query hooks
+                aggregate by it, so it must not contain values such as ids or conditions.
+            row_factory (Optional[RowFactory]): Converts fetched rows. Defaults to the manager's row factory.
 
         Returns:
-            Optional[RowList]: Fetched rows as a list of dictionaries if fetch_mode is True; otherwise None.
+            Union[RowList, WriteResult]: Fetched rows if fetch_mode is True; otherwise a WriteResult.
 
         Raises:
             DatabaseError: If the query execution fails.
         """
+        hooks = self._query_hooks
+        started = time.perf_counter() if hooks else 0.0
+        autocommit = not self._transaction_state.depth
         try:
-            logging.info(f"Executing query: {query}")
-            self.cursor.execute(query, params or [])
+            logging.debug("Executing query: %s", query)
+            with self.connection() as connection:
+                result = self.retry_policy.call(lambda: self._run_statement(
+                    connection, query, params, fetch_mode, row_factory or self.row_factory, autocommit
+                ))
+                if autocommit and connection.in_transaction:
+                    self._commit(connection)
 
-            if fetch_mode:
-                rows = self.cursor.fetchall()
-                column_names = [description[0] for description in self.cursor.description]
-                return [dict(zip(column_names, row)) for row in rows]
+        except (sqlite3.Error, PoolTimeoutError) as error:
+            if hooks:
+                self._emit_query_event(hooks, QueryEvent(
+                    query, operation_context, time.perf_counter() - started, 0, fetch_mode, error
+                ))
+            logging.exception(f"{operation_context} failed.")
+            raise DatabaseError(f"{operation_context} failed: {error}")
 
-            self.connection.commit()
+        if hooks:
+            rows = len(result) if fetch_mode else max(result.rows_affected, 0)
+            self._emit_query_event(hooks, QueryEvent(
+                query, operation_context, time.perf_counter() - started, rows, fetch_mode
+            ))
+        return result
 
-        except sqlite3.Error as error:
-            logging.exception(f"{operation_context} failed.")
-            raise DatabaseError(f"{operation_context}: {error}")
+    @staticmethod
+    def _emit_query_event(hooks: Tuple[QueryHook, ...], event: QueryEvent) -> None:
+        """
+        Passes an event to every hook. A failing hook is logged and never fails the query.
+        """
+        for hook in hooks:
+            try:
+                hook(event)
+            except Exception:
+                logging.exception(f"Query hook {hook!r} failed.")
+
+    @staticmethod
+    def _run_statement(
+            connection: sqlite3.Connection,
+            query: str,
+            params: Optional[List[Any]],
+            fetch_mode: bool,
+            row_factory: RowFactory,
+            autocommit: bool = True
+    ) -> Union[RowList, WriteResult]:
+        """
+        Runs one statement on the given connection, without committing it.
+
+        With `autocommit`, a failing statement rolls back the implicit transaction it opened, so a
+        retry starts over instead of adding to the writes of a failed attempt. Inside a transaction()
+        block, SQLite has already undone the failed statement alone.
+        """
+        try:
+            cursor = connection.execute(query, params or [])
+            if fetch_mode:
+                convert = row_factory(cursor)
+                return cursor.fetchall() if convert is None else list(map(convert, cursor))
+            return WriteResult(cursor.rowcount, cursor.lastrowid)
+        except sqlite3.Error:
+            if autocommit and connection.in_transaction:
+                connection.rollback()
+            raise
+
+    def _commit(self, connection: sqlite3.Connection) -> None:
+        """
+        Commits the statement just run, retrying only the COMMIT while the database is busy.
 
-        return None
+        A failed COMMIT leaves the transaction open with its writes, so running the statement again
+        would apply them twice. If the COMMIT keeps failing, the transaction is rolled back.
+        """
+        try:
+            self.retry_policy.call(connection.commit)
+        except sqlite3.Error:
+            if connection.in_transaction:
+                connection.rollback()
+            raise
@@ -0,0 +1,146 @@
+import bisect
+import json
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeAlias
+
+# Statements slower than the slow-query threshold are logged here, so they can be routed separately
+slow_query_logger = logging.getLogger('lazy_orm.slow_queries')
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_WHITESPACE = re.compile(r'\s+')
+
+
+@dataclass(frozen=True, slots=True)
+class QueryEvent:
+    """What one executed statement cost."""
+    query: str
+    operation_context: str
+    duration_seconds: float
+    rows: int
+    fetch_mode: bool
+    error: Optional[BaseException] = None
+
+
+# A hook is called after every statement DatabaseManager executes, on the executing thread
+QueryHook: TypeAlias = Callable[[QueryEvent], None]
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(query: str) -> str:
+    """
+    Reduces a statement to its shape: literals become `?` and whitespace is collapsed, so
+    statements differing only in inlined values share one histogram.
+    """
+    query = _STRING_LITERAL.sub('?', query)
+    query = _NUMBER_LITERAL.sub('?', query)
+    return _WHITESPACE.sub(' ', query).strip()
+
+
+class _ShapeStats:
+    __slots__ = ('count', 'errors', 'rows', 'total_seconds', 'max_seconds', 'buckets')
+
+    def __init__(self, bucket_count: int) -> None:
+        self.count = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * bucket_count
+
+
+class QueryStats:
+    """
+    A query hook keeping a latency histogram per normalized SQL shape and logging slow statements.
+
+    Register it with DatabaseManager(query_hooks=[stats]) or manager.add_query_hook(stats), then read
+    `snapshot()` or `to_json()`.
+    """
+
+    # Upper bounds of the latency buckets in milliseconds; a last bucket catches everything slower
+    DEFAULT_BUCKET_BOUNDS_MS = (1, 5, 10, 50, 100, 500, 1000)
+
+    def __init__(
+            self,
+            slow_query_seconds: Optional[float] = None,
+            bucket_bounds_ms: Tuple[float, ...] = DEFAULT_BUCKET_BOUNDS_MS
+    ) -> None:
+        """
+        Args:
+            slow_query_seconds (Optional[float]): Statements taking at least this long are logged to the
+                'lazy_orm.slow_queries' logger. None disables the slow-query log.
+            bucket_bounds_ms (Tuple[float, ...]): Ascending upper bounds of the histogram buckets.
+        """
+        self.slow_query_seconds = slow_query_seconds
+        self.bucket_bounds_ms = tuple(bucket_bounds_ms)
+        self._lock = threading.Lock()
+        self._shapes: Dict[str, _ShapeStats] = {}
+        self._contexts: Dict[str, int] = {}
+
+    def __call__(self, event: QueryEvent) -> None:
+        shape = normalize_sql(event.query)
+        bucket = bisect.bisect_left(self.bucket_bounds_ms, event.duration_seconds * 1000)
+        with self._lock:
+            stats = self._shapes.get(shape)
+            if stats is None:
+                stats = self._shapes[shape] = _ShapeStats(len(self.bucket_bounds_ms) + 1)
+            stats.count += 1
+            stats.rows += event.rows
+            stats.total_seconds += event.duration_seconds
+            stats.max_seconds = max(stats.max_seconds, event.duration_seconds)
+            stats.buckets[bucket] += 1
+            if event.error is not None:
+                stats.errors += 1
+            self._contexts[event.operation_context] = self._contexts.get(event.operation_context, 0) + 1
+
+        if self.slow_query_seconds is not None and event.duration_seconds >= self.slow_query_seconds:
+            slow_query_logger.warning(
+                f"Slow query ({event.duration_seconds * 1000:.1f} ms, {event.rows} rows) "
+                f"during '{event.operation_context}': {event.query}"
+            )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns the collected statistics as plain data.
+
+        Returns:
+            Dict[str, Any]: `bucket_bounds_ms`, `queries` (per normalized SQL: count, errors, rows,
+                total/mean/max milliseconds and bucket counts, slowest total first) and
+                `operation_contexts` (statement counts per operation context).
+        """
+        with self._lock:
+            queries: List[Dict[str, Any]] = [
+                {
+                    'sql': shape,
+                    'count': stats.count,
+                    'errors': stats.errors,
+                    'rows': stats.rows,
+                    'total_ms': stats.total_seconds * 1000,
+                    'mean_ms': stats.total_seconds * 1000 / stats.count,
+                    'max_ms': stats.max_seconds * 1000,
+                    'buckets': list(stats.buckets),
+                }
+                for shape, stats in self._shapes.items()
+            ]
+            contexts = dict(self._contexts)
+
+        queries.sort(key=lambda query: query['total_ms'], reverse=True)
+        return {'bucket_bounds_ms': list(self.bucket_bounds_ms), 'queries': queries, 'operation_contexts': contexts}
+
+    def to_json(self, **json_options: Any) -> str:
+        """
+        Returns `snapshot()` serialized as JSON.
+        """
+        return json.dumps(self.snapshot(), **json_options)
+
+    def reset(self) -> None:
+        """
+        Discards the collected statistics.
+        """
+        with self._lock:
+            self._shapes.clear()
+            self._contexts.clear()
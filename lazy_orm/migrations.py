@@ -0,0 +1,170 @@
+import logging
+import os
+import re
+import sqlite3
+from dataclasses import dataclass
+from typing import List, Optional
+
+# Migration files are named <version>_<description>.sql, e.g. 001_lookup_indexes.sql
+MIGRATION_FILE_PATTERN = re.compile(r'^(\d+)_(\w+)\.sql$')
+
+# Databases holding several tables track one schema version per table (component) here
+SCHEMA_VERSIONS_TABLE = 'schema_versions'
+
+
+@dataclass(frozen=True)
+class Migration:
+    """A schema migration script and the schema version it upgrades the database to."""
+    version: int
+    name: str
+    path: str
+
+    def read_script(self) -> str:
+        with open(self.path, 'r') as script_file:
+            return script_file.read()
+
+
+def discover_migrations(directory: str) -> List[Migration]:
+    """
+    Lists the migration scripts in a directory, ordered by version.
+
+    Args:
+        directory (str): The directory holding the migration files. A missing directory means no migrations.
+
+    Returns:
+        List[Migration]: The migrations found, lowest version first.
+
+    Raises:
+        ValueError: If two files declare the same version.
+    """
+    if not os.path.isdir(directory):
+        return []
+
+    migrations = []
+    for file_name in os.listdir(directory):
+        match = MIGRATION_FILE_PATTERN.match(file_name)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), os.path.join(directory, file_name)))
+    migrations.sort(key=lambda migration: migration.version)
+
+    versions = [migration.version for migration in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"Duplicate migration versions in {directory}: {versions}")
+    return migrations
+
+
+def get_schema_version(connection: sqlite3.Connection, component: Optional[str] = None) -> int:
+    """
+    Returns the schema version of a component, or the one recorded in the database header
+    (PRAGMA user_version) when no component is given.
+    """
+    if component is None:
+        return connection.execute('PRAGMA user_version').fetchone()[0]
+
+    _ensure_schema_versions_table(connection)
+    row = connection.execute(
+        f'SELECT version FROM {SCHEMA_VERSIONS_TABLE} WHERE component = ?', [component]
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def adopt_user_version(connection: sqlite3.Connection, component: str) -> None:
+    """
+    Records PRAGMA user_version as the component's version if none is recorded yet.
+
+    Databases holding a single table tracked that table's migrations in user_version before
+    per-component versions existed.
+    """
+    _ensure_schema_versions_table(connection)
+    connection.execute(
+        f'INSERT INTO {SCHEMA_VERSIONS_TABLE} (component, version) '
+        f'SELECT ?, user_version FROM pragma_user_version WHERE user_version > 0 ON CONFLICT DO NOTHING',
+        [component]
+    )
+    connection.commit()
+
+
+def _ensure_schema_versions_table(connection: sqlite3.Connection) -> None:
+    connection.execute(
+        f'CREATE TABLE IF NOT EXISTS {SCHEMA_VERSIONS_TABLE} (component TEXT PRIMARY KEY, version INTEGER NOT NULL)'
+    )
+
+
+def split_statements(script: str) -> List[str]:
+    """
+    Splits an SQL script into its statements, so they can run one by one inside a transaction.
+
+    Semicolons inside string literals, comments and trigger bodies do not end a statement.
+    """
+    statements, pending = [], ''
+    for piece in script.split(';'):
+        pending += piece + ';'
+        if sqlite3.complete_statement(pending):
+            statements.append(pending)
+            pending = ''
+    if pending.strip(' \t\n;'):
+        statements.append(pending)
+    return statements
+
+
+def _version_update(version: int, component: Optional[str]) -> str:
+    if component is None:
+        return f'PRAGMA user_version = {version};'
+    quoted_component = component.replace("'", "''")
+    return (
+        f"INSERT INTO {SCHEMA_VERSIONS_TABLE} (component, version) VALUES ('{quoted_component}', {version}) "
+        f"ON CONFLICT (component) DO UPDATE SET version = excluded.version;"
+    )
+
+
+def apply_migrations(
+        connection: sqlite3.Connection, migrations: List[Migration], component: Optional[str] = None
+) -> int:
+    """
+    Applies the migrations newer than the schema version, in order.
+
+    Each migration runs in its own transaction together with the version update, so a
+    failing migration leaves the database at the previous version. The transaction takes the
+    write lock before the version is read again (BEGIN IMMEDIATE), so when several processes
+    open the same database at once, each migration is applied by exactly one of them and the
+    others wait for it (busy_timeout) and skip it.
+
+    Args:
+        connection (sqlite3.Connection): The connection to migrate.
+        migrations (List[Migration]): The known migrations, lowest version first.
+        component (Optional[str]): The component (table) the migrations belong to, versioned in the
+            schema_versions table. None versions them in PRAGMA user_version.
+
+    Returns:
+        int: The schema version after migrating.
+
+    Raises:
+        sqlite3.Error: If a migration script fails.
+    """
+    if connection.in_transaction:
+        connection.commit()
+    current_version = get_schema_version(connection, component)
+    for migration in migrations:
+        if migration.version <= current_version:
+            continue
+
+        try:
+            connection.execute('BEGIN IMMEDIATE')
+            current_version = get_schema_version(connection, component)
+            if migration.version <= current_version:
+                # Another connection applied it while this one waited for the lock
+                connection.rollback()
+                continue
+
+            logging.info(f"Applying migration {migration.version} ({migration.name})...")
+            for statement in split_statements(migration.read_script()):
+                connection.execute(statement)
+            connection.execute(_version_update(migration.version, component))
+            connection.commit()
+        except sqlite3.Error:
+            if connection.in_transaction:
+                connection.rollback()
+            raise
+        current_version = migration.version
+
+    return current_version
@@ -0,0 +1,254 @@
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, TypeVar
+
+T = TypeVar('T')
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available within the checkout timeout."""
+
+
+@dataclass(frozen=True)
+class ConnectionSettings:
+    """
+    Settings applied to every pooled connection.
+
+    Attributes:
+        journal_mode (str): SQLite journal mode. WAL lets readers proceed while one writer commits.
+        synchronous (str): Durability level. NORMAL is safe with WAL and avoids an fsync per commit.
+        cache_size (int): Page cache size; negative values are KiB, positive values are pages.
+        mmap_size (int): Bytes of the database file to memory-map, 0 disables memory mapping.
+        busy_timeout_ms (int): How long SQLite waits on a locked database before reporting it busy.
+        cached_statements (int): Size of sqlite3's per-connection prepared statement cache.
+        foreign_keys (bool): Enforce REFERENCES constraints. Every referenced table must then exist
+            in the same database.
+    """
+    journal_mode: str = 'WAL'
+    synchronous: str = 'NORMAL'
+    cache_size: int = -16000
+    mmap_size: int = 0
+    busy_timeout_ms: int = 5000
+    cached_statements: int = 256
+    foreign_keys: bool = False
+
+    def pragmas(self) -> List[str]:
+        return [
+            f'PRAGMA journal_mode = {self.journal_mode}',
+            f'PRAGMA synchronous = {self.synchronous}',
+            f'PRAGMA cache_size = {self.cache_size}',
+            f'PRAGMA mmap_size = {self.mmap_size}',
+            f'PRAGMA busy_timeout = {self.busy_timeout_ms}',
+            f"PRAGMA foreign_keys = {'ON' if self.foreign_keys else 'OFF'}",
+        ]
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retries operations that fail because the database is locked or busy.
+
+    SQLite returns SQLITE_BUSY without waiting for the busy timeout in some cases, such as a
+    read transaction that tries to upgrade to a write while another connection is writing.
+
+    Attributes:
+        attempts (int): The total number of attempts, including the first one.
+        backoff_seconds (float): The delay before the first retry; it doubles on each retry.
+    """
+    attempts: int = 3
+    backoff_seconds: float = 0.05
+
+    @staticmethod
+    def is_retryable(error: sqlite3.Error) -> bool:
+        message = str(error).lower()
+        return isinstance(error, sqlite3.OperationalError) and ('locked' in message or 'busy' in message)
+
+    def call(self, operation: Callable[[], T]) -> T:
+        """
+        Calls `operation`, retrying it while it fails with a retryable error.
+        """
+        delay = self.backoff_seconds
+        for attempt in range(1, self.attempts):
+            try:
+                return operation()
+            except sqlite3.Error as error:
+                if not self.is_retryable(error):
+                    raise
+                logging.warning(f'Database busy, retrying in {delay:.3f}s (attempt {attempt} of {self.attempts}).')
+                time.sleep(delay)
+                delay *= 2
+        return operation()
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """A snapshot of connection pool usage."""
+    pool_size: int
+    created: int
+    idle: int
+    in_use: int
+    checkouts: int
+    waits: int
+    wait_time_seconds: float
+
+
+class _ThreadCheckout(threading.local):
+    connection = None
+    depth = 0
+
+
+class ConnectionPool:
+    """
+    A bounded pool of SQLite connections with thread-local checkout.
+
+    A thread checks a connection out for the duration of an operation. Nested checkouts on the
+    same thread reuse that connection, so a transaction spanning several operations stays on one
+    connection. When every connection is in use, other threads wait for one to be returned.
+    """
+
+    DEFAULT_POOL_SIZE = 5
+    DEFAULT_CHECKOUT_TIMEOUT = 30.0
+
+    def __init__(
+            self,
+            database_path: str,
+            pool_size: int = DEFAULT_POOL_SIZE,
+            settings: ConnectionSettings = ConnectionSettings(),
+            checkout_timeout: float = DEFAULT_CHECKOUT_TIMEOUT
+    ) -> None:
+        """
+        Initializes the pool and opens its first connection so configuration errors surface early.
+
+        Args:
+            database_path (str): The path of the SQLite database file, or a `file:` URI.
+            pool_size (int): The maximum number of open connections.
+            settings (ConnectionSettings): PRAGMA settings applied to each new connection.
+            checkout_timeout (float): Seconds to wait for a free connection before giving up.
+        """
+        if pool_size < 1:
+            raise ValueError('pool_size must be a positive integer.')
+
+        self.database_path = database_path
+        self.pool_size = pool_size
+        self.settings = settings
+        self.checkout_timeout = checkout_timeout
+
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._local = _ThreadCheckout()
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+
+        self._idle.put(self._create_connection())
+
+    def _create_connection(self) -> sqlite3.Connection:
+        """
+        Opens a new connection and applies the configured PRAGMA settings.
+        """
+        logging.info(f"Opening pooled connection to {self.database_path}...")
+        connection = sqlite3.connect(
+            self.database_path, check_same_thread=False, cached_statements=self.settings.cached_statements, uri=True
+        )
+        for pragma in self.settings.pragmas():
+            connection.execute(pragma)
+        self._connections.append(connection)
+        return connection
+
+    def acquire(self) -> sqlite3.Connection:
+        """
+        Checks a connection out for the calling thread.
+
+        Returns:
+            sqlite3.Connection: The thread's connection. Release it with `release`.
+
+        Raises:
+            PoolTimeoutError: If no connection is returned to the pool within the checkout timeout.
+        """
+        local = self._local
+        if local.connection is not None:
+            local.depth += 1
+            return local.connection
+
+        connection = self._take_connection()
+        local.connection, local.depth = connection, 1
+        return connection
+
+    def _take_connection(self) -> sqlite3.Connection:
+        with self._lock:
+            self._checkouts += 1
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                if len(self._connections) < self.pool_size:
+                    return self._create_connection()
+            self._waits += 1
+
+        started = time.perf_counter()
+        try:
+            connection = self._idle.get(timeout=self.checkout_timeout)
+        except queue.Empty:
+            raise PoolTimeoutError(f'No connection available after {self.checkout_timeout}s.') from None
+        finally:
+            with self._lock:
+                self._wait_time += time.perf_counter() - started
+        return connection
+
+    def release(self, connection: sqlite3.Connection) -> None:
+        """
+        Returns a connection checked out with `acquire`. The outermost release puts it back in the pool.
+        """
+        local = self._local
+        if local.connection is not connection:
+            raise ValueError('Connection was not checked out by this thread.')
+
+        local.depth -= 1
+        if local.depth == 0:
+            local.connection = None
+            if connection.in_transaction:
+                logging.warning('Rolling back a transaction left open on a released connection.')
+                connection.rollback()
+            self._idle.put(connection)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Context manager around `acquire` / `release`.
+        """
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def stats(self) -> PoolStats:
+        """
+        Returns a snapshot of the pool usage counters.
+        """
+        with self._lock:
+            idle = self._idle.qsize()
+            return PoolStats(
+                pool_size=self.pool_size,
+                created=len(self._connections),
+                idle=idle,
+                in_use=len(self._connections) - idle,
+                checkouts=self._checkouts,
+                waits=self._waits,
+                wait_time_seconds=self._wait_time,
+            )
+
+    def close(self) -> None:
+        """
+        Closes every connection opened by the pool.
+        """
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+            self._idle = queue.LifoQueue()
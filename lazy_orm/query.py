@@ -0,0 +1,337 @@
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+from lazy_orm.row_factories import RowFactory, dict_rows, tuple_rows
+
+if TYPE_CHECKING:
+    # Imported for annotations only: db_manager imports this module to create QuerySets
+    from lazy_orm.db_manager import DatabaseManager
+
+# The suffixes of where() keywords, as in status__ne=1, and the operators they compare with; no suffix means eq
+LOOKUP_OPERATORS = {'eq': '=', 'ne': '!=', 'lt': '<', 'lte': '<=', 'gt': '>', 'gte': '>='}
+# Comparing with None uses IS, so that status=None matches NULL
+NULL_OPERATORS = {'eq': 'IS', 'ne': 'IS NOT'}
+
+
+class QuerySet:
+    """
+    A lazily evaluated, chainable query over one table. Created by DatabaseManager.table.
+
+    Every chained call returns a new QuerySet and leaves its source unchanged, so a base query can
+    be shared and refined. Nothing runs until the query is evaluated. fetch(), iteration, first(),
+    indexing, count(), exists() and count_by() each compile it into one parameterized statement and
+    run it through the manager's query cache. A QuerySet keeps no results, so evaluating it again
+    runs the statement again.
+
+    Example:
+        manager.table('todos').where(status=0).order_by('-date_added').only('id', 'task')[:50]
+    """
+
+    def __init__(
+            self,
+            manager: 'DatabaseManager',
+            table_name: str,
+            columns: Optional[Tuple[str, ...]] = None,
+            conditions: Tuple[str, ...] = (),
+            params: Tuple[Any, ...] = (),
+            order_by: Tuple[str, ...] = (),
+            limit: Optional[int] = None,
+            offset: int = 0,
+            row_factory: Optional[RowFactory] = None,
+            use_cache: bool = True
+    ) -> None:
+        """
+        Args:
+            manager (DatabaseManager): The database the query runs on.
+            table_name (str): The table to query.
+            columns (Optional[Tuple[str, ...]]): The columns to return. Defaults to all columns.
+            conditions (Tuple[str, ...]): Conditions with `?` placeholders, ANDed together.
+            params (Tuple[Any, ...]): Values bound to the placeholders of `conditions`, in order.
+            order_by (Tuple[str, ...]): Sort columns; a leading '-' sorts that column descending.
+            limit (Optional[int]): The maximum number of rows. None returns every matching row.
+            offset (int): The number of matching rows to skip.
+            row_factory (Optional[RowFactory]): The row representation. Defaults to the manager's.
+            use_cache (bool): Whether the query cache may serve the query, if one is configured.
+        """
+        self._manager = manager
+        self._table_name = table_name
+        self._columns = columns
+        self._conditions = conditions
+        self._params = params
+        self._order_by = order_by
+        self._limit = limit
+        self._offset = offset
+        self._row_factory = row_factory
+        self._use_cache = use_cache
+
+    def where(self, condition: Optional[str] = None, *params: Any, **lookups: Any) -> 'QuerySet':
+        """
+        Returns the query restricted to the rows meeting a raw condition and every lookup.
+
+        Lookups compare a column with a bound value: `status=0`, or `column__<lookup>=value` with one
+        of eq, ne, lt, lte, gt, gte and in (a sequence of values). None compares with IS, so
+        `date_completed=None` matches NULL. Calling where() again ANDs the new restrictions.
+
+        Args:
+            condition (Optional[str]): A raw condition with `?` placeholders, such as 'a = ? OR b = ?'.
+            *params (Any): Values bound to the placeholders in `condition`.
+            **lookups (Any): Columns, with an optional lookup suffix, mapped to the values they are compared with.
+
+        Raises:
+            ValueError: If a lookup is unknown, or parameters are given without a condition.
+        """
+        conditions, values = list(self._conditions), list(self._params)
+        if condition is not None:
+            conditions.append(f'({condition})')
+            values.extend(params)
+        elif params:
+            raise ValueError('Parameters were given without a condition to bind them to.')
+        for key, value in lookups.items():
+            comparison, bound = self._lookup(key, value)
+            conditions.append(comparison)
+            values.extend(bound)
+        return self._clone(conditions=tuple(conditions), params=tuple(values))
+
+    def where_any(self, **lookups: Any) -> 'QuerySet':
+        """
+        Returns the query restricted to the rows matching at least one of the lookups. See where().
+        """
+        if len(lookups) < 2:
+            return self.where(**lookups)
+        comparisons = [self._lookup(key, value) for key, value in lookups.items()]
+        condition = ' OR '.join(comparison for comparison, _ in comparisons)
+        params = [value for _, bound in comparisons for value in bound]
+        return self.where(condition, *params)
+
+    def order_by(self, *columns: str) -> 'QuerySet':
+        """
+        Returns the query sorted by the given columns, replacing any previous order. A leading '-'
+        sorts that column descending.
+        """
+        return self._clone(order_by=columns)
+
+    def limit(self, count: Optional[int]) -> 'QuerySet':
+        """
+        Returns the query returning at most `count` rows, or every row if None. See also slicing.
+        """
+        if count is not None and count < 0:
+            raise ValueError('limit must not be negative.')
+        return self._clone(limit=count)
+
+    def offset(self, count: int) -> 'QuerySet':
+        """
+        Returns the query skipping the first `count` matching rows.
+        """
+        if count < 0:
+            raise ValueError('offset must not be negative.')
+        return self._clone(offset=count)
+
+    def only(self, *columns: str) -> 'QuerySet':
+        """
+        Returns the query selecting only the given columns, in that order.
+        """
+        if not columns:
+            raise ValueError('only() needs at least one column.')
+        return self._clone(columns=columns)
+
+    def values(self, *columns: str) -> 'QuerySet':
+        """
+        Returns the query producing one dictionary per row, of the given columns or of every column.
+        """
+        query = self.only(*columns) if columns else self
+        return query._clone(row_factory=dict_rows)
+
+    def row_factory(self, row_factory: Optional[RowFactory]) -> 'QuerySet':
+        """
+        Returns the query building its rows with `row_factory`; None means the manager's row factory.
+        """
+        return self._clone(row_factory=row_factory)
+
+    def cached(self, enabled: bool = True) -> 'QuerySet':
+        """
+        Returns the query allowed, or with False not allowed, to be served by the manager's query cache.
+        """
+        return self._clone(use_cache=enabled)
+
+    def sql(self) -> Tuple[str, List[Any]]:
+        """
+        Returns the SELECT statement fetch() runs and the parameters bound to it.
+        """
+        # SQLite only accepts OFFSET after a LIMIT; -1 means no limit
+        limited = self._limit is not None or self._offset > 0
+        query = self._manager.statements.select(
+            self._table_name, self._columns, condition=self._condition(), order_by=self._order_by,
+            limit=limited, offset=self._offset > 0
+        )
+        params = list(self._params)
+        if limited:
+            params.append(self._limit if self._limit is not None else -1)
+        if self._offset:
+            params.append(self._offset)
+        return query, params
+
+    def explain(self) -> List[str]:
+        """
+        Returns the query plan of the SELECT statement, such as ['SEARCH todos USING INDEX ...'].
+        """
+        return self._manager.explain(*self.sql())
+
+    def fetch(self) -> list:
+        """
+        Runs the query and returns its rows.
+
+        Raises:
+            DatabaseError: If the query fails.
+        """
+        if self._limit == 0:
+            return []
+        query, params = self.sql()
+        return self._manager._fetch_cached(
+            self._table_name, self._use_cache, query, params,
+            operation_context=f"Querying table '{self._table_name}'", row_factory=self._row_factory
+        )
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.fetch())
+
+    def first(self) -> Optional[Any]:
+        """
+        Returns the first row of the query, fetching only that row, or None if no row matches.
+        """
+        rows = self[:1].fetch()
+        return rows[0] if rows else None
+
+    def __getitem__(self, key: Any) -> Any:
+        """
+        `query[start:stop]` returns the query narrowed to those rows, without running it, and
+        `query[index]` fetches only that row.
+
+        Raises:
+            IndexError: If no row has that index.
+            ValueError: For negative indexes and slice steps, which SQL cannot express.
+        """
+        if isinstance(key, slice):
+            start, stop = key.start or 0, key.stop
+            if key.step is not None:
+                raise ValueError('QuerySet slices do not support a step.')
+            if start < 0 or (stop is not None and stop < 0):
+                raise ValueError('QuerySets do not support negative indexing.')
+            limit = None if self._limit is None else max(self._limit - start, 0)
+            if stop is not None:
+                limit = max(stop - start, 0) if limit is None else min(limit, max(stop - start, 0))
+            return self._clone(limit=limit, offset=self._offset + start)
+
+        if isinstance(key, int) and not isinstance(key, bool):
+            if key < 0:
+                raise ValueError('QuerySets do not support negative indexing.')
+            rows = self[key:key + 1].fetch()
+            if not rows:
+                raise IndexError('QuerySet index out of range.')
+            return rows[0]
+        raise TypeError(f'QuerySet indexes must be integers or slices, not {type(key).__name__}.')
+
+    def __bool__(self) -> bool:
+        raise TypeError('The truth value of a QuerySet is ambiguous; use exists() or count().')
+
+    def __repr__(self) -> str:
+        return f'<QuerySet {self.sql()}>'
+
+    def count(self) -> int:
+        """
+        Counts the rows the query returns with SELECT COUNT(*), without fetching them.
+
+        Raises:
+            DatabaseError: If the query fails.
+        """
+        if self._limit == 0:
+            return 0
+        query = self._manager.statements.count(self._table_name, condition=self._condition())
+        rows = self._manager._fetch_cached(
+            self._table_name, self._use_cache, query, list(self._params),
+            operation_context=f"Counting rows in table '{self._table_name}'", row_factory=tuple_rows
+        )
+        total = max(rows[0][0] - self._offset, 0)
+        return total if self._limit is None else min(total, self._limit)
+
+    def exists(self) -> bool:
+        """
+        Checks whether the query returns any row with SELECT 1 ... LIMIT 1, without fetching rows.
+
+        Raises:
+            DatabaseError: If the query fails.
+        """
+        if self._limit == 0:
+            return False
+        query = self._manager.statements.exists(
+            self._table_name, condition=self._condition(), offset=self._offset > 0
+        )
+        rows = self._manager._fetch_cached(
+            self._table_name, self._use_cache, query, list(self._params) + ([self._offset] if self._offset else []),
+            operation_context=f"Checking row existence in table '{self._table_name}'", row_factory=tuple_rows
+        )
+        return bool(rows)
+
+    def count_by(self, *columns: str) -> Dict[Any, int]:
+        """
+        Counts the matching rows per distinct value of the columns. See DatabaseManager.count_rows_by.
+
+        Raises:
+            DatabaseError: If the query fails.
+            ValueError: If the query is sliced.
+        """
+        self._require_unsliced('count_by')
+        return self._manager.count_rows_by(
+            self._table_name, columns, condition=self._condition(), params=list(self._params),
+            use_cache=self._use_cache
+        )
+
+    def update(self, **column_values: Any) -> int:
+        """
+        Sets the given column values on every matching row with one UPDATE and returns the number of rows updated.
+
+        Raises:
+            DatabaseError: If the update fails.
+            ValueError: If the query is sliced.
+        """
+        self._require_unsliced('update')
+        return self._manager.update_rows(self._table_name, column_values, self._condition(), list(self._params))
+
+    def delete(self) -> int:
+        """
+        Deletes every matching row with one DELETE and returns the number of rows deleted.
+
+        Raises:
+            DatabaseError: If the deletion fails.
+            ValueError: If the query is sliced.
+        """
+        self._require_unsliced('delete')
+        return self._manager.delete_rows_if(self._table_name, self._condition(), list(self._params))
+
+    def _lookup(self, key: str, value: Any) -> Tuple[str, List[Any]]:
+        column, _, lookup = key.partition('__')
+        lookup = lookup or 'eq'
+        if lookup == 'in':
+            values = list(value)
+            return self._manager.statements.in_list(column, len(values)), values
+        if lookup not in LOOKUP_OPERATORS:
+            raise ValueError(f"Unknown lookup '{lookup}' in '{key}'; known lookups are {[*LOOKUP_OPERATORS, 'in']}.")
+        if value is None:
+            if lookup not in NULL_OPERATORS:
+                raise ValueError(f"Cannot compare '{column}' with None using '{lookup}'.")
+            return self._manager.statements.comparison(column, NULL_OPERATORS[lookup]), [None]
+        return self._manager.statements.comparison(column, LOOKUP_OPERATORS[lookup]), [value]
+
+    def _condition(self) -> Optional[str]:
+        return ' AND '.join(self._conditions) or None
+
+    def _require_unsliced(self, operation: str) -> None:
+        if self._limit is not None or self._offset:
+            raise ValueError(f'Cannot {operation} a sliced QuerySet.')
+
+    def _clone(self, **changes: Any) -> 'QuerySet':
+        state = {
+            'columns': self._columns, 'conditions': self._conditions, 'params': self._params,
+            'order_by': self._order_by, 'limit': self._limit, 'offset': self._offset,
+            'row_factory': self._row_factory, 'use_cache': self._use_cache,
+        }
+        state.update(changes)
+        return QuerySet(self._manager, self._table_name, **state)
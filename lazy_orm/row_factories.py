@@ -0,0 +1,77 @@
+import sqlite3
+from collections import namedtuple
+from functools import lru_cache, partial
+from typing import Any, Callable, List, Optional, Tuple, TypeAlias, TypeVar
+
+T = TypeVar('T')
+
+# A row factory is called once per query with the executed cursor and returns the converter applied
+# to every fetched tuple, or None to keep the tuples sqlite3 returns.
+RowConverter: TypeAlias = Callable[[Tuple[Any, ...]], Any]
+RowFactory: TypeAlias = Callable[[sqlite3.Cursor], Optional[RowConverter]]
+
+
+def column_names(cursor: sqlite3.Cursor) -> Tuple[str, ...]:
+    """Returns the result column names of an executed cursor."""
+    return tuple(description[0] for description in cursor.description)
+
+
+def _zip_dict(columns: Tuple[str, ...], row: Tuple[Any, ...]) -> dict:
+    return dict(zip(columns, row))
+
+
+def dict_rows(cursor: sqlite3.Cursor) -> RowConverter:
+    """Builds one dictionary per row. This is the default factory."""
+    return partial(_zip_dict, column_names(cursor))
+
+
+def tuple_rows(cursor: sqlite3.Cursor) -> None:
+    """Keeps the plain tuples returned by sqlite3; the cheapest representation."""
+    return None
+
+
+def sqlite_rows(cursor: sqlite3.Cursor) -> RowConverter:
+    """Builds sqlite3.Row objects, which support access by index and by column name."""
+    return partial(sqlite3.Row, cursor)
+
+
+@lru_cache(maxsize=128)
+def _namedtuple_class(columns: Tuple[str, ...]) -> type:
+    return namedtuple('Row', columns, rename=True)
+
+
+def namedtuple_rows(cursor: sqlite3.Cursor) -> RowConverter:
+    """Builds namedtuples; the class is created once per distinct column set and reused."""
+    return _namedtuple_class(column_names(cursor))._make
+
+
+def model_rows(from_row: Callable[[Tuple[Any, ...]], T]) -> RowFactory:
+    """
+    Returns a factory that hydrates every row tuple directly into a model object.
+
+    Args:
+        from_row (Callable[[Tuple[Any, ...]], T]): Builds a model from a row tuple whose columns are
+            in the order the query selected them.
+    """
+    def factory(cursor: sqlite3.Cursor) -> RowConverter:
+        return from_row
+
+    return factory
+
+
+def tracking_key(row_factory: RowFactory, key_column: str, last_key: List[Any]) -> RowFactory:
+    """
+    Wraps a factory so that the raw value of `key_column` of the last converted row is stored in
+    `last_key[0]`. Used for keyset pagination when the converted rows do not expose the key.
+    """
+    def factory(cursor: sqlite3.Cursor) -> RowConverter:
+        key_index = column_names(cursor).index(key_column)
+        convert = row_factory(cursor)
+
+        def converter(row: Tuple[Any, ...]) -> Any:
+            last_key[0] = row[key_index]
+            return row if convert is None else convert(row)
+
+        return converter
+
+    return factory
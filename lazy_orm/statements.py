@@ -0,0 +1,346 @@
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable, Optional, Sequence, Tuple
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+_COMPARISON_OPERATORS = frozenset({'=', '!=', '<', '<=', '>', '>=', 'IS', 'IS NOT'})
+# A selected column list of just this selects every column, like None
+ALL_COLUMNS = '*'
+
+
+@dataclass(frozen=True)
+class StatementCacheStats:
+    """A snapshot of the SQL text cache counters."""
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+
+class StatementBuilder:
+    """
+    Builds parameterized SQL statements and caches their text.
+
+    Statements are keyed by (table, operation, columns, ...), so repeated operations reuse the
+    exact same SQL string. Together with bound parameters this lets sqlite3's per-connection
+    statement cache (`cached_statements`) reuse the compiled statement instead of re-preparing it.
+    Identifiers are validated once, when a statement is first built; values are always bound.
+    """
+
+    DEFAULT_CACHE_SIZE = 256
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        """
+        Args:
+            cache_size (int): The maximum number of SQL strings kept; the least recently used is evicted.
+        """
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[Hashable, str]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def insert(
+            self,
+            table_name: str,
+            columns: Sequence[str],
+            ignore_conflicts: bool = False,
+            unique_keys: Sequence[Sequence[str]] = ()
+    ) -> str:
+        """
+        Returns `INSERT INTO table (columns) VALUES (?, ...)`.
+
+        With `ignore_conflicts`, rows violating a UNIQUE constraint are skipped (`ON CONFLICT DO NOTHING`).
+        SQLite still draws an AUTOINCREMENT id for every skipped row, so ids get gaps; given the
+        table's `unique_keys` (the column sets of its UNIQUE constraints), the statement first checks
+        them with NOT EXISTS and only inserts, drawing an id, when no row has the same key. The values
+        are still bound once, in `columns` order (as numbered `?N` parameters).
+        """
+        columns = tuple(columns)
+        unique_keys = tuple(tuple(key) for key in unique_keys)
+        if unique_keys and not ignore_conflicts:
+            raise ValueError('unique_keys only apply with ignore_conflicts.')
+        return self._cached(('insert', table_name, columns, ignore_conflicts, unique_keys), lambda: (
+            self._insert_if_new_statement(table_name, columns, unique_keys) if unique_keys else
+            f"INSERT INTO {self._identifier(table_name)} ({self._column_list(columns)}) "
+            f"VALUES ({', '.join(['?'] * len(columns))})"
+            f"{' ON CONFLICT DO NOTHING' if ignore_conflicts else ''}"
+        ))
+
+    def upsert(
+            self,
+            table_name: str,
+            columns: Sequence[str],
+            conflict_columns: Sequence[str],
+            update_columns: Sequence[str],
+            returning: Optional[str] = 'id'
+    ) -> str:
+        """
+        Returns an INSERT that updates `update_columns` of the existing row when `conflict_columns`
+        collide, and returns the `returning` column of the inserted or updated row (nothing if None).
+        """
+        columns, conflict_columns, update_columns = tuple(columns), tuple(conflict_columns), tuple(update_columns)
+        key = ('upsert', table_name, columns, conflict_columns, update_columns, returning)
+        return self._cached(key, lambda: (
+            f"INSERT INTO {self._identifier(table_name)} ({self._column_list(columns)}) "
+            f"VALUES ({', '.join(['?'] * len(columns))}) "
+            f"ON CONFLICT ({self._column_list(conflict_columns)}) "
+            f"DO UPDATE SET {', '.join(f'{self._identifier(column)} = excluded.{column}' for column in update_columns)}"
+            f"{f' RETURNING {self._identifier(returning)}' if returning else ''}"
+        ))
+
+    def select(
+            self,
+            table_name: str,
+            columns: Optional[Sequence[str]] = None,
+            where: Sequence[str] = (),
+            match_any: bool = False,
+            condition: Optional[str] = None,
+            order_by: Sequence[str] = (),
+            limit: bool = False,
+            offset: bool = False
+    ) -> str:
+        """
+        Returns a SELECT statement.
+
+        Args:
+            table_name (str): The table to select from.
+            columns (Optional[Sequence[str]]): The columns to return. None or ['*'] selects all columns.
+            where (Sequence[str]): Columns compared for equality with bound parameters.
+            match_any (bool): Join the `where` comparisons with OR instead of AND.
+            condition (Optional[str]): A raw condition, ANDed with the `where` comparisons.
+            order_by (Sequence[str]): Sort columns; a leading '-' sorts that column descending.
+            limit (bool): Append `LIMIT ?`, bound after the condition parameters.
+            offset (bool): Append `OFFSET ?`, bound after the limit. Requires `limit`.
+        """
+        columns = self._selected_columns(columns)
+        where, order_by = tuple(where), tuple(order_by)
+        key = ('select', table_name, columns, where, match_any, condition, order_by, limit, offset)
+        return self._cached(key, lambda: (
+            f"SELECT {'*' if columns is None else self._column_list(columns)} "
+            f"FROM {self._identifier(table_name)}{self._where_clause(where, match_any, condition)}"
+            f"{self._order_clause(order_by)}{' LIMIT ?' if limit else ''}{' OFFSET ?' if offset else ''}"
+        ))
+
+    def page(
+            self,
+            table_name: str,
+            columns: Optional[Sequence[str]] = None,
+            where: Sequence[str] = (),
+            key_column: str = 'id',
+            after_key: bool = False
+    ) -> str:
+        """
+        Returns a keyset pagination statement ordered by `key_column`.
+
+        The statement takes the `where` values, then the last seen key when `after_key` is True,
+        then the page size.
+        """
+        columns = self._selected_columns(columns)
+        where = tuple(where)
+        return self._cached(('page', table_name, columns, where, key_column, after_key), lambda: (
+            f"SELECT {'*' if columns is None else self._column_list(columns)} "
+            f"FROM {self._identifier(table_name)}"
+            f"{self._where_clause(where, False, f'{self._identifier(key_column)} > ?' if after_key else None)} "
+            f"ORDER BY {self._identifier(key_column)} LIMIT ?"
+        ))
+
+    def search(
+            self,
+            table_name: str,
+            fts_table: str,
+            columns: Optional[Sequence[str]] = None,
+            where: Sequence[str] = (),
+            snippet: bool = False,
+            limit: bool = False
+    ) -> str:
+        """
+        Returns a full-text query of `table_name` through its external-content FTS5 index `fts_table`
+        (content_rowid `id`), best match first.
+
+        The statement takes, in order: with `snippet`, the snippet's opening and closing markers, its
+        ellipsis and its maximum number of tokens (returned as a last `snippet` column); the FTS5 MATCH
+        expression; the `where` values, compared with columns of `table_name`; the limit.
+        """
+        columns = self._selected_columns(columns)
+        where = tuple(where)
+        return self._cached(('search', table_name, fts_table, columns, where, snippet, limit), lambda: (
+            self._search_statement(table_name, fts_table, columns, where, snippet, limit)
+        ))
+
+    def exists(
+            self,
+            table_name: str,
+            where: Sequence[str] = (),
+            match_any: bool = False,
+            condition: Optional[str] = None,
+            offset: bool = False
+    ) -> str:
+        """
+        Returns a statement selecting 1 for the first row matching `where` and `condition`, if any.
+
+        With `offset`, the first `?` matching rows are skipped; the offset is bound last.
+        """
+        where = tuple(where)
+        return self._cached(('exists', table_name, where, match_any, condition, offset), lambda: (
+            f"SELECT 1 FROM {self._identifier(table_name)}{self._where_clause(where, match_any, condition)} "
+            f"LIMIT 1{' OFFSET ?' if offset else ''}"
+        ))
+
+    def count(
+            self,
+            table_name: str,
+            where: Sequence[str] = (),
+            match_any: bool = False,
+            group_by: Sequence[str] = (),
+            condition: Optional[str] = None
+    ) -> str:
+        """
+        Returns a statement counting the rows matching `where` and `condition` as `row_count`.
+
+        With `group_by`, the statement returns the group columns followed by the count of each group.
+        """
+        where, group_by = tuple(where), tuple(group_by)
+        return self._cached(('count', table_name, where, match_any, group_by, condition), lambda: (
+            f"SELECT {self._column_list(group_by) + ', ' if group_by else ''}COUNT(*) AS row_count "
+            f"FROM {self._identifier(table_name)}{self._where_clause(where, match_any, condition)}"
+            f"{' GROUP BY ' + self._column_list(group_by) if group_by else ''}"
+        ))
+
+    def update(
+            self, table_name: str, columns: Sequence[str], where: Sequence[str] = (), condition: Optional[str] = None
+    ) -> str:
+        """
+        Returns `UPDATE table SET column = ?, ...` restricted by `where` columns or a raw condition.
+        """
+        columns = tuple(columns)
+        where = tuple(where)
+        return self._cached(('update', table_name, columns, where, condition), lambda: (
+            f"UPDATE {self._identifier(table_name)} "
+            f"SET {', '.join(f'{self._identifier(column)} = ?' for column in columns)}"
+            f"{self._where_clause(where, False, condition)}"
+        ))
+
+    def delete(self, table_name: str, where: Sequence[str] = (), condition: Optional[str] = None) -> str:
+        """
+        Returns `DELETE FROM table WHERE column = ? AND ...`, restricted by `where` columns or a raw condition.
+        """
+        where = tuple(where)
+        return self._cached(('delete', table_name, where, condition), lambda: (
+            f"DELETE FROM {self._identifier(table_name)}{self._where_clause(where, False, condition)}"
+        ))
+
+    def comparison(self, column: str, operator: str) -> str:
+        """
+        Returns the condition `column <operator> ?`, for one of =, !=, <, <=, >, >=, IS and IS NOT.
+        """
+        if operator not in _COMPARISON_OPERATORS:
+            raise ValueError(f"Unsupported comparison operator: {operator!r}")
+        return self._cached(('comparison', column, operator), lambda: f"{self._identifier(column)} {operator} ?")
+
+    def in_list(self, column: str, count: int) -> str:
+        """
+        Returns the condition `column IN (?, ...)` with `count` placeholders.
+        """
+        return self._cached(('in', column, count), lambda: (
+            f"{self._identifier(column)} IN ({', '.join(['?'] * count)})"
+        ))
+
+    def stats(self) -> StatementCacheStats:
+        """
+        Returns the cache hit/miss counters.
+        """
+        with self._lock:
+            return StatementCacheStats(self._hits, self._misses, len(self._cache), self.cache_size)
+
+    def _cached(self, key: Hashable, build: Callable[[], str]) -> str:
+        with self._lock:
+            query = self._cache.get(key)
+            if query is not None:
+                self._hits += 1
+                self._cache.move_to_end(key)
+                return query
+            self._misses += 1
+
+        query = build()
+        with self._lock:
+            self._cache[key] = query
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return query
+
+    @classmethod
+    def _search_statement(
+            cls,
+            table_name: str,
+            fts_table: str,
+            columns: Optional[Tuple[str, ...]],
+            where: Tuple[str, ...],
+            snippet: bool,
+            limit: bool
+    ) -> str:
+        table, fts = cls._identifier(table_name), cls._identifier(fts_table)
+        selected = [f'{table}.*'] if columns is None else [f'{table}.{cls._identifier(column)}' for column in columns]
+        if snippet:
+            # Column -1 lets FTS5 pick the indexed column that matched best
+            selected.append(f'snippet({fts}, -1, ?, ?, ?, ?) AS snippet')
+        conditions = [f'{fts} MATCH ?'] + [f'{table}.{cls._identifier(column)} = ?' for column in where]
+        return (
+            f"SELECT {', '.join(selected)} FROM {fts} JOIN {table} ON {table}.id = {fts}.rowid "
+            f"WHERE {' AND '.join(conditions)} ORDER BY {fts}.rank{' LIMIT ?' if limit else ''}"
+        )
+
+    @classmethod
+    def _insert_if_new_statement(
+            cls, table_name: str, columns: Tuple[str, ...], unique_keys: Tuple[Tuple[str, ...], ...]
+    ) -> str:
+        parameters = {column: f'?{number}' for number, column in enumerate(columns, start=1)}
+        missing = [column for key in unique_keys for column in key if column not in parameters]
+        if missing:
+            raise ValueError(f"Unique key columns {missing} are not among the inserted columns.")
+        key_matches = ' OR '.join(
+            '(' + ' AND '.join(f'{cls._identifier(column)} = {parameters[column]}' for column in key) + ')'
+            for key in unique_keys
+        )
+        table = cls._identifier(table_name)
+        # ON CONFLICT still guards against a row inserted concurrently or another UNIQUE constraint
+        return (
+            f"INSERT INTO {table} ({cls._column_list(columns)}) SELECT {', '.join(parameters.values())} "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {table} WHERE {key_matches}) ON CONFLICT DO NOTHING"
+        )
+
+    @classmethod
+    def _where_clause(cls, where: Tuple[str, ...], match_any: bool, condition: Optional[str] = None) -> str:
+        clauses = []
+        if where:
+            comparisons = (' OR ' if match_any else ' AND ').join(f'{cls._identifier(column)} = ?' for column in where)
+            clauses.append(f'({comparisons})' if match_any and condition else comparisons)
+        if condition:
+            clauses.append(condition)
+        return ' WHERE ' + ' AND '.join(clauses) if clauses else ''
+
+    @classmethod
+    def _order_clause(cls, order_by: Tuple[str, ...]) -> str:
+        if not order_by:
+            return ''
+        return ' ORDER BY ' + ', '.join(
+            f'{cls._identifier(column[1:])} DESC' if column.startswith('-') else cls._identifier(column)
+            for column in order_by
+        )
+
+    @staticmethod
+    def _selected_columns(columns: Optional[Sequence[str]]) -> Optional[Tuple[str, ...]]:
+        columns = tuple(columns) if columns is not None else None
+        return None if columns == (ALL_COLUMNS,) else columns
+
+    @classmethod
+    def _column_list(cls, columns: Tuple[str, ...]) -> str:
+        return ', '.join(cls._identifier(column) for column in columns)
+
+    @staticmethod
+    def _identifier(name: str) -> str:
+        if not _IDENTIFIER.match(name):
+            raise ValueError(f"Invalid SQL identifier: {name!r}")
+        return name
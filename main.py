@@ -1,13 +1,14 @@
 import asyncio
 import logging
 
-from lazy_orm.db_manager import DatabaseManager
+from lazy_orm.async_db_manager import AsyncDatabaseManager
+from lazy_orm.cache import QueryCache
 from model.todo_model import Todo, Category
-from service.todo_srv import add_todo, get_all_todos
-from service.user_srv import get_all_users, add_user
+from service.app_db import APP_DB_NAME, APP_SETTINGS, APP_TABLES, import_legacy_databases
+from service.todo_srv import add_todos, get_all_todos
+from service.user_srv import get_all_users, add_users
 from utils.logging_simp_inv import setup_logging
 
-USERS_DB_NAME = 'users'
 SAMPLE_USERS = [
     {'username': 'Arina5', 'email': 'Arisha5@librem.com', 'age': 20},
     {'username': 'Alex', 'email': 'something@gmail.com', 'age': 40},
@@ -17,12 +18,10 @@ SAMPLE_USERS = [
 
 async def _add_sample_users(db_manager):
     """Add sample users to the database."""
-    for user in SAMPLE_USERS:
-        result = add_user(db_manager, user['username'], user['email'], user['age'])
-        logging.info(result) if result else logging.error('Error adding new User!')
+    result = await db_manager.run(add_users, SAMPLE_USERS)
+    logging.info(result) if result else logging.error('Error adding new Users!')
 
 
-TODOS_DB_NAME = 'todos'
 SAMPLE_TODOS = [
     Todo(task="Buy groceries", category=Category.SHOPPING),
     Todo(task="Read 'Clean Code'", category=Category.READING),
@@ -34,23 +33,24 @@ SAMPLE_TODOS = [
 
 async def _add_sample_todos(db_manager):
     """Add sample tasks to the database."""
-    for task in SAMPLE_TODOS:
-        result = add_todo(db_manager, task)
-        logging.info(result) if result else logging.error('Error adding new Task!')
+    result = await db_manager.run(add_todos, SAMPLE_TODOS)
+    logging.info(result) if result else logging.error('Error adding new Tasks!')
 
 
 async def main():
-    db_manager = DatabaseManager(USERS_DB_NAME)
-    await _add_sample_users(db_manager)
-    users = await get_all_users(db_manager)
-    for user in users:
-        print(user)
-
-    todo_manager = DatabaseManager(TODOS_DB_NAME)
-    await _add_sample_todos(todo_manager)
-    tasks = await get_all_todos(todo_manager)
-    for task in tasks:
-        print(task)
+    async with AsyncDatabaseManager(
+            APP_DB_NAME, tables=APP_TABLES, settings=APP_SETTINGS, query_cache=QueryCache()
+    ) as db_manager:
+        await db_manager.run(import_legacy_databases)
+        await _add_sample_users(db_manager)
+        users = await get_all_users(db_manager)
+        for user in users:
+            print(user)
+
+        await _add_sample_todos(db_manager)
+        tasks = await get_all_todos(db_manager)
+        for task in tasks:
+            print(task)
 
 
 if __name__ == '__main__':
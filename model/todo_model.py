@@ -1,4 +1,5 @@
 import datetime
+import time
 
 from enum import Flag, Enum
 
@@ -17,21 +18,85 @@ class Category(Enum):
     SHOPPING = 6
 
 
+# Precomputed lookup tables, cheaper than Enum[...] / Enum(...) lookups and .name / .value properties
+CATEGORY_BY_NAME = dict(Category.__members__)
+CATEGORY_NAMES = {category: name for name, category in CATEGORY_BY_NAME.items()}
+# Older databases stored the status as text (converted by migration todos/007); imported records may still
+# use text or names, so accept them as well as integers
+STATUS_BY_DB_VALUE = {
+    **{status.value: status for status in Status.__members__.values()},
+    **{str(status.value): status for status in Status.__members__.values()},
+    **Status.__members__,
+}
+STATUS_VALUES = {status: status.value for status in Status.__members__.values()}
+
+LEGACY_DATE_FORMAT = '%Y-%m-%d %H:%M'
+
+
+def to_epoch(value):
+    """
+    Converts a stored date to epoch seconds. Integers pass through; text written by older versions is parsed.
+    """
+    if value is None or isinstance(value, int):
+        return value
+    if value.isdigit():
+        return int(value)
+    return int(datetime.datetime.strptime(value, LEGACY_DATE_FORMAT).timestamp())
+
+
+def format_timestamp(epoch, date_format: str = LEGACY_DATE_FORMAT):
+    """
+    Formats epoch seconds as local time for display, or returns None for a missing date.
+    """
+    if epoch is None:
+        return None
+    return datetime.datetime.fromtimestamp(epoch).strftime(date_format)
+
+
 class Todo:
+    __slots__ = ('task', 'category', 'date_added', 'date_completed', 'status', '_id', 'user_id')
+
+    # Column order used by from_row / to_row
+    ROW_COLUMNS = ('id', 'task', 'category', 'date_added', 'date_completed', 'status', 'user_id')
+
     def __init__(self,
                  task,
                  category: Category = Category.BACKLOG,
                  date_added=None,
                  date_completed=None,
                  status: Status = Status.UNDONE,
-                 _id=None):
+                 _id=None,
+                 user_id=None):
         self.task = task
         self.category = category
-        self.date_added = date_added or datetime.datetime.now().strftime('%Y-%m-%d %H:%M')
+        self.date_added = date_added or int(time.time())
         self.date_completed = date_completed
         self.status = status
         self._id = _id
+        self.user_id = user_id
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Builds a Todo from a row tuple in ROW_COLUMNS order.
+        """
+        todo_id, task, category, date_added, date_completed, status, user_id = row
+        todo = cls.__new__(cls)
+        todo.task = task
+        todo.category = CATEGORY_BY_NAME[category]
+        todo.date_added = date_added if type(date_added) is int else to_epoch(date_added)
+        todo.date_completed = date_completed if type(date_completed) is int else to_epoch(date_completed)
+        todo.status = STATUS_BY_DB_VALUE[status]
+        todo._id = todo_id
+        todo.user_id = user_id
+        return todo
+
+    def to_row(self):
+        """
+        Returns the Todo as a row tuple in ROW_COLUMNS order.
+        """
+        return (self._id, self.task, CATEGORY_NAMES[self.category], self.date_added, self.date_completed,
+                STATUS_VALUES[self.status], self.user_id)
 
     def __repr__(self):
         return f'{self.task}, {self.category}, {self.date_added}, {self.date_completed}, {self.status}, {self._id}'
-
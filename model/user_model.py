@@ -1,11 +1,30 @@
 from dataclasses import dataclass
+from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     username: str
     email: str
     phone: str
     age: int
+    id: Optional[int] = None
+
+    # Column order used by from_row / to_row
+    ROW_COLUMNS = ('id', 'email', 'username', 'phone', 'age')
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Builds a User from a row tuple in ROW_COLUMNS order.
+        """
+        user_id, email, username, phone, age = row
+        return cls(username, email, phone, age, user_id)
+
+    def to_row(self):
+        """
+        Returns the User as a row tuple in ROW_COLUMNS order.
+        """
+        return self.id, self.email, self.username, self.phone, self.age
 
 #TODO: Add UnregisteredUser model
@@ -0,0 +1,136 @@
+import logging
+import os
+import sqlite3
+from typing import Dict, Optional
+
+from lazy_orm.db_manager import DatabaseError, DatabaseManager
+from lazy_orm.migrations import SCHEMA_VERSIONS_TABLE, get_schema_version
+from lazy_orm.pool import ConnectionSettings
+
+# The application keeps every table in one database file; users come first because todos reference them.
+# Table names are spelled out rather than imported so that opening the database does not import the
+# services (and their dependencies, such as email validation).
+APP_DB_NAME = 'app'
+APP_TABLES = ('users', 'todos')
+APP_SETTINGS = ConnectionSettings(foreign_keys=True)
+
+# Before the shared database, every table was kept in a file of its own named after it (data/users,
+# data/todos). The import of such a file is recorded as this component's version in schema_versions.
+LEGACY_IMPORT_COMPONENT = '{table}:legacy_import'
+LEGACY_SCHEMA = 'legacy'
+
+
+def open_app_database(db_dir: str = DatabaseManager.DEFAULT_DATABASE_DIRECTORY, **manager_options) -> DatabaseManager:
+    """
+    Opens the application database, creating and migrating its tables if needed.
+
+    The rows of the legacy per-table database files are imported on first open, see import_legacy_databases.
+
+    Args:
+        db_dir (str): The directory holding the database file.
+        **manager_options: Passed on to DatabaseManager (pool_size, query_cache, ...).
+    """
+    manager_options.setdefault('settings', APP_SETTINGS)
+    db_manager = DatabaseManager(APP_DB_NAME, db_dir, tables=APP_TABLES, **manager_options)
+    import_legacy_databases(db_manager)
+    return db_manager
+
+
+def import_legacy_databases(db_manager: DatabaseManager) -> Dict[str, int]:
+    """
+    Copies the rows of the legacy per-table database files next to the application database into it, once.
+
+    Each legacy file is first migrated to the current schema of its table, then attached and copied
+    with its ids, which users refer to (`/done <id>`). A table is only imported while it is still
+    empty in the application database; otherwise the legacy file is left alone and a warning names
+    it. Either way the decision is recorded, so it is made once, and the write lock is held while
+    it is made, so processes opening the database together import each file once.
+
+    Args:
+        db_manager (DatabaseManager): The application database.
+
+    Returns:
+        Dict[str, int]: The number of rows imported per table, for the tables imported now.
+
+    Raises:
+        DatabaseError: If a legacy file cannot be migrated or copied; nothing of its table is imported then.
+    """
+    imported = {}
+    if db_manager.in_memory:
+        return imported
+
+    db_dir = os.path.dirname(db_manager.database_path)
+    for table_name in APP_TABLES:
+        legacy_path = os.path.join(db_dir, table_name)
+        component = LEGACY_IMPORT_COMPONENT.format(table=table_name)
+        if not os.path.isfile(legacy_path):
+            continue
+        with db_manager.connection() as connection:
+            if get_schema_version(connection, component):
+                continue
+
+        # Brings old files (TEXT dates, no chat_id, ...) to the columns of the application table
+        DatabaseManager(table_name, db_dir).close()
+        rows = _import_legacy_table(db_manager, table_name, legacy_path, component)
+        if rows is not None:
+            imported[table_name] = rows
+    return imported
+
+
+def _copy_autoincrement_sequence(connection: sqlite3.Connection, table_name: str) -> None:
+    # Keeps AUTOINCREMENT from handing out the ids of rows deleted before the import
+    if not connection.execute(
+            f"SELECT 1 FROM {LEGACY_SCHEMA}.sqlite_master WHERE name = 'sqlite_sequence'"
+    ).fetchone():
+        return
+    connection.execute(
+        f'UPDATE main.sqlite_sequence SET seq = max(seq, coalesce('
+        f'(SELECT seq FROM {LEGACY_SCHEMA}.sqlite_sequence WHERE name = ?), 0)) WHERE name = ?',
+        [table_name, table_name]
+    )
+
+
+def _import_legacy_table(
+        db_manager: DatabaseManager, table_name: str, legacy_path: str, component: str
+) -> Optional[int]:
+    with db_manager.connection() as connection:
+        if connection.in_transaction:
+            connection.commit()
+        connection.execute(f'ATTACH DATABASE ? AS {LEGACY_SCHEMA}', [legacy_path])
+        try:
+            connection.execute('BEGIN IMMEDIATE')
+            if get_schema_version(connection, component):
+                # Another process imported it while this one waited for the lock
+                connection.rollback()
+                return None
+
+            rows = None
+            if connection.execute(f'SELECT 1 FROM main.{table_name} LIMIT 1').fetchone():
+                logging.warning(
+                    f"Legacy database {legacy_path} was not imported: table '{table_name}' of the "
+                    f"application database already has rows."
+                )
+            else:
+                legacy_columns = {row[1] for row in connection.execute(
+                    f"SELECT * FROM pragma_table_info('{table_name}', '{LEGACY_SCHEMA}')"
+                )}
+                columns = ', '.join(
+                    row[1] for row in connection.execute(f"SELECT * FROM pragma_table_info('{table_name}', 'main')")
+                    if row[1] in legacy_columns
+                )
+                rows = connection.execute(
+                    f'INSERT INTO main.{table_name} ({columns}) SELECT {columns} FROM {LEGACY_SCHEMA}.{table_name}'
+                ).rowcount
+                _copy_autoincrement_sequence(connection, table_name)
+                logging.info(f"Imported {rows} rows of table '{table_name}' from legacy database {legacy_path}.")
+            connection.execute(
+                f'INSERT INTO main.{SCHEMA_VERSIONS_TABLE} (component, version) VALUES (?, 1)', [component]
+            )
+            connection.commit()
+            return rows
+        except sqlite3.Error as error:
+            if connection.in_transaction:
+                connection.rollback()
+            raise DatabaseError(f"Importing legacy database {legacy_path} failed: {error}")
+        finally:
+            connection.execute(f'DETACH DATABASE {LEGACY_SCHEMA}')
@@ -1,24 +1,68 @@
-from typing import List, Optional
+from typing import TYPE_CHECKING, AsyncIterator, Iterable, Iterator, List, Optional, Sequence, Tuple
 from lazy_orm.db_manager import DatabaseManager, DatabaseError
+from lazy_orm.query import QuerySet
+from lazy_orm.row_factories import RowFactory, model_rows, tracking_key
+from service.transactions import db_write
 import logging
+import re
+import time
 
-from model.todo_model import Todo
+from model.todo_model import (
+    CATEGORY_BY_NAME, CATEGORY_NAMES, STATUS_BY_DB_VALUE, STATUS_VALUES, Category, Status, Todo, to_epoch
+)
+
+if TYPE_CHECKING:
+    # Imported for annotations only: asyncio is slow to import and the CLI never needs it
+    from lazy_orm.async_db_manager import AsyncDatabaseManager
 
 # Setup logger
 logger = logging.getLogger(__name__)
 
 # Constants
 TODOS_TABLE = 'todos'
-TODO_COLUMNS = ['id', 'task', 'category', 'date_added', 'date_completed', 'status']
+TODO_COLUMNS = list(Todo.ROW_COLUMNS)
+# Todos belong to a chat of the Telegram bot; the CLI and scripts use chat 0
+NO_CHAT = 0
+# The UNIQUE (task, category, chat_id) index. Additions check it before inserting, so a duplicate
+# does not use up an id: ids are what users type in `/done <id>`.
+TODO_UNIQUE_KEYS = (('task', 'category', 'chat_id'),)
+
+# Row factory hydrating rows selected with TODO_COLUMNS straight into Todo objects
+TODO_MODEL_ROWS = model_rows(Todo.from_row)
+
+# Revision per chat, bumped by triggers on every change of its todos, see
+# SQL/migrations/todos/008_chat_revisions.sql
+TODO_CHAT_REVISIONS_TABLE = 'todo_chat_revisions'
+
+# Full-text index of the task text, see SQL/migrations/todos/006_full_text_search.sql
+TODOS_FTS_TABLE = 'todos_fts'
+SEARCH_LIMIT = 20
+# Placed around the matched words of a search snippet
+SNIPPET_MARKERS = ('«', '»')
+# The words of a search text, split like the unicode61 tokenizer of the index splits the tasks
+_SEARCH_WORD = re.compile(r'[^\W_]+')
+
+
+def _todo_match(row: tuple) -> Tuple[Todo, str]:
+    return Todo.from_row(row[:-1]), row[-1]
+
+
+# Row factory for search_todos: a (Todo, snippet) pair per row
+TODO_MATCH_ROWS = model_rows(_todo_match)
+
+
+def _todos(db_manager: DatabaseManager) -> QuerySet:
+    """
+    Returns a lazy query over all todos, selecting the columns of the Todo model.
+    """
+    return db_manager.table(TODOS_TABLE).only(*TODO_COLUMNS)
 
 
 def is_todo_exists(db_manager: DatabaseManager, task: str, category: str) -> bool:
     """
     Checks if the task exists in the database based on task name.
     """
-    condition = f'task="{task}" AND category="{category}"'
-    todos = db_manager.fetch_rows_if(TODOS_TABLE, condition)
-    return len(todos) > 0
+    return db_manager.table(TODOS_TABLE).where(task=task, category=category).exists()
 
 
 def log_todo_addition(task: str, category: str) -> None:
@@ -28,50 +72,195 @@ def log_todo_addition(task: str, category: str) -> None:
     logger.info(f'New Task {task} in category: {category} added.')
 
 
+@db_write('adding todo')
 def _add_todo(
         db_manager: DatabaseManager, column_values: dict, log_message: str
 ) -> Optional[str]:
     """
     Helper function to add a task to the database and log the action.
+
+    The insert and the existence check are one statement, relying on the UNIQUE (task, category) index.
     """
-    try:
-        db_manager.insert_row(TODOS_TABLE, column_values)
-        logger.info(log_message)
-        return 'Todo added successfully.'
-    except DatabaseError as e:
-        logger.exception(f"Error adding todo: {e}")
-        return None
+    if db_manager.insert_or_ignore(TODOS_TABLE, column_values, TODO_UNIQUE_KEYS) is None:
+        return 'Todo already exists!'
+    logger.info(log_message)
+    return 'Todo added successfully.'
 
 
-def add_todo(db_manager: DatabaseManager, todo: Todo) -> Optional[str]:
+def _todo_column_values(todo: Todo) -> dict:
     """
-    Adds a new task to the database if they do not already exist.
+    Maps a Todo model onto the columns of the todos table.
     """
+    return dict(zip(TODO_COLUMNS[1:], todo.to_row()[1:]))
 
-    if is_todo_exists(db_manager, todo.task, todo.category.name):
-        return 'User already exists!'
 
-    column_values = {
-        'task': todo.task,
-        'category': todo.category.name,
-        'date_added': todo.date_added,
-        'date_completed': todo.date_completed,
-        'status': todo.status.value
-    }
+def add_todo(db_manager: DatabaseManager, todo: Todo, chat_id: int = NO_CHAT) -> Optional[str]:
+    """
+    Adds a new task to the chat's todos if it does not already exist there.
+
+    Call it inside `with db_manager.transaction():` to commit many additions at once.
+    """
+    column_values = _todo_column_values(todo)
+    column_values['chat_id'] = chat_id
     return _add_todo(db_manager, column_values, f'New Todo {todo.task} added.')
 
 
-async def add_welcome_todo(db_manager: DatabaseManager) -> None:
+def insert_todos(db_manager: DatabaseManager, todos: Iterable[Todo], chat_id: int = NO_CHAT) -> List[Optional[int]]:
+    """
+    Adds many tasks to the chat's todos in a single transaction and reports the outcome of each one.
+
+    Returns:
+        List[Optional[int]]: For each todo, in order, the id of the created row, or None if it already existed.
+
+    Raises:
+        DatabaseError: If the batch fails; no todo is added in that case.
+    """
+    rows = ({**_todo_column_values(todo), 'chat_id': chat_id} for todo in todos)
+    return db_manager.insert_rows(TODOS_TABLE, rows, ignore_conflicts=True, unique_keys=TODO_UNIQUE_KEYS)
+
+
+@db_write('adding todos')
+def add_todos(db_manager: DatabaseManager, todos: Iterable[Todo], chat_id: int = NO_CHAT) -> Optional[str]:
+    """
+    Adds many tasks to the chat's todos in a single transaction, skipping the ones that already exist.
+    """
+    outcomes = insert_todos(db_manager, todos, chat_id)
+    created = sum(row_id is not None for row_id in outcomes)
+    logger.info(f'{created} new Todos added.')
+    return f'{created} todos added successfully, {len(outcomes) - created} already existed.'
+
+
+def todo_from_record(record: dict) -> Todo:
+    """
+    Builds a Todo from an imported record, such as a CSV row or a JSON object.
+
+    Only 'task' is required. 'category' and 'status' are names ('SHOPPING', 'DONE'; status also
+    accepts 0/1), dates are epoch seconds or 'YYYY-MM-DD HH:MM' text, and empty values mean the default.
+
+    Raises:
+        ValueError: If the task is missing or a value is not recognized.
+    """
+    task = (record.get('task') or '').strip()
+    if not task:
+        raise ValueError(f"Record has no task: {record}")
+
+    category_name = str(record.get('category') or 'BACKLOG').strip().upper()
+    status_value = record.get('status') or 0
+    if category_name not in CATEGORY_BY_NAME:
+        raise ValueError(f"Unknown category '{category_name}' for task '{task}'.")
+    if isinstance(status_value, str):
+        status_value = status_value.strip().upper()
+    if status_value not in STATUS_BY_DB_VALUE:
+        raise ValueError(f"Unknown status '{status_value}' for task '{task}'.")
+
+    date_added, date_completed = record.get('date_added'), record.get('date_completed')
+    return Todo(
+        task, CATEGORY_BY_NAME[category_name],
+        date_added=to_epoch(str(date_added)) if date_added else None,
+        date_completed=to_epoch(str(date_completed)) if date_completed else None,
+        status=STATUS_BY_DB_VALUE[status_value]
+    )
+
+
+@db_write('renaming task')
+def rename_todo(db_manager: DatabaseManager, todo_id: int, task: str) -> Optional[bool]:
+    """
+    Renames a task.
+
+    Returns:
+        Optional[bool]: Whether a task with that id existed; None if the update failed.
+    """
+    return db_manager.table(TODOS_TABLE).where(id=todo_id).update(task=task) > 0
+
+
+@db_write('completing task')
+def complete_todo(db_manager: DatabaseManager, todo_id: int, chat_id: Optional[int] = None) -> Optional[bool]:
+    """
+    Marks an undone task as done, now. Given a chat_id, only a task of that chat is completed.
+
+    Returns:
+        Optional[bool]: Whether an undone task with that id existed; None if the update failed.
+    """
+    todos = db_manager.table(TODOS_TABLE).where(id=todo_id, status=STATUS_VALUES[Status.UNDONE])
+    if chat_id is not None:
+        todos = todos.where(chat_id=chat_id)
+    return todos.update(status=STATUS_VALUES[Status.DONE], date_completed=int(time.time())) > 0
+
+
+@db_write('completing tasks')
+def complete_todos(
+        db_manager: DatabaseManager, todo_ids: Iterable[int], chat_id: Optional[int] = None
+) -> Optional[int]:
+    """
+    Marks the undone tasks among the given ids as done, now, in one transaction. Given a chat_id,
+    only tasks of that chat are completed.
+
+    Returns:
+        Optional[int]: The number of tasks completed; None if the update failed, in which case none is.
+    """
+    column_values = {'status': STATUS_VALUES[Status.DONE], 'date_completed': int(time.time())}
+    condition, params = 'status = ?', [STATUS_VALUES[Status.UNDONE]]
+    if chat_id is not None:
+        condition, params = condition + ' AND chat_id = ?', params + [chat_id]
+    return db_manager.update_rows_by_ids(TODOS_TABLE, todo_ids, column_values, condition, params)
+
+
+@db_write('purging done tasks')
+def purge_done_todos(
+        db_manager: DatabaseManager, older_than: Optional[int] = None, chat_id: Optional[int] = None
+) -> Optional[int]:
+    """
+    Deletes the done tasks with one statement, found through the (status, ...) indexes.
+
+    Args:
+        db_manager (DatabaseManager): The database to clean up.
+        older_than (Optional[int]): Only tasks completed before this epoch second. None deletes every done task.
+        chat_id (Optional[int]): Only tasks of this chat. None cleans up every chat.
+
+    Returns:
+        Optional[int]: The number of tasks deleted; None if the deletion failed.
+    """
+    todos = db_manager.table(TODOS_TABLE).where(status=STATUS_VALUES[Status.DONE])
+    if older_than is not None:
+        todos = todos.where(date_completed__lt=older_than)
+    if chat_id is not None:
+        todos = todos.where(chat_id=chat_id)
+    deleted = todos.delete()
+    logger.info(f'{deleted} done tasks purged.')
+    return deleted
+
+
+@db_write('deleting tasks')
+def delete_todos(db_manager: DatabaseManager, todo_ids: Iterable[int]) -> Optional[int]:
+    """
+    Deletes the tasks with the given ids in one transaction.
+
+    Returns:
+        Optional[int]: The number of tasks deleted; None if the deletion failed, in which case none is.
+    """
+    return db_manager.delete_rows(TODOS_TABLE, todo_ids)
+
+
+@db_write('deleting task')
+def delete_todo(db_manager: DatabaseManager, todo_id: int) -> Optional[bool]:
+    """
+    Deletes a task.
+
+    Returns:
+        Optional[bool]: Whether a task with that id existed; None if the deletion failed.
+    """
+    return db_manager.table(TODOS_TABLE).where(id=todo_id).delete() > 0
+
+
+async def add_welcome_todo(db_manager: 'AsyncDatabaseManager') -> None:
     """
     Adds a welcome Task to the database.
     """
-    column_values = {
-        'task': 'Welcome to your Todo Manager!',
-    }
-    _add_todo(db_manager, column_values, 'Welcome task added successfully.')
+    column_values = _todo_column_values(Todo('Welcome to your Todo Manager!'))
+    await db_manager.run(_add_todo, column_values, 'Welcome task added successfully.')
 
 
-async def handle_empty_todos(db_manager: DatabaseManager) -> None:
+async def handle_empty_todos(db_manager: 'AsyncDatabaseManager') -> None:
     """
     Adds a Welcome task if the database has no tasks.
     """
@@ -79,18 +268,315 @@ async def handle_empty_todos(db_manager: DatabaseManager) -> None:
     logger.info('No tasks found. Welcome task has been added.')
 
 
-async def get_all_todos(db_manager: DatabaseManager) -> List[dict]:
+def _fetch_all_todos(db_manager: DatabaseManager, row_factory: Optional[RowFactory], use_cache: bool) -> list:
+    return _todos(db_manager).row_factory(row_factory).cached(use_cache).fetch()
+
+
+async def get_all_todos(
+        db_manager: 'AsyncDatabaseManager', row_factory: Optional[RowFactory] = None, use_cache: bool = True
+) -> list:
     """
     Fetches all todos from the database or adds a Welcome task  if there are no tasks.
+
+    Rows are dictionaries unless another row factory, such as TODO_MODEL_ROWS, is given.
+    The result comes from the manager's query cache, if one is configured, unless `use_cache` is False;
+    cached lists are shared and must not be modified.
     """
     try:
-        todos = await db_manager.fetch_all_rows(TODOS_TABLE, TODO_COLUMNS)
+        todos = await db_manager.run(_fetch_all_todos, row_factory, use_cache)
 
         if not todos:
             await handle_empty_todos(db_manager)
-            todos = await db_manager.fetch_all_rows(TODOS_TABLE, TODO_COLUMNS)
+            todos = await db_manager.run(_fetch_all_todos, row_factory, use_cache)
         return todos
 
     except DatabaseError as e:
         logger.exception(f"Error fetching tasks: {e}")
         return []
+
+
+def get_user_todos(db_manager: DatabaseManager, user_id: int, row_factory: Optional[RowFactory] = None) -> list:
+    """
+    Fetches the todos of one user in id order, with one lookup on the (user_id, id) index.
+    """
+    try:
+        return _todos(db_manager).where(user_id=user_id).order_by('id').row_factory(row_factory).fetch()
+    except DatabaseError as e:
+        logger.exception(f"Error fetching tasks of user {user_id}: {e}")
+        return []
+
+
+def _todo_matches(status: Optional[Status], category: Optional[Category], chat_id: Optional[int]) -> dict:
+    """
+    Translates the status, category and chat filters into the column values todos must equal.
+    """
+    where = {}
+    if chat_id is not None:
+        where['chat_id'] = chat_id
+    if status is not None:
+        where['status'] = STATUS_VALUES[status]
+    if category is not None:
+        where['category'] = CATEGORY_NAMES[category]
+    return where
+
+
+def _filtered_todos(
+        db_manager: DatabaseManager,
+        status: Optional[Status],
+        category: Optional[Category],
+        added_between: Optional[Tuple[Optional[int], Optional[int]]],
+        chat_id: Optional[int] = None
+) -> QuerySet:
+    """
+    Returns a lazy query over the todos matching the listing filters.
+    """
+    todos = _todos(db_manager).where(**_todo_matches(status, category, chat_id))
+    start, end = added_between or (None, None)
+    if start is not None:
+        todos = todos.where(date_added__gte=start)
+    if end is not None:
+        todos = todos.where(date_added__lt=end)
+    return todos
+
+
+def query_todos(
+        db_manager: DatabaseManager,
+        status: Optional[Status] = None,
+        category: Optional[Category] = None,
+        added_between: Optional[Tuple[Optional[int], Optional[int]]] = None,
+        order_by: Sequence[str] = ('-date_added',),
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        row_factory: Optional[RowFactory] = None,
+        chat_id: Optional[int] = None
+) -> list:
+    """
+    Fetches the todos matching the given filters, filtered, sorted and paginated by SQLite.
+
+    Filtering on status or category and sorting by date_added is served by the (status, date_added)
+    and (category, date_added) indexes. Rows with equal sort keys are ordered by id, so offset
+    pages are stable.
+
+    Args:
+        db_manager (DatabaseManager): The database to query.
+        status (Optional[Status]): Only todos with this status.
+        category (Optional[Category]): Only todos in this category.
+        added_between (Optional[Tuple[Optional[int], Optional[int]]]): Epoch seconds (start, end); start
+            is inclusive, end exclusive, and either may be None for an open range.
+        order_by (Sequence[str]): Todo columns to sort by; a leading '-' sorts descending.
+        limit (Optional[int]): The maximum number of todos returned.
+        offset (Optional[int]): The number of matching todos skipped.
+        row_factory (Optional[RowFactory]): The row representation, such as TODO_MODEL_ROWS.
+        chat_id (Optional[int]): Only todos of this chat. None lists the todos of every chat.
+
+    Returns:
+        list: The matching todos, or an empty list if the query fails.
+
+    Raises:
+        ValueError: If `order_by` names a column todos do not have.
+    """
+    unknown_columns = [column for column in order_by if column.lstrip('-') not in TODO_COLUMNS]
+    if unknown_columns:
+        raise ValueError(f"Cannot order todos by {unknown_columns}; known columns are {TODO_COLUMNS}.")
+
+    order_by = tuple(order_by)
+    if not any(column.lstrip('-') == 'id' for column in order_by):
+        order_by += ('-id' if order_by and order_by[0].startswith('-') else 'id',)
+
+    todos = _filtered_todos(db_manager, status, category, added_between, chat_id).order_by(*order_by)
+    try:
+        return todos.limit(limit).offset(offset or 0).row_factory(row_factory).fetch()
+    except DatabaseError as e:
+        logger.exception(f"Error querying tasks: {e}")
+        return []
+
+
+def iter_todo_pages(
+        db_manager: DatabaseManager,
+        status: Optional[Status] = None,
+        category: Optional[Category] = None,
+        added_between: Optional[Tuple[Optional[int], Optional[int]]] = None,
+        page_size: int = DatabaseManager.DEFAULT_PAGE_SIZE,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        row_factory: Optional[RowFactory] = None,
+        chat_id: Optional[int] = None
+) -> Iterator[list]:
+    """
+    Streams the todos matching the given filters in id order, one page at a time.
+
+    Every page is a keyset query continuing after the last id of the previous page, served by the
+    primary key or the (status, id) and (category, id) indexes, so the first page costs the same
+    however large the table is and only one page is held in memory. A failing query is logged and
+    ends the iteration. Pages bypass the query cache.
+
+    Args:
+        db_manager (DatabaseManager): The database to query.
+        status (Optional[Status]): Only todos with this status.
+        category (Optional[Category]): Only todos in this category.
+        added_between (Optional[Tuple[Optional[int], Optional[int]]]): Epoch seconds (start, end); start
+            is inclusive, end exclusive, and either may be None for an open range.
+        page_size (int): The number of todos per page.
+        limit (Optional[int]): The maximum number of todos over all pages. None streams every match.
+        after_id (Optional[int]): Start after the todo with this id. None starts from the first todo.
+        row_factory (Optional[RowFactory]): The row representation, such as TODO_MODEL_ROWS.
+        chat_id (Optional[int]): Only todos of this chat. None lists the todos of every chat.
+
+    Yields:
+        list: The todos of one page; never empty.
+    """
+    last_id = [after_id]
+    page_factory = tracking_key(row_factory or db_manager.row_factory, 'id', last_id)
+    todos = _filtered_todos(db_manager, status, category, added_between, chat_id).order_by('id')
+    todos = todos.row_factory(page_factory).cached(False)
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = page_size if remaining is None else min(page_size, remaining)
+        page_todos = todos if last_id[0] is None else todos.where(id__gt=last_id[0])
+        try:
+            page = page_todos.limit(size).fetch()
+        except DatabaseError as e:
+            logger.exception(f"Error listing tasks: {e}")
+            return
+        if page:
+            yield page
+        if len(page) < size:
+            return
+        if remaining is not None:
+            remaining -= len(page)
+
+
+def _match_expression(text: str) -> Optional[str]:
+    """
+    Turns search text into an FTS5 query matching tasks that contain every word, the last one as a prefix.
+
+    Words are quoted, so FTS5 operators and punctuation typed by a user are searched for as plain text.
+    """
+    words = _SEARCH_WORD.findall(text)
+    if not words:
+        return None
+    return ' '.join(f'"{word}"' for word in words) + '*'
+
+
+def search_todos(
+        db_manager: DatabaseManager,
+        query: str,
+        category: Optional[Category] = None,
+        status: Optional[Status] = None,
+        limit: Optional[int] = SEARCH_LIMIT,
+        row_factory: Optional[RowFactory] = None,
+        chat_id: Optional[int] = None,
+        markers: Tuple[str, str] = SNIPPET_MARKERS
+) -> list:
+    """
+    Finds the todos whose task contains every word of `query` (the last word may be the start of
+    one), best match first, through the FTS5 index of the tasks.
+
+    Matching ignores case and accents. Every row has the todo columns followed by `snippet`, the
+    task text around the matches with every matched word between `markers`.
+
+    Args:
+        db_manager (DatabaseManager): The database to search.
+        query (str): The words to look for.
+        category (Optional[Category]): Only todos in this category.
+        status (Optional[Status]): Only todos with this status.
+        limit (Optional[int]): The maximum number of todos returned; None returns every match.
+        row_factory (Optional[RowFactory]): The row representation, such as TODO_MATCH_ROWS.
+        chat_id (Optional[int]): Only todos of this chat. None searches the todos of every chat.
+        markers (Tuple[str, str]): Text placed before and after every matched word in the snippet.
+
+    Returns:
+        list: The matching todos, or an empty list if `query` has no words or the search fails.
+    """
+    match = _match_expression(query)
+    if match is None:
+        return []
+
+    where = _todo_matches(status, category, chat_id)
+    try:
+        return db_manager.search_rows(
+            TODOS_TABLE, TODOS_FTS_TABLE, match, TODO_COLUMNS, where, limit, markers, row_factory=row_factory
+        )
+    except DatabaseError as e:
+        logger.exception(f"Error searching tasks: {e}")
+        return []
+
+
+def chat_revision(db_manager: DatabaseManager, chat_id: int) -> Optional[int]:
+    """
+    Returns a number that changes whenever a todo of the chat is added, changed or deleted, by any
+    process sharing the database. It is one primary key lookup.
+
+    Returns:
+        Optional[int]: The chat's revision, 0 before its first change; None if the query fails.
+    """
+    try:
+        revisions = db_manager.table(TODO_CHAT_REVISIONS_TABLE).where(chat_id=chat_id).values('revision')
+        row = revisions.cached(False).first()
+    except DatabaseError as e:
+        logger.exception(f"Error reading the revision of chat {chat_id}: {e}")
+        return None
+    return row['revision'] if row else 0
+
+
+def todo_stats(db_manager: DatabaseManager, chat_id: Optional[int] = None) -> Optional[dict]:
+    """
+    Counts todos per status and per category with two GROUP BY queries over indexes, over every
+    chat or only the given one.
+
+    Returns:
+        Optional[dict]: 'total', 'by_status' (count per Status), 'by_category' (count per Category,
+            zero for empty ones) and 'completion_rate' (the done fraction, 0.0 without todos);
+            None if a query fails.
+    """
+    todos = db_manager.table(TODOS_TABLE).where(**_todo_matches(None, None, chat_id))
+    try:
+        status_counts = todos.count_by('status')
+        category_counts = todos.count_by('category')
+    except DatabaseError as e:
+        logger.exception(f"Error counting tasks: {e}")
+        return None
+
+    by_status = dict.fromkeys(STATUS_VALUES, 0)
+    for value, count in status_counts.items():
+        by_status[STATUS_BY_DB_VALUE[value]] += count
+    by_category = dict.fromkeys(CATEGORY_NAMES, 0)
+    for name, count in category_counts.items():
+        by_category[CATEGORY_BY_NAME[name]] += count
+
+    total = sum(by_status.values())
+    return {
+        'total': total,
+        'by_status': by_status,
+        'by_category': by_category,
+        'completion_rate': by_status[Status.DONE] / total if total else 0.0,
+    }
+
+
+def get_todos_page(
+        db_manager: DatabaseManager,
+        after_id: Optional[int] = None,
+        limit: int = DatabaseManager.DEFAULT_PAGE_SIZE,
+        row_factory: Optional[RowFactory] = None
+) -> list:
+    """
+    Fetches the next page of todos after the todo with id `after_id`, for listing views.
+    """
+    try:
+        todos = _todos(db_manager) if after_id is None else _todos(db_manager).where(id__gt=after_id)
+        return todos.order_by('id').limit(limit).row_factory(row_factory).fetch()
+    except DatabaseError as e:
+        logger.exception(f"Error fetching tasks page: {e}")
+        return []
+
+
+async def iter_todos(
+        db_manager: 'AsyncDatabaseManager',
+        batch_size: int = DatabaseManager.DEFAULT_FETCH_BATCH_SIZE,
+        row_factory: Optional[RowFactory] = None
+) -> AsyncIterator:
+    """
+    Streams every todo in id order without loading the whole table into memory.
+    """
+    async for todo in db_manager.iter_rows(TODOS_TABLE, TODO_COLUMNS, batch_size=batch_size, row_factory=row_factory):
+        yield todo
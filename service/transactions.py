@@ -0,0 +1,33 @@
+import functools
+import logging
+from typing import Callable, Optional
+
+from lazy_orm.db_manager import DatabaseError
+
+
+def db_write(action: str) -> Callable[[Callable], Callable]:
+    """
+    Decorates a service function that writes through its first argument, a DatabaseManager.
+
+    A DatabaseError is logged to the logger of the function's module. Inside db_manager.transaction()
+    it is then re-raised, so the whole unit of work rolls back; otherwise the function returns None.
+
+    Args:
+        action (str): What the function does, for the log message, e.g. 'adding todos'.
+    """
+    def decorator(function: Callable) -> Callable:
+        logger = logging.getLogger(function.__module__)
+
+        @functools.wraps(function)
+        def wrapper(db_manager, *args, **kwargs) -> Optional[object]:
+            try:
+                return function(db_manager, *args, **kwargs)
+            except DatabaseError as e:
+                logger.exception(f"Error {action}: {e}")
+                if db_manager.in_transaction:
+                    raise
+                return None
+
+        return wrapper
+
+    return decorator
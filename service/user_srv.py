@@ -1,14 +1,26 @@
-from typing import List, Optional
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
 from lazy_orm.db_manager import DatabaseManager, DatabaseError
-from utils.email import validate_and_normalize_email
+from lazy_orm.row_factories import RowFactory, model_rows
+from model.user_model import User
+from service.transactions import db_write
+from utils.email import EmailCheck, EmailNotValidError, validate_and_normalize_email, validate_many
 import logging
 
+if TYPE_CHECKING:
+    # Imported for annotations only: asyncio is slow to import and the CLI never needs it
+    from lazy_orm.async_db_manager import AsyncDatabaseManager
+
 # Setup logger
 logger = logging.getLogger(__name__)
 
 # Constants
 USERS_TABLE = 'users'
-USER_COLUMNS = ['id', 'email', 'username', 'phone', 'age']
+USER_COLUMNS = list(User.ROW_COLUMNS)
+# The UNIQUE username and email columns, checked before inserting so that a duplicate uses up no id
+USER_UNIQUE_KEYS = (('username',), ('email',))
+
+# Row factory hydrating rows selected with USER_COLUMNS straight into User objects
+USER_MODEL_ROWS = model_rows(User.from_row)
 
 
 # TODO: Improve Errors handling . add_user: status?
@@ -18,9 +30,7 @@ def is_user_exists(db_manager: DatabaseManager, username: str, email: str) -> bo
     """
     Checks if the user exists in the database based on username or email.
     """
-    condition = f'username="{username}" OR email="{email}"'
-    users = db_manager.fetch_rows_if(USERS_TABLE, condition)
-    return len(users) > 0
+    return db_manager.table(USERS_TABLE).where_any(username=username, email=email).exists()
 
 
 def log_user_addition(username: str, email: str) -> None:
@@ -30,30 +40,28 @@ def log_user_addition(username: str, email: str) -> None:
     logger.info(f'New User {username} with email: {email} added.')
 
 
+@db_write('adding user')
 def _add_user(
         db_manager: DatabaseManager, column_values: dict, log_message: str
 ) -> Optional[str]:
     """
     Helper function to add a user to the database and log the action.
+
+    The insert and the existence check are one statement, relying on the UNIQUE username and email columns.
     """
-    try:
-        db_manager.insert_row(USERS_TABLE, column_values)
-        logger.info(log_message)
-        return 'User added successfully.'
-    except DatabaseError as e:
-        logger.exception(f"Error adding user: {e}")
-        return None
+    if db_manager.insert_or_ignore(USERS_TABLE, column_values, USER_UNIQUE_KEYS) is None:
+        return 'User already exists!'
+    logger.info(log_message)
+    return 'User added successfully.'
 
 
 def add_user(db_manager: DatabaseManager, username: str, email: str, age: int) -> Optional[str]:
     """
     Adds a new user to the database if they do not already exist.
+
+    Call it inside `with db_manager.transaction():` to commit many additions at once.
     """
     normalized_email = validate_and_normalize_email(email)
-
-    if is_user_exists(db_manager, username, normalized_email):
-        return 'User already exists!'
-
     column_values = {
         'username': username,
         'email': normalized_email,
@@ -62,7 +70,68 @@ def add_user(db_manager: DatabaseManager, username: str, email: str, age: int) -
     return _add_user(db_manager, column_values, f'New User {username} added.')
 
 
-async def add_admin_user(db_manager: DatabaseManager) -> None:
+def _validated_user_rows(users: Iterable[dict]) -> Tuple[List[dict], List[EmailCheck]]:
+    """
+    Validates the emails of many users at once, in parallel when deliverability is checked.
+
+    Returns:
+        Tuple[List[dict], List[EmailCheck]]: The rows of the users with a valid email, normalized and
+            in order, and the checks of the invalid emails.
+    """
+    users = list(users)
+    checks = validate_many(user['email'] for user in users)
+    rows = [
+        {'username': user['username'], 'email': check.normalized, 'age': user['age']}
+        for user, check in zip(users, checks) if check.valid
+    ]
+    return rows, [check for check in checks if not check.valid]
+
+
+def _invalid_emails_message(invalid: List[EmailCheck]) -> str:
+    return f'{len(invalid)} invalid emails: ' + '; '.join(f'{check.email}: {check.error}' for check in invalid[:10])
+
+
+def insert_users(db_manager: DatabaseManager, users: Iterable[dict]) -> List[Optional[int]]:
+    """
+    Adds many users to the database in a single transaction and reports the outcome of each one.
+
+    Each user is a dictionary with 'username', 'email' and 'age' keys.
+
+    All emails are validated first, in parallel when deliverability is checked.
+
+    Returns:
+        List[Optional[int]]: For each user, in order, the id of the created row, or None if a user
+            with the same username or email already existed.
+
+    Raises:
+        EmailNotValidError: If any email is not valid, naming every invalid one; no user is added in that case.
+        DatabaseError: If the batch fails; no user is added in that case.
+    """
+    rows, invalid = _validated_user_rows(users)
+    if invalid:
+        raise EmailNotValidError(_invalid_emails_message(invalid))
+    return db_manager.insert_rows(USERS_TABLE, rows, ignore_conflicts=True, unique_keys=USER_UNIQUE_KEYS)
+
+
+@db_write('adding users')
+def add_users(db_manager: DatabaseManager, users: Iterable[dict]) -> Optional[str]:
+    """
+    Adds many users to the database in a single transaction, skipping the ones that already exist.
+
+    Each user is a dictionary with 'username', 'email' and 'age' keys. Users with an invalid email
+    are skipped and counted in the summary; the others are still added.
+    """
+    rows, invalid = _validated_user_rows(users)
+    if invalid:
+        logger.warning(f'Skipping users with {_invalid_emails_message(invalid)}')
+    outcomes = db_manager.insert_rows(USERS_TABLE, rows, ignore_conflicts=True, unique_keys=USER_UNIQUE_KEYS)
+    created = sum(row_id is not None for row_id in outcomes)
+    logger.info(f'{created} new Users added.')
+    summary = f'{created} users added successfully, {len(outcomes) - created} already existed'
+    return f'{summary}, {len(invalid)} had an invalid email.' if invalid else f'{summary}.'
+
+
+async def add_admin_user(db_manager: 'AsyncDatabaseManager') -> None:
     """
     Adds a predefined admin user to the database.
     """
@@ -72,10 +141,10 @@ async def add_admin_user(db_manager: DatabaseManager) -> None:
         'age': 100,
         'phone': '+79219984444',
     }
-    _add_user(db_manager, column_values, 'Admin user added successfully.')
+    await db_manager.run(_add_user, column_values, 'Admin user added successfully.')
 
 
-async def handle_empty_users(db_manager: DatabaseManager) -> None:
+async def handle_empty_users(db_manager: 'AsyncDatabaseManager') -> None:
     """
     Adds an admin user if the database has no users.
     """
@@ -83,16 +152,26 @@ async def handle_empty_users(db_manager: DatabaseManager) -> None:
     logger.info('No users found. Admin User has been added.')
 
 
-async def get_all_users(db_manager: DatabaseManager) -> List[dict]:
+def _fetch_all_users(db_manager: DatabaseManager, row_factory: Optional[RowFactory], use_cache: bool) -> list:
+    return db_manager.table(USERS_TABLE).only(*USER_COLUMNS).row_factory(row_factory).cached(use_cache).fetch()
+
+
+async def get_all_users(
+        db_manager: 'AsyncDatabaseManager', row_factory: Optional[RowFactory] = None, use_cache: bool = True
+) -> list:
     """
     Fetches all users from the database or adds an admin user if there are no users.
+
+    Rows are dictionaries unless another row factory, such as USER_MODEL_ROWS, is given.
+    The result comes from the manager's query cache, if one is configured, unless `use_cache` is False;
+    cached lists are shared and must not be modified.
     """
     try:
-        users = await db_manager.fetch_all_rows(USERS_TABLE, USER_COLUMNS)
+        users = await db_manager.run(_fetch_all_users, row_factory, use_cache)
 
         if not users:
             await handle_empty_users(db_manager)
-            users = await db_manager.fetch_all_rows(USERS_TABLE, USER_COLUMNS)
+            users = await db_manager.run(_fetch_all_users, row_factory, use_cache)
         return users
     except DatabaseError as e:
         logger.exception(f"Error fetching users: {e}")
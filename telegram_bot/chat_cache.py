@@ -0,0 +1,84 @@
+from typing import Awaitable, Callable, Hashable, Optional, TypeVar
+
+from lazy_orm.cache import QueryCache, QueryCacheStats
+
+T = TypeVar('T')
+
+
+class ChatCache:
+    """
+    Recently loaded todo lists and stats, kept per chat.
+
+    All chats share one bounded LRU, so memory stays flat however many chats talk to the bot, while
+    a write in one chat only drops that chat's entries. Loads racing with a write in the same chat
+    are not stored (see QueryCache.put). Cached values are shared between handlers and must not be
+    mutated.
+
+    invalidate() only reaches the cache of the process that wrote. When several bot processes share
+    the database, pass get_or_load a `revision` that changes with every write of the chat in any
+    process (todo_srv.chat_revision): a value is then only served while the revision it was loaded
+    at is still current.
+    """
+
+    DEFAULT_MAX_ENTRIES = 1024
+    DEFAULT_TTL_SECONDS = 300.0
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS) -> None:
+        """
+        Args:
+            max_entries (int): The maximum number of cached values over all chats.
+            ttl_seconds (float): How long a value is served before it is loaded again.
+        """
+        self._cache = QueryCache(max_entries, ttl_seconds)
+
+    @staticmethod
+    def _group(chat_id: int) -> str:
+        return f'chat:{chat_id}'
+
+    async def get_or_load(
+            self,
+            chat_id: int,
+            key: Hashable,
+            load: Callable[[], Awaitable[T]],
+            revision: Optional[Callable[[], Awaitable[Optional[Hashable]]]] = None
+    ) -> T:
+        """
+        Returns the chat's cached value for `key`, awaiting `load()` on a miss. None results, which the
+        services return on database errors, are not cached.
+
+        Args:
+            chat_id (int): The chat the value belongs to.
+            key (Hashable): What the value is, within the chat.
+            load (Callable[[], Awaitable[T]]): Loads the value.
+            revision (Optional[Callable[[], Awaitable[Optional[Hashable]]]]): Returns the chat's current
+                revision; a cached value loaded at another revision is loaded again. A None revision
+                (it could not be read) never matches. Without it only invalidate() drops values.
+        """
+        group = self._group(chat_id)
+        current_revision = await revision() if revision is not None else None
+        hit, entry = self._cache.get(group, key)
+        if hit:
+            loaded_revision, value = entry
+            if revision is None or (current_revision is not None and loaded_revision == current_revision):
+                return value
+            # Another process wrote to the chat: everything cached for it is stale
+            self._cache.invalidate(group)
+
+        # The revision was read before loading, so a write racing with the load makes the entry stale
+        generation = self._cache.generation(group)
+        value = await load()
+        if value is not None:
+            self._cache.put(group, key, (current_revision, value), generation)
+        return value
+
+    def invalidate(self, chat_id: int) -> None:
+        """
+        Drops everything cached for a chat; call it after every write to the chat's todos.
+        """
+        self._cache.invalidate(self._group(chat_id))
+
+    def stats(self) -> QueryCacheStats:
+        """
+        Returns the hit, miss and eviction counters over all chats.
+        """
+        return self._cache.stats()
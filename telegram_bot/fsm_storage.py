@@ -0,0 +1,233 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, KeyBuilder, StateType, StorageKey
+
+from lazy_orm.async_db_manager import AsyncDatabaseManager
+from lazy_orm.db_manager import DatabaseError, DatabaseManager
+from lazy_orm.row_factories import tuple_rows
+
+FSM_STATES_TABLE = 'fsm_states'
+
+logger = logging.getLogger(__name__)
+
+# One storage key: (state, data as JSON text or None, expires_at in epoch seconds); None when the key is empty
+_Record = Tuple[Optional[str], Optional[str], int]
+
+
+def _read_record(manager: DatabaseManager, key: str) -> Optional[_Record]:
+    rows = manager.fetch_rows(
+        FSM_STATES_TABLE, ['state', 'data', 'expires_at'], {'key': key}, row_factory=tuple_rows, use_cache=False
+    )
+    return rows[0] if rows else None
+
+
+def _write_batch(manager: DatabaseManager, batch: Dict[str, Optional[_Record]]) -> None:
+    """
+    Writes a batch of pending keys in one transaction; empty keys are deleted.
+    """
+    rows = [
+        {'key': key, 'state': record[0], 'data': record[1], 'expires_at': record[2]}
+        for key, record in batch.items() if record is not None
+    ]
+    with manager.transaction():
+        if rows:
+            manager.upsert_rows(FSM_STATES_TABLE, rows, ['key'])
+        for key, record in batch.items():
+            if record is None:
+                manager.delete_rows_if(FSM_STATES_TABLE, 'key = ?', [key])
+
+
+class SQLiteStorage(BaseStorage):
+    """
+    aiogram FSM storage keeping states and data in the `fsm_states` table of a lazy_orm database.
+
+    Reads are served from an in-memory LRU write-through cache. Writes update the cache at once and
+    are written to SQLite by a background task in batches, one transaction every `flush_interval`
+    seconds, so handlers never wait for a commit. Every key expires `state_ttl_seconds` after its
+    last write: expired keys read as empty and a periodic sweep deletes them. Data must be JSON
+    serializable.
+
+    Several bot processes can share the database. A process trusts what it cached for
+    `cache_seconds`, so a key written by another process is seen at most that long (plus the
+    writer's flush interval) later. `close()`, called by the dispatcher on shutdown, writes what is
+    still pending.
+    """
+
+    DEFAULT_STATE_TTL_SECONDS = 30 * 24 * 3600
+    DEFAULT_CACHE_SECONDS = 5.0
+    DEFAULT_CACHE_SIZE = 10_000
+    DEFAULT_FLUSH_INTERVAL = 0.05
+    DEFAULT_SWEEP_INTERVAL = 600.0
+    # Pause before writing a batch again after it failed
+    RETRY_DELAY = 1.0
+
+    def __init__(
+            self,
+            db: AsyncDatabaseManager,
+            key_builder: Optional[KeyBuilder] = None,
+            state_ttl_seconds: float = DEFAULT_STATE_TTL_SECONDS,
+            cache_seconds: Optional[float] = DEFAULT_CACHE_SECONDS,
+            cache_size: int = DEFAULT_CACHE_SIZE,
+            flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+            sweep_interval: float = DEFAULT_SWEEP_INTERVAL,
+            clock: Callable[[], float] = time.time
+    ) -> None:
+        """
+        Args:
+            db (AsyncDatabaseManager): A manager of a database holding the fsm_states table, e.g. opened
+                with `tables=(..., FSM_STATES_TABLE)`.
+            key_builder (Optional[KeyBuilder]): Turns storage keys into table keys. Defaults to DefaultKeyBuilder.
+            state_ttl_seconds (float): How long a key lives after its last write.
+            cache_seconds (Optional[float]): How long a cached key is trusted before it is read again.
+                None trusts it until evicted, which is only right for a single bot process.
+            cache_size (int): The maximum number of cached keys; the least recently used is evicted.
+            flush_interval (float): How long writes are gathered into one batch.
+            sweep_interval (float): Seconds between two deletions of expired keys.
+            clock (Callable[[], float]): The epoch time source, replaceable in tests.
+        """
+        self._db = db
+        self.key_builder = key_builder or DefaultKeyBuilder()
+        self.state_ttl_seconds = state_ttl_seconds
+        self.cache_seconds = cache_seconds
+        self.cache_size = cache_size
+        self.flush_interval = flush_interval
+        self.sweep_interval = sweep_interval
+        self._clock = clock
+
+        # key -> (cached_at, record); pending and in-flight writes shadow it until they are committed
+        self._cache: 'OrderedDict[str, Tuple[float, Optional[_Record]]]' = OrderedDict()
+        self._pending: Dict[str, Optional[_Record]] = {}
+        self._flushing: Dict[str, Optional[_Record]] = {}
+        self._writes = 0
+        self._dirty = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._tasks: List[asyncio.Task] = []
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        storage_key = self.key_builder.build(key)
+        record = await self._record(storage_key)
+        self._write(storage_key, state.state if isinstance(state, State) else state, record[1] if record else None)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        record = await self._record(self.key_builder.build(key))
+        return record[0] if record else None
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        if not isinstance(data, dict):
+            raise ValueError(f"Data must be a dict, not {type(data).__name__}")
+        storage_key = self.key_builder.build(key)
+        record = await self._record(storage_key)
+        serialized = json.dumps(data, separators=(',', ':')) if data else None
+        self._write(storage_key, record[0] if record else None, serialized)
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        record = await self._record(self.key_builder.build(key))
+        return json.loads(record[1]) if record and record[1] else {}
+
+    async def flush(self) -> bool:
+        """
+        Writes the pending changes now.
+
+        Returns:
+            bool: False if the write failed; the changes stay pending and are retried.
+        """
+        async with self._flush_lock:
+            self._dirty.clear()
+            if not self._pending:
+                return True
+            self._flushing, self._pending = self._pending, {}
+            try:
+                await self._db.run(_write_batch, self._flushing)
+            except DatabaseError:
+                logger.exception(f"Writing {len(self._flushing)} FSM keys failed; they will be retried.")
+                self._pending = {**self._flushing, **self._pending}
+                self._dirty.set()
+                return False
+            finally:
+                self._flushing = {}
+        return True
+
+    async def sweep(self) -> int:
+        """
+        Deletes the expired keys from the cache and the table.
+
+        Returns:
+            int: The number of deleted rows.
+        """
+        now = self._clock()
+        for key in [key for key, (_, record) in self._cache.items() if record is not None and record[2] <= now]:
+            del self._cache[key]
+        try:
+            return await self._db.delete_rows_if(FSM_STATES_TABLE, 'expires_at <= ?', [int(now)])
+        except DatabaseError:
+            logger.exception("Deleting expired FSM keys failed.")
+            return 0
+
+    async def close(self) -> None:
+        # Taking the lock first lets a running flush finish before its task is cancelled
+        async with self._flush_lock:
+            for task in self._tasks:
+                task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        await self.flush()
+
+    async def _record(self, key: str) -> Optional[_Record]:
+        """
+        Returns the live record of a key from the pending writes, the cache or the table, in that order.
+        """
+        self._start_tasks()
+        now = self._clock()
+        if key in self._pending:
+            record = self._pending[key]
+        elif key in self._flushing:
+            record = self._flushing[key]
+        else:
+            cached = self._cache.get(key)
+            if cached is not None and (self.cache_seconds is None or now - cached[0] < self.cache_seconds):
+                self._cache.move_to_end(key)
+                record = cached[1]
+            else:
+                writes = self._writes
+                record = await self._db.run(_read_record, key)
+                # A write that happened while reading is newer than what was read
+                if writes == self._writes:
+                    self._remember(key, record, now)
+        return record if record is not None and record[2] > now else None
+
+    def _write(self, key: str, state: Optional[str], data: Optional[str]) -> None:
+        now = self._clock()
+        record = (state, data, int(now + self.state_ttl_seconds)) if state is not None or data else None
+        self._writes += 1
+        self._pending[key] = record
+        self._remember(key, record, now)
+        self._dirty.set()
+
+    def _remember(self, key: str, record: Optional[_Record], now: float) -> None:
+        self._cache[key] = (now, record)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _start_tasks(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._flush_loop()), asyncio.create_task(self._sweep_loop())]
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await self._dirty.wait()
+            # Let the writes of the next few milliseconds join the batch
+            await asyncio.sleep(self.flush_interval)
+            if not await self.flush():
+                await asyncio.sleep(self.RETRY_DELAY)
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            await self.sweep()
@@ -1,34 +1,163 @@
-from aiogram import F, Router
-from aiogram.filters import CommandStart, Command
-from aiogram.types  import Message
+from typing import Awaitable, Callable, Iterable, Optional, Tuple
+
+from aiogram import Router
+from aiogram.filters import CommandStart, Command, CommandObject
+from aiogram.types import CallbackQuery, Message
 
 import telegram_bot.keyboards as kb
+from lazy_orm.async_db_manager import AsyncDatabaseManager
+from model.todo_model import CATEGORY_BY_NAME, Status, Todo
+from service import todo_srv
+from telegram_bot.chat_cache import ChatCache
 
+# The handlers receive `db` (AsyncDatabaseManager) and `chat_cache` (ChatCache) from the dispatcher,
+# see run.py. Every query runs on the manager's worker threads, so no handler blocks the event loop.
 router = Router()
 
+# /list shows at most this many todos, newest first
+LIST_LIMIT = 20
+
+HELP_TEXT = (
+    'Commands:\n'
+    '/add [category] task - add a task, e.g. /add shopping Buy milk\n'
+    '/list - your undone tasks; /list all - with the done ones\n'
+    '/done id - mark a task as done\n'
+    '/search words - find tasks, e.g. /search milk\n'
+    '/stats - how much is done\n\n'
+    f'Categories: {", ".join(name.lower() for name in CATEGORY_BY_NAME)}'
+)
+
+
+def _parse_todo(args: Optional[str]) -> Optional[Todo]:
+    """
+    Reads '[category] task' command arguments; without a known category the task goes to the backlog.
+    """
+    words = (args or '').split(maxsplit=1)
+    if not words:
+        return None
+    category = CATEGORY_BY_NAME.get(words[0].upper())
+    if category is not None and len(words) == 2:
+        return Todo(words[1].strip(), category)
+    return Todo(args.strip())
+
+
+def _todo_line(todo: Todo, text: str) -> str:
+    return f"{'✓' if todo.status is Status.DONE else '•'} {todo._id}. {text} [{todo.category.name.lower()}]"
+
+
+def _format_todos(todos: Iterable[Todo]) -> str:
+    return '\n'.join(_todo_line(todo, todo.task) for todo in todos) or 'Nothing to do. Add a task with /add.'
+
+
+def _chat_revision(db: AsyncDatabaseManager, chat_id: int) -> Callable[[], Awaitable[Optional[int]]]:
+    # Other bot processes may write to the chat too; cached values are checked against its revision
+    return lambda: db.run(todo_srv.chat_revision, chat_id)
+
+
+async def _chat_todos(db: AsyncDatabaseManager, chat_cache: ChatCache, chat_id: int, show_done: bool) -> list:
+    return await chat_cache.get_or_load(chat_id, ('list', show_done), lambda: db.run(
+        todo_srv.query_todos, status=None if show_done else Status.UNDONE, order_by=['-id'], limit=LIST_LIMIT,
+        row_factory=todo_srv.TODO_MODEL_ROWS, chat_id=chat_id
+    ), _chat_revision(db, chat_id))
+
+
+async def _complete(db: AsyncDatabaseManager, chat_cache: ChatCache, chat_id: int, todo_id: int) -> Tuple[bool, str]:
+    """
+    Marks a todo of the chat as done and returns whether it was, with the reply for the user.
+    """
+    completed = await db.run(todo_srv.complete_todo, todo_id, chat_id)
+    if completed is None:
+        return False, 'Sorry, the task could not be updated. Please try again.'
+    if not completed:
+        return False, f'There is no undone task {todo_id} in this chat.'
+    chat_cache.invalidate(chat_id)
+    return True, f'Task {todo_id} done!'
+
+
 @router.message(CommandStart())
 async def cmd_start(message: Message):
-    await message.reply(f'Hi! \n'
-                        f'Your name is {message.from_user.first_name}',
-                        reply_markup=await kb.inline_cars())
+    await message.reply(f'Hi, {message.from_user.first_name}! I keep the todo list of this chat.\n\n{HELP_TEXT}',
+                        reply_markup=kb.main_keyboard)
+
 
 @router.message(Command('help'))
 async def get_help(message: Message):
-    await message.answer('This is the /help command')
+    await message.answer(HELP_TEXT)
+
+
+@router.message(Command('add'))
+async def cmd_add(message: Message, command: CommandObject, db: AsyncDatabaseManager, chat_cache: ChatCache):
+    todo = _parse_todo(command.args)
+    if todo is None:
+        await message.answer('What should I add? For example: /add shopping Buy milk')
+        return
+
+    result = await db.run(todo_srv.add_todo, todo, message.chat.id)
+    if result is None:
+        await message.answer('Sorry, the task could not be saved. Please try again.')
+        return
+    chat_cache.invalidate(message.chat.id)
+    await message.answer(f'{todo.task} [{todo.category.name.lower()}]: {result}')
+
+
+@router.message(Command('list'))
+async def cmd_list(message: Message, command: CommandObject, db: AsyncDatabaseManager, chat_cache: ChatCache):
+    show_done = (command.args or '').strip().lower() == 'all'
+    todos = await _chat_todos(db, chat_cache, message.chat.id, show_done)
+    await message.answer(_format_todos(todos), reply_markup=kb.done_keyboard(todos))
+
+
+@router.message(Command('done'))
+async def cmd_done(message: Message, command: CommandObject, db: AsyncDatabaseManager, chat_cache: ChatCache):
+    todo_id = (command.args or '').strip().lstrip('#')
+    if not todo_id.isdigit():
+        await message.answer('Which task? For example: /done 3 (/list shows the numbers)')
+        return
+
+    _, reply = await _complete(db, chat_cache, message.chat.id, int(todo_id))
+    await message.answer(reply)
+
+
+@router.callback_query(kb.DoneCallback.filter())
+async def done_button(callback: CallbackQuery, callback_data: kb.DoneCallback, db: AsyncDatabaseManager,
+                      chat_cache: ChatCache):
+    chat_id = callback.message.chat.id
+    completed, reply = await _complete(db, chat_cache, chat_id, callback_data.todo_id)
+    await callback.answer(reply)
+    # The button's message may no longer be accessible to the bot, and then it cannot be edited
+    if completed and isinstance(callback.message, Message):
+        todos = await _chat_todos(db, chat_cache, chat_id, show_done=False)
+        await callback.message.edit_text(_format_todos(todos), reply_markup=kb.done_keyboard(todos))
+
+
+@router.message(Command('search'))
+async def cmd_search(message: Message, command: CommandObject, db: AsyncDatabaseManager):
+    text = (command.args or '').strip()
+    if not text:
+        await message.answer('What should I look for? For example: /search milk')
+        return
 
-@router.message(F.text == 'How is life?')
-async def how_are_you(message: Message):
-    await message.answer("Life's good")
+    # Searches are rarely repeated, so they are not cached
+    matches = await db.run(
+        todo_srv.search_todos, text, limit=LIST_LIMIT, row_factory=todo_srv.TODO_MATCH_ROWS, chat_id=message.chat.id
+    )
+    if not matches:
+        await message.answer(f'No task matches "{text}".')
+        return
+    await message.answer('\n'.join(_todo_line(todo, snippet) for todo, snippet in matches),
+                         reply_markup=kb.done_keyboard(todo for todo, _ in matches))
 
-@router.message(F.photo)
-async def get_photo(message: Message):
-    await message.answer(f'Photo ID: {message.photo[-1].file_id}')
 
-@router.message(Command('get_photo'))
-async def get_photo(message: Message):
-    await message.answer_photo(photo='AgACAgIAAxkBAAMVZ3bhJBxMix23W_qGsiTVqyrpD4QAAj_oMRuJL7hLGcsvGbE8C3QBAAMCAAN5AAM2BA',
-                               caption='This is the awesome car!')
+@router.message(Command('stats'))
+async def cmd_stats(message: Message, db: AsyncDatabaseManager, chat_cache: ChatCache):
+    chat_id = message.chat.id
+    stats = await chat_cache.get_or_load(
+        chat_id, 'stats', lambda: db.run(todo_srv.todo_stats, chat_id), _chat_revision(db, chat_id)
+    )
+    if stats is None:
+        await message.answer('Sorry, the statistics are not available right now.')
+        return
 
-@router.message()
-async def echo(message:Message):
-    await message.answer(message.text)
+    lines = [f"{stats['by_status'][Status.DONE]} of {stats['total']} tasks done ({stats['completion_rate']:.0%})"]
+    lines += [f'{category.name.lower()}: {count}' for category, count in stats['by_category'].items() if count]
+    await message.answer('\n'.join(lines))
@@ -1,26 +1,32 @@
+from typing import Iterable
+
+from aiogram.filters.callback_data import CallbackData
 from aiogram.types import (KeyboardButton,
                            ReplyKeyboardMarkup,
-                           InlineKeyboardButton,
                            InlineKeyboardMarkup)
-from aiogram.utils.keyboard import ReplyKeyboardBuilder, InlineKeyboardBuilder
+from aiogram.utils.keyboard import InlineKeyboardBuilder
+
+from model.todo_model import Status, Todo
 
 main_keyboard = ReplyKeyboardMarkup(keyboard=[
-    [KeyboardButton(text='Catalogue')],
-    [KeyboardButton(text='Bin'), KeyboardButton(text='Contacts')]
+    [KeyboardButton(text='/list'), KeyboardButton(text='/stats')],
+    [KeyboardButton(text='/help')]
 ],
     resize_keyboard=True,
-    input_field_placeholder='Choose an option in the menu...'
+    input_field_placeholder='/add shopping Buy milk'
 )
 
-settings= InlineKeyboardMarkup(inline_keyboard=[
-    [InlineKeyboardButton(text='YouTube', url='https://youtube.com')]
-])
 
+class DoneCallback(CallbackData, prefix='done'):
+    todo_id: int
 
-cars = ['Tesla', 'Mercedes', 'BMW']
 
-async def inline_cars():
+def done_keyboard(todos: Iterable[Todo]) -> InlineKeyboardMarkup:
+    """
+    One button per undone todo, marking it as done.
+    """
     keyboard = InlineKeyboardBuilder()
-    for car in cars:
-        keyboard.add(InlineKeyboardButton(text=car, url='https://youtube.com'))
-    return keyboard.adjust(2).as_markup() # number of buttons per line
\ No newline at end of file
+    for todo in todos:
+        if todo.status is Status.UNDONE:
+            keyboard.button(text=f'✓ {todo._id}', callback_data=DoneCallback(todo_id=todo._id))
+    return keyboard.adjust(4).as_markup()  # number of buttons per line
@@ -1,21 +1,43 @@
 import asyncio
+import logging
 from os import getenv
 
 from aiogram import Bot, Dispatcher
-from aiogram.fsm.storage.memory import MemoryStorage
 
+from lazy_orm.async_db_manager import AsyncDatabaseManager
+from lazy_orm.db_manager import DatabaseManager
+from service.app_db import APP_DB_NAME, APP_SETTINGS, APP_TABLES, import_legacy_databases
+from telegram_bot.chat_cache import ChatCache
+from telegram_bot.fsm_storage import FSM_STATES_TABLE, SQLiteStorage
 from telegram_bot.handlers import router
+from telegram_bot.throttling import ThrottlingMiddleware
 from dotenv import load_dotenv
 from utils.logging_simp_inv import setup_logging
 
-load_dotenv()
-bot = Bot(token=getenv('TOKEN'))
-dp = Dispatcher(storage=MemoryStorage())
+# Worker threads running the queries of all chats; several let reads of different chats run in parallel
+DB_WORKERS = 4
 
 
 async def main():
-    dp.include_router(router)
-    await dp.start_polling(bot)
+    load_dotenv()
+    async with AsyncDatabaseManager(
+            APP_DB_NAME, getenv('DB_DIR', DatabaseManager.DEFAULT_DATABASE_DIRECTORY), workers=DB_WORKERS,
+            tables=(*APP_TABLES, FSM_STATES_TABLE), settings=APP_SETTINGS
+    ) as db:
+        await db.run(import_legacy_databases)
+        bot = Bot(token=getenv('TOKEN'))
+        # db and chat_cache are passed to every handler that declares them. States live in the database,
+        # so several polling processes can share them; the dispatcher closes the storage on shutdown
+        dp = Dispatcher(storage=SQLiteStorage(db), db=db, chat_cache=ChatCache())
+        # Throttled and repeated updates are dropped before any filter or handler runs
+        throttling = ThrottlingMiddleware()
+        dp.message.outer_middleware(throttling)
+        dp.callback_query.outer_middleware(throttling)
+        dp.include_router(router)
+        try:
+            await dp.start_polling(bot)
+        finally:
+            logging.info(f"Update throttling: {throttling.stats()}")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,164 @@
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from aiogram import BaseMiddleware
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import CallbackQuery, Chat, Message, TelegramObject, User
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ThrottlingStats:
+    """A snapshot of the throttling counters."""
+    passed: int
+    throttled: int
+    coalesced: int
+
+
+def _content(event: TelegramObject) -> Optional[Hashable]:
+    """
+    What makes two updates the same request: the text or button of an update, the album of a media message.
+    """
+    if isinstance(event, Message):
+        if event.media_group_id is not None:
+            return 'album', event.media_group_id
+        return ('text', event.text) if event.text is not None else None
+    if isinstance(event, CallbackQuery):
+        return ('callback', event.data) if event.data is not None else None
+    return None
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """
+    Bounds the work each chat can cause, however fast updates arrive.
+
+    Two checks run before an update reaches the filters and handlers; updates failing either are
+    dropped without a reply and counted:
+
+    - Coalescing: an update with the same content as one from the same user in the same chat that
+      is still being handled, or was handled less than `coalesce_seconds` ago, is answered by that
+      one. Several /list requests in a row, or the messages of a forwarded album, cost one handler
+      run; the same command from another member of a group chat is still handled.
+    - Rate limiting: every user in every chat has a token bucket refilled at `rate` updates per
+      second up to `burst`; an update finding the bucket empty is dropped.
+
+    A dropped callback query is still answered, with SLOW_DOWN_TEXT when throttled, so the
+    button's loading indicator stops right away instead of spinning until it times out.
+
+    Register it as an outer middleware of the message and callback query observers, see run.py.
+    """
+
+    DEFAULT_RATE = 1.0
+    DEFAULT_BURST = 5
+    DEFAULT_COALESCE_SECONDS = 1.0
+    DEFAULT_MAX_KEYS = 10_000
+    SLOW_DOWN_TEXT = 'Too many requests, please slow down.'
+
+    def __init__(
+            self,
+            rate: float = DEFAULT_RATE,
+            burst: int = DEFAULT_BURST,
+            coalesce_seconds: float = DEFAULT_COALESCE_SECONDS,
+            max_keys: int = DEFAULT_MAX_KEYS,
+            clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        Args:
+            rate (float): Updates per second a user may send in a chat in the long run.
+            burst (int): Updates a user may send at once after being quiet.
+            coalesce_seconds (float): How long a handled update answers identical ones; 0 turns coalescing off.
+            max_keys (int): The maximum number of tracked buckets and recent updates each; the least
+                recently seen are forgotten first, which only makes the middleware more lenient.
+            clock (Callable[[], float]): A monotonic time source, replaceable in tests.
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError('rate must be positive and burst at least 1.')
+        self.rate = rate
+        self.burst = burst
+        self.coalesce_seconds = coalesce_seconds
+        self.max_keys = max_keys
+        self._clock = clock
+
+        # (chat_id, user_id) -> (tokens, updated_at)
+        self._buckets: 'OrderedDict[Tuple[int, int], Tuple[float, float]]' = OrderedDict()
+        # (chat_id, user_id, content) -> time the handler finished, None while it runs
+        self._recent: 'OrderedDict[Tuple[int, int, Hashable], Optional[float]]' = OrderedDict()
+        self._passed = 0
+        self._throttled = 0
+        self._coalesced = 0
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any]
+    ) -> Any:
+        chat: Optional[Chat] = data.get('event_chat')
+        user: Optional[User] = data.get('event_from_user')
+        if chat is None:
+            return await handler(event, data)
+
+        now = self._clock()
+        user_id = user.id if user else 0
+        content = _content(event)
+        recent_key = (chat.id, user_id, content)
+        if content is not None and self.coalesce_seconds > 0 and self._is_recent(recent_key, now):
+            self._coalesced += 1
+            logger.debug(f"Coalesced a repeated update of user {user_id} in chat {chat.id}.")
+            return await self._drop(event)
+
+        if not self._take_token((chat.id, user_id), now):
+            self._throttled += 1
+            logger.debug(f"Throttled an update of user {user.id if user else None} in chat {chat.id}.")
+            return await self._drop(event, self.SLOW_DOWN_TEXT)
+
+        self._passed += 1
+        if content is None or self.coalesce_seconds <= 0:
+            return await handler(event, data)
+
+        self._remember(self._recent, recent_key, None)
+        try:
+            return await handler(event, data)
+        finally:
+            self._remember(self._recent, recent_key, self._clock())
+
+    def stats(self) -> ThrottlingStats:
+        """
+        Returns how many updates were passed on, throttled and coalesced.
+        """
+        return ThrottlingStats(self._passed, self._throttled, self._coalesced)
+
+    @staticmethod
+    async def _drop(event: TelegramObject, text: Optional[str] = None) -> None:
+        if isinstance(event, CallbackQuery):
+            try:
+                await event.answer(text)
+            except TelegramAPIError as error:
+                logger.debug(f"Answering a dropped callback query failed: {error}")
+        return None
+
+    def _is_recent(self, key: Tuple[int, int, Hashable], now: float) -> bool:
+        if key not in self._recent:
+            return False
+        finished_at = self._recent[key]
+        if finished_at is None or now - finished_at < self.coalesce_seconds:
+            return True
+        del self._recent[key]
+        return False
+
+    def _take_token(self, key: Tuple[int, int], now: float) -> bool:
+        tokens, updated_at = self._buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+        allowed = tokens >= 1
+        self._remember(self._buckets, key, (tokens - 1 if allowed else tokens, now))
+        return allowed
+
+    def _remember(self, entries: OrderedDict, key: Hashable, value: Any) -> None:
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.max_keys:
+            entries.popitem(last=False)
@@ -0,0 +1,63 @@
+import tempfile
+import threading
+import unittest
+
+from lazy_orm.async_db_manager import AsyncDatabaseManager
+from lazy_orm.db_manager import DatabaseError, DatabaseManager
+
+
+class TestAsyncDatabaseManager(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manager = AsyncDatabaseManager('items', self.temp_dir.name)
+        await self.manager.run(
+            DatabaseManager._execute_query, 'CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)'
+        )
+
+    async def test_crud_round_trip(self):
+        await self.manager.insert_rows('items', [{'name': 'a'}, {'name': 'b'}])
+        await self.manager.insert_row('items', {'name': 'c'})
+        await self.manager.update_rows('items', {'name': 'B'}, 'id = 2')
+        await self.manager.delete_row('items', 1)
+
+        self.assertEqual(await self.manager.get_row_count('items'), 2)
+        self.assertEqual(await self.manager.fetch_all_rows('items', ['id', 'name']),
+                         [{'id': 2, 'name': 'B'}, {'id': 3, 'name': 'c'}])
+        self.assertEqual(await self.manager.fetch_rows_if('items', "name = 'c'", ['id']), [{'id': 3}])
+
+    async def test_iter_rows_streams_across_pages(self):
+        await self.manager.insert_rows('items', ({'name': f'item-{i}'} for i in range(7)))
+        names = [row['name'] async for row in self.manager.iter_rows('items', ['id', 'name'], batch_size=3)]
+        self.assertEqual(names, [f'item-{i}' for i in range(7)])
+
+    async def test_queries_run_off_the_event_loop_thread(self):
+        worker_thread = await self.manager.run(lambda manager: threading.get_ident())
+        self.assertNotEqual(worker_thread, threading.get_ident())
+
+    async def test_errors_propagate_to_the_awaiting_coroutine(self):
+        with self.assertRaises(DatabaseError):
+            await self.manager.fetch_all_rows('missing', ['id'])
+
+    async def test_transaction_commits_or_rolls_back_as_a_unit(self):
+        async with self.manager.transaction() as transaction:
+            await transaction.insert_row('items', {'name': 'a'})
+            with self.assertRaises(ValueError):
+                async with transaction.transaction():
+                    await transaction.insert_row('items', {'name': 'b'})
+                    raise ValueError('undo the savepoint')
+            self.assertEqual(await self.manager.get_row_count('items'), 0)
+
+        with self.assertRaises(DatabaseError):
+            async with self.manager.transaction() as transaction:
+                await transaction.insert_row('items', {'name': 'c'})
+                await transaction.fetch_all_rows('missing', ['id'])
+
+        self.assertEqual(await self.manager.fetch_all_rows('items', ['name']), [{'name': 'a'}])
+
+    async def asyncTearDown(self):
+        await self.manager.close()
+        self.temp_dir.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import tempfile
+import unittest
+
+from lazy_orm.cache import QueryCache
+from lazy_orm.db_manager import DatabaseManager
+from lazy_orm.row_factories import tuple_rows
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestQueryCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = QueryCache(max_entries=2, ttl_seconds=10, clock=self.clock)
+
+    def test_lru_eviction(self):
+        for key in ('a', 'b'):
+            self.cache.put('items', key, [key], self.cache.generation('items'))
+        self.assertEqual(self.cache.get('items', 'a'), (True, ['a']))
+        self.cache.put('items', 'c', ['c'], self.cache.generation('items'))
+
+        self.assertEqual(self.cache.get('items', 'b'), (False, None))
+        self.assertEqual(self.cache.get('items', 'a'), (True, ['a']))
+        stats = self.cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.evictions, stats.size), (2, 1, 1, 2))
+
+    def test_ttl_expiry(self):
+        self.cache.put('items', 'a', ['a'], 0)
+        self.clock.now = 11
+        self.assertEqual(self.cache.get('items', 'a'), (False, None))
+        self.assertEqual(self.cache.stats().expirations, 1)
+
+    def test_put_after_invalidation_is_dropped(self):
+        generation = self.cache.generation('items')
+        self.cache.invalidate('items')
+        self.cache.put('items', 'a', ['stale'], generation)
+        self.assertEqual(self.cache.get('items', 'a'), (False, None))
+
+
+class TestManagerQueryCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manager = DatabaseManager('cache_test', self.temp_dir.name, query_cache=QueryCache())
+        self.manager._execute_query('CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT UNIQUE)')
+        self.manager._execute_query('CREATE TABLE other (id INTEGER PRIMARY KEY, name TEXT)')
+
+    def tearDown(self):
+        self.manager.close()
+        self.temp_dir.cleanup()
+
+    def test_reads_are_cached_until_a_write(self):
+        self.manager.insert_row('items', {'name': 'a'})
+        first = self.manager.fetch_all_rows('items', ['name'])
+        self.assertIs(self.manager.fetch_all_rows('items', ['name']), first)
+        self.assertEqual(self.manager.query_cache_stats().hits, 1)
+
+        self.manager.insert_row('other', {'name': 'x'})
+        self.assertIs(self.manager.fetch_all_rows('items', ['name']), first)
+
+        writes = [
+            lambda: self.manager.insert_row('items', {'name': 'b'}),
+            lambda: self.manager.insert_or_ignore('items', {'name': 'c'}),
+            lambda: self.manager.upsert_row('items', {'id': 1, 'name': 'a2'}, ['id']),
+            lambda: self.manager.insert_rows('items', [{'name': 'd'}]),
+            lambda: self.manager.update_rows('items', {'name': 'e'}, 'name = ?', ['d']),
+            lambda: self.manager.delete_row('items', 2),
+        ]
+        for write in writes:
+            before = self.manager.fetch_all_rows('items', ['name'])
+            write()
+            self.assertNotEqual(self.manager.fetch_all_rows('items', ['name']), before)
+
+    def test_per_call_opt_out(self):
+        self.manager.get_row_count('items')
+        self.manager._execute_query("INSERT INTO items (name) VALUES ('raw')")
+
+        self.assertEqual(self.manager.get_row_count('items'), 0)
+        self.assertEqual(self.manager.get_row_count('items', use_cache=False), 1)
+        rows = self.manager.fetch_rows_where('items', {'name': 'raw'}, row_factory=tuple_rows, use_cache=False)
+        self.assertEqual(rows, [(1, 'raw')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,70 +1,201 @@
 import os
+import sqlite3
+import tempfile
 import unittest
-from unittest.mock import Mock, patch
+from concurrent.futures import ThreadPoolExecutor
 
 from lazy_orm import db_manager
+from lazy_orm.cache import QueryCache
+from lazy_orm.row_factories import tuple_rows
 
 
 class TestDatabaseManager(unittest.TestCase):
     def setUp(self):
-        self.manager = db_manager.DatabaseManager('test_db', 'test_dir')
-        self.create_test_db()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manager = db_manager.DatabaseManager('test_db', self.temp_dir.name)
+        self.create_test_db(self.manager)
 
-    def create_test_db(self):
-        db_path = os.path.join('test_dir', 'test_db.sqlite')
-        os.makedirs('test_dir', exist_ok=True)
-
-        with open('sql/create_test_db.sql', 'w') as script_file:
-            script_file.write("""
-                CREATE TABLE IF NOT EXISTS table (
+    @staticmethod
+    def create_test_db(manager):
+        with manager.connection() as connection:
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS items (
                     id INTEGER PRIMARY KEY,
                     name TEXT NOT NULL
                 );
 
-                INSERT INTO table (id, name) VALUES (1, 'test'), (2, 'example');
+                INSERT INTO items (id, name) VALUES (1, 'test'), (2, 'example');
             """)
 
-        connection = self.manager._connect_to_db()
-        with connection:
-            with open('test_dir/create_test_db.sql', 'r') as script_file:
-                connection.executescript(script_file.read())
-
-    @patch.object(db_manager.os.path, 'join')
-    def test_init(self, mock_join):
-        self.assertEqual(self.manager.__db_name, 'test_db')
-
-    @patch.object(db_manager.sqlite3, 'connect')
-    def test_connect_to_db(self, mock_connect):
-        mock_connect.return_value = Mock()
-        self.assertEqual(self.manager._connect_to_db(), mock_connect.return_value)
-
-    def test_row_to_dict(self):
-        row = (1, 'test')
-        columns = ['id', 'name']
-        expected_result = {'id': 1, 'name': 'test'}
-        self.assertEqual(self.manager._row_to_dict(row, columns), expected_result)
-
-    @patch.object(db_manager.DatabaseManager, '_row_to_dict')
-    @patch.object(db_manager.sqlite3.Cursor, 'fetchall')
-    def test_fetch_all(self, mock_fetchall, mock_row_to_dict):
-        mock_fetchall.return_value = [(1, 'test'), (2, 'example')]
-        mock_row_to_dict.side_effect = [{'id': 1, 'name': 'test'}, {'id': 2, 'name': 'example'}]
-        result = self.manager.fetch_all('table', ['id', 'name'])
+    def test_init(self):
+        self.assertEqual(self.manager._db_name, 'test_db')
+        self.assertEqual(self.manager.database_path, os.path.join(self.temp_dir.name, 'test_db'))
+        self.assertTrue(os.path.exists(self.manager.database_path))
+
+    def test_connection_is_reused_within_a_thread(self):
+        with self.manager.connection() as outer, self.manager.connection() as inner:
+            self.assertIs(outer, inner)
+
+    def test_row_factory(self):
+        result = self.manager.fetch_all_rows('items', ['id', 'name'], tuple_rows)
+        self.assertEqual(result, [(1, 'test'), (2, 'example')])
+
+    def test_fetch_all(self):
+        result = self.manager.fetch_all_rows('items', ['id', 'name'])
         self.assertEqual(result, [{'id': 1, 'name': 'test'}, {'id': 2, 'name': 'example'}])
 
-    # Apply similar approach to test other methods
+    def test_update_delete_and_count(self):
+        self.manager.update_rows('items', {'name': 'renamed'}, 'id = ?', [1])
+        self.manager.delete_row('items', 2)
+
+        self.assertEqual(self.manager.fetch_all_rows('items', ['name']), [{'name': 'renamed'}])
+        self.assertEqual(self.manager.get_row_count('items'), 1)
+
+    def test_in_memory_database_is_shared_by_the_pool(self):
+        manager = db_manager.DatabaseManager('test_db', db_manager.DatabaseManager.IN_MEMORY_DIRECTORY)
+        self.create_test_db(manager)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            count = executor.submit(manager.get_row_count, 'items').result()
+        self.assertEqual(count, 2)
+        manager.close()
 
     def tearDown(self):
-        del self.manager
-        db_path = os.path.join('test_dir', 'test_db.sqlite')
-        if os.path.exists(db_path):
-            os.remove(db_path)
-        script_path = os.path.join('test_dir', 'create_test_db.sql')
-        if os.path.exists(script_path):
-            os.remove(script_path)
-        if os.path.exists('test_dir'):
-            os.rmdir('test_dir')
+        self.manager.close()
+        self.temp_dir.cleanup()
+
+
+class TestBulkInsert(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manager = db_manager.DatabaseManager('items', self.temp_dir.name)
+        self.manager._execute_query(
+            'CREATE TABLE items (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE, size INTEGER)'
+        )
+
+    def test_insert_rows_returns_rowids_in_input_order(self):
+        rows = [{'name': 'a'}, {'name': 'b', 'size': 2}, {'name': 'c'}, {'size': 4, 'name': 'd'}]
+        row_ids = self.manager.insert_rows('items', rows, chunk_size=3)
+
+        stored = self.manager.fetch_rows_if('items', '1 = 1', ['id', 'name'])
+        self.assertEqual(row_ids, [row['id'] for row in sorted(stored, key=lambda row: row['name'])])
+        self.assertEqual(self.manager.get_row_count('items'), 4)
+
+    def test_insert_rows_accepts_generators(self):
+        row_ids = self.manager.insert_many('items', ({'name': f'item-{i}'} for i in range(25)), chunk_size=10)
+        self.assertEqual(row_ids, list(range(1, 26)))
+
+    def test_insert_rows_rolls_back_whole_batch_on_error(self):
+        with self.assertRaises(db_manager.DatabaseError):
+            self.manager.insert_rows('items', [{'name': 'x'}, {'name': 'y'}, {'name': 'x'}], chunk_size=1)
+        self.assertEqual(self.manager.get_row_count('items'), 0)
+
+    def test_insert_or_ignore_and_upsert(self):
+        row_id = self.manager.insert_or_ignore('items', {'name': 'a', 'size': 1})
+        self.assertIsNone(self.manager.insert_or_ignore('items', {'name': 'a', 'size': 2}))
+        self.assertEqual(self.manager.upsert_row('items', {'name': 'a', 'size': 3}, ['name']), row_id)
+        self.assertEqual(self.manager.fetch_rows_where('items', {'id': row_id}, ['size']), [{'size': 3}])
+
+        outcomes = self.manager.insert_rows('items', [{'name': 'a'}, {'name': 'b'}, {'name': 'b'}],
+                                            ignore_conflicts=True)
+        self.assertEqual((outcomes[0], outcomes[2]), (None, None))
+        self.assertEqual(self.manager.fetch_rows_where('items', {'name': 'b'}, ['id']), [{'id': outcomes[1]}])
+
+    def test_bulk_delete_and_update_by_ids_in_chunks(self):
+        self.manager.insert_rows('items', ({'name': f'item-{i}', 'size': i % 2} for i in range(1, 26)))
+
+        updated = self.manager.update_rows_by_ids('items', range(1, 21), {'size': 5}, 'size = ?', [1], chunk_size=3)
+        self.assertEqual(updated, 10)
+        self.assertEqual(self.manager.delete_rows('items', [2, 4, 99, 6], chunk_size=2), 3)
+        self.assertEqual(self.manager.delete_rows('items', iter(range(1, 26)), 'size = ?', [5], chunk_size=7), 10)
+        self.assertEqual(self.manager.get_row_count('items'), 12)
+
+    def test_bulk_delete_by_ids_rolls_back_on_error(self):
+        self.manager.insert_rows('items', [{'name': 'a'}, {'name': 'b'}])
+        with self.assertRaises(db_manager.DatabaseError):
+            self.manager.delete_rows('items', [1, 2], 'no_such_column = ?', [1], chunk_size=1)
+        self.assertEqual(self.manager.get_row_count('items'), 2)
+
+    def test_upsert_rows_and_delete_rows_if(self):
+        self.manager.insert_rows('items', [{'name': 'a', 'size': 1}, {'name': 'b', 'size': 2}])
+        written = self.manager.upsert_rows('items', [{'name': 'a', 'size': 10}, {'name': 'c', 'size': 3}], ['name'],
+                                           chunk_size=1)
+
+        self.assertEqual(written, 2)
+        stored = self.manager.fetch_rows_if('items', '1 = 1', ['name', 'size'], row_factory=tuple_rows)
+        self.assertEqual(sorted(stored, key=lambda row: row[0]), [('a', 10), ('b', 2), ('c', 3)])
+        self.assertEqual(self.manager.delete_rows_if('items', 'size < ?', [5]), 2)
+        self.assertEqual(self.manager.get_row_count('items'), 1)
+
+    def tearDown(self):
+        self.manager.close()
+        self.temp_dir.cleanup()
+
+
+class TestStreamingAndPagination(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manager = db_manager.DatabaseManager('items', self.temp_dir.name)
+        self.manager._execute_query('CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, kind INTEGER)')
+        self.manager.insert_rows('items', ({'name': f'item-{i}', 'kind': i % 2} for i in range(1, 11)))
+
+    def test_iter_rows_streams_in_batches(self):
+        rows = self.manager.iter_rows('items', ['id'], where={'kind': 0}, batch_size=2)
+        self.assertEqual(next(rows), {'id': 2})
+        self.assertEqual([row['id'] for row in rows], [4, 6, 8, 10])
+
+    def test_fetch_page_walks_the_table_by_key(self):
+        first = self.manager.fetch_page('items', ['id', 'name'], limit=4)
+        second = self.manager.fetch_page('items', ['id', 'name'], after_id=first[-1]['id'], limit=4)
+        filtered = self.manager.fetch_page('items', ['id'], where={'kind': 1}, after_id=5, limit=10)
+
+        self.assertEqual([row['id'] for row in first], [1, 2, 3, 4])
+        self.assertEqual([row['id'] for row in second], [5, 6, 7, 8])
+        self.assertEqual(filtered, [{'id': 7}, {'id': 9}])
+
+    def tearDown(self):
+        self.manager.close()
+        self.temp_dir.cleanup()
 
 
 if __name__ == '__main__':
     unittest.main()
+
+
+class TestTransactions(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manager = db_manager.DatabaseManager('items', self.temp_dir.name, query_cache=QueryCache())
+        self.manager._execute_query('CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)')
+
+    def names(self):
+        return [row['name'] for row in self.manager.fetch_all_rows('items', ['name'])]
+
+    def test_commits_once_at_the_end(self):
+        self.assertEqual(self.names(), [])
+        with self.manager.transaction() as manager:
+            manager.insert_row('items', {'name': 'a'})
+            manager.insert_rows('items', [{'name': 'b'}, {'name': 'c'}])
+            with sqlite3.connect(self.manager.database_path) as other:
+                self.assertEqual(other.execute('SELECT COUNT(*) FROM items').fetchone()[0], 0)
+
+        self.assertEqual(self.names(), ['a', 'b', 'c'])
+
+    def test_database_error_rolls_back(self):
+        with self.assertRaises(db_manager.DatabaseError):
+            with self.manager.transaction():
+                self.manager.insert_row('items', {'name': 'a'})
+                self.manager.insert_row('items', {'name': 'a'})
+
+        self.assertFalse(self.manager.in_transaction)
+        self.assertEqual(self.names(), [])
+
+    def test_nested_savepoint_rolls_back_alone(self):
+        with self.manager.transaction():
+            self.manager.insert_row('items', {'name': 'outer'})
+            with self.assertRaises(db_manager.DatabaseError):
+                with self.manager.transaction():
+                    self.manager.insert_row('items', {'name': 'inner'})
+                    self.manager.insert_row('items', {'name': 'outer'})
+
+        self.assertEqual(self.names(), ['outer'])
@@ -0,0 +1,50 @@
+import unittest
+from unittest.mock import patch
+
+from utils import email
+
+
+class TestEmailValidation(unittest.TestCase):
+    def setUp(self):
+        email._check.cache_clear()
+
+    def test_outcomes_are_cached_including_invalid_ones(self):
+        self.assertEqual(email.validate_and_normalize_email('Alice@Example.COM', check_deliverability=False),
+                         'alice@example.com')
+        with self.assertRaises(email.EmailNotValidError):
+            email.validate_and_normalize_email('alice@', check_deliverability=False)
+        with patch.object(email, 'validate_email', side_effect=AssertionError('validated twice')):
+            self.assertTrue(email.check_email('Alice@Example.COM', check_deliverability=False).valid)
+            self.assertFalse(email.check_email('alice@', check_deliverability=False).valid)
+        self.assertEqual(email._check.cache_info().hits, 2)
+
+    def test_offline_mode_never_resolves(self):
+        with patch.object(email, 'CHECK_DELIVERABILITY', False), \
+                patch.object(email, '_resolver', side_effect=AssertionError('network used')):
+            self.assertTrue(email.check_email('bob@example.com').valid)
+
+    def test_validate_many_reports_every_address_in_order(self):
+        checks = email.validate_many(['B@example.com', 'nope', 'b@example.com', 'B@example.com'],
+                                     check_deliverability=False)
+
+        self.assertEqual([check.normalized for check in checks],
+                         ['b@example.com', None, 'b@example.com', 'b@example.com'])
+        self.assertEqual([check.valid for check in checks], [True, False, True, True])
+        self.assertIn('@', checks[1].error)
+        self.assertEqual(email._check.cache_info().misses, 3)
+
+    def test_validate_many_checks_deliverability_in_threads(self):
+        def fake_validate(address, check_deliverability, dns_resolver):
+            self.assertTrue(check_deliverability)
+            return type('Validated', (), {'normalized': address})()
+
+        with patch.object(email, 'validate_email', side_effect=fake_validate), \
+                patch.object(email, '_resolver', return_value=None):
+            checks = email.validate_many([f'user{number}@example.com' for number in range(20)],
+                                         check_deliverability=True, workers=4)
+        self.assertTrue(all(check.valid for check in checks))
+        self.assertEqual(checks[7].normalized, 'user7@example.com')
+
+
+if __name__ == '__main__':
+    unittest.main()
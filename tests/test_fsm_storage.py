@@ -0,0 +1,91 @@
+import tempfile
+import unittest
+
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.fsm.storage.base import StorageKey
+
+from lazy_orm.async_db_manager import AsyncDatabaseManager
+from telegram_bot.fsm_storage import FSM_STATES_TABLE, SQLiteStorage
+
+KEY = StorageKey(bot_id=1, chat_id=10, user_id=100)
+
+
+class AddTodo(StatesGroup):
+    task = State()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSQLiteStorage(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = AsyncDatabaseManager('fsm', self.temp_dir.name, tables=(FSM_STATES_TABLE,))
+        self.clock = FakeClock()
+
+    async def asyncTearDown(self):
+        await self.db.close()
+        self.temp_dir.cleanup()
+
+    def storage(self, **options):
+        # Writes reach the table only on explicit flushes and close
+        return SQLiteStorage(self.db, clock=self.clock, flush_interval=60, **options)
+
+    async def rows(self):
+        return await self.db.fetch_all_rows(FSM_STATES_TABLE, ['key', 'state', 'data'], use_cache=False)
+
+    async def test_state_and_data_survive_a_restart(self):
+        storage = self.storage()
+        await storage.set_state(KEY, AddTodo.task)
+        await storage.update_data(KEY, {'category': 'shopping'})
+        self.assertEqual(await storage.get_state(KEY), 'AddTodo:task')
+        await storage.close()
+
+        restarted = self.storage()
+        self.assertEqual(await restarted.get_state(KEY), 'AddTodo:task')
+        self.assertEqual(await restarted.get_data(KEY), {'category': 'shopping'})
+        await restarted.close()
+
+    async def test_writes_are_batched_and_empty_keys_deleted(self):
+        storage = self.storage()
+        for user_id in range(5):
+            await storage.set_state(StorageKey(bot_id=1, chat_id=10, user_id=user_id), 'waiting')
+        self.assertEqual(await self.rows(), [])
+
+        self.assertTrue(await storage.flush())
+        self.assertEqual(len(await self.rows()), 5)
+
+        await storage.set_state(StorageKey(bot_id=1, chat_id=10, user_id=0), None)
+        await storage.close()
+        self.assertEqual(len(await self.rows()), 4)
+
+    async def test_expired_keys_read_as_empty_and_are_swept(self):
+        storage = self.storage(state_ttl_seconds=60, cache_seconds=None)
+        await storage.set_state(KEY, 'waiting')
+        await storage.set_data(KEY, {'step': 1})
+        await storage.flush()
+
+        self.clock.now += 61
+        self.assertIsNone(await storage.get_state(KEY))
+        self.assertEqual(await storage.get_data(KEY), {})
+        self.assertEqual(await storage.sweep(), 1)
+        self.assertEqual(await self.rows(), [])
+        await storage.close()
+
+    async def test_another_process_sees_writes_after_cache_seconds(self):
+        reader = self.storage(cache_seconds=5)
+        writer = self.storage()
+        self.assertIsNone(await reader.get_state(KEY))
+
+        await writer.set_state(KEY, 'waiting')
+        await writer.flush()
+        self.assertIsNone(await reader.get_state(KEY))
+        self.clock.now += 5
+        self.assertEqual(await reader.get_state(KEY), 'waiting')
+        await reader.close()
+        await writer.close()
@@ -0,0 +1,81 @@
+import json
+import tempfile
+import unittest
+
+from lazy_orm.db_manager import DatabaseError, DatabaseManager
+from lazy_orm.instrumentation import QueryEvent, QueryStats, normalize_sql
+
+
+class TestNormalizeSql(unittest.TestCase):
+    def test_literals_and_whitespace(self):
+        self.assertEqual(
+            normalize_sql("SELECT *  FROM items\n WHERE name = 'it''s' AND id > 42"),
+            'SELECT * FROM items WHERE name = ? AND id > ?'
+        )
+
+
+class TestQueryStats(unittest.TestCase):
+    def test_histogram_and_slow_query_log(self):
+        stats = QueryStats(slow_query_seconds=0.5, bucket_bounds_ms=(1, 100))
+        stats(QueryEvent('SELECT 1', 'fast', 0.0005, 1, True))
+        stats(QueryEvent('SELECT  1', 'fast', 0.05, 1, True))
+        with self.assertLogs('lazy_orm.slow_queries', 'WARNING') as logs:
+            stats(QueryEvent('SELECT 2 FROM items', 'slow', 0.6, 0, True))
+
+        self.assertIn("during 'slow'", logs.output[0])
+        snapshot = json.loads(stats.to_json())
+        self.assertEqual(snapshot['operation_contexts'], {'fast': 2, 'slow': 1})
+        slow, fast = snapshot['queries']
+        self.assertEqual((slow['sql'], slow['buckets']), ('SELECT ? FROM items', [0, 0, 1]))
+        self.assertEqual((fast['count'], fast['rows'], fast['buckets']), (2, 2, [1, 1, 0]))
+
+
+class TestManagerHooks(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.events = []
+        self.manager = DatabaseManager('hooks_test', self.temp_dir.name, query_hooks=[self.events.append])
+        self.manager._execute_query('CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)')
+
+    def tearDown(self):
+        self.manager.close()
+        self.temp_dir.cleanup()
+
+    def test_events_report_rows_and_context(self):
+        self.manager.insert_row('items', {'name': 'a'})
+        self.manager.fetch_all_rows('items', ['name'])
+
+        insert, fetch = self.events[-2:]
+        self.assertEqual((insert.rows, insert.fetch_mode), (1, False))
+        self.assertEqual((fetch.rows, fetch.operation_context), (1, 'Fetch all rows'))
+        self.assertGreaterEqual(fetch.duration_seconds, 0)
+
+    def test_failures_and_removal(self):
+        with self.assertRaises(DatabaseError):
+            self.manager.fetch_all_rows('missing', ['name'])
+        self.assertIsNotNone(self.events[-1].error)
+
+        self.manager.remove_query_hook(self.events.append)
+        count = len(self.events)
+        self.manager.get_row_count('items')
+        self.assertEqual(len(self.events), count)
+
+    def test_operation_contexts_do_not_depend_on_values(self):
+        stats = QueryStats()
+        self.manager.add_query_hook(stats)
+        for name in 'abc':
+            self.manager.insert_row('items', {'name': name})
+        for row_id in (1, 2, 3):
+            self.manager.delete_row('items', row_id)
+        for name in 'ab':
+            self.manager.fetch_rows_if('items', f"name = '{name}'", ['id'], use_cache=False)
+
+        self.assertEqual(stats.snapshot()['operation_contexts'], {
+            "Inserting into table 'items'": 3,
+            "Deleting a row from table 'items'": 3,
+            "Fetch rows from table 'items' by condition": 2,
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import json
+import os
+import tempfile
+import unittest
+
+from click.testing import CliRunner
+
+from inv_cli import app
+
+
+class TestInvCli(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.runner = CliRunner(env={'INV_DB_DIR': self.temp_dir.name})
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def invoke(self, *args, **options):
+        return self.runner.invoke(app, args, **options)
+
+    def test_tasks_persist_between_invocations(self):
+        self.assertIn('Todo added successfully.', self.invoke('new', 'Buy milk', '--cat', 'shopping').output)
+        self.invoke('new', 'Read a book', '--cat', 'READING')
+        self.assertIn('Todo already exists!', self.invoke('new', 'Buy milk', '--cat', 'SHOPPING').output)
+
+        self.assertEqual(self.invoke('done', '1').exit_code, 0)
+        self.assertEqual(self.invoke('update', '2', 'Read two books').exit_code, 0)
+        missing = self.invoke('del', '9')
+        self.assertEqual((missing.exit_code, missing.output.strip()), (1, 'Error: No task #9.'))
+
+        listing = self.invoke('list', '--status', 'undone').output
+        self.assertIn('Read two books', listing)
+        self.assertNotIn('Buy milk', listing)
+        self.assertIn('Buy milk', self.invoke('search', 'milk').output)
+        self.assertEqual(self.invoke('search', 'mil', '--status', 'undone', '--format', 'tsv').output.count('\n'), 1)
+
+    def test_list_pages_filters_and_plain_formats(self):
+        for task in ('a', 'b', 'c', 'd'):
+            self.invoke('new', task, '--cat', 'READING' if task in 'ac' else 'SHOPPING')
+        self.invoke('done', '3')
+
+        tsv = self.invoke('list', '--format', 'tsv', '--page-size', '1', '--limit', '3').output.splitlines()
+        self.assertEqual(tsv[0].split('\t'), ['ID', 'Task', 'Category', 'Date Added', 'Date Completed', 'Status'])
+        self.assertEqual([line.split('\t')[1] for line in tsv[1:]], ['a', 'b', 'c'])
+
+        listed = json.loads(self.invoke('list', '--format', 'json', '--cat', 'reading', '--status', 'done').output)
+        self.assertEqual([(todo['id'], todo['status']) for todo in listed], [(3, 'DONE')])
+        page = self.invoke('list', '--format', 'tsv', '--page', '2', '--page-size', '3').output.splitlines()
+        self.assertEqual([line.split('\t')[1] for line in page[1:]], ['d'])
+        self.assertEqual(json.loads(self.invoke('list', '--format', 'json', '--since', '2999-01-01').output), [])
+
+    def test_bulk_done_and_purge(self):
+        for task in ('a', 'b', 'c'):
+            self.invoke('new', task)
+
+        self.assertEqual(self.invoke('done', '1', '2', '9').output.strip(), '2 of 3 tasks done!')
+        self.assertEqual(self.invoke('purge', '--before', '2000-01-01', '--yes').output, '0 done tasks deleted.\n')
+        self.assertEqual(self.invoke('purge', input='y\n').output.splitlines()[-1], '2 done tasks deleted.')
+        self.assertEqual(self.invoke('list', '--format', 'tsv').output.splitlines()[1].split('\t')[1], 'c')
+
+    def test_import_is_all_or_nothing(self):
+        csv_path = os.path.join(self.temp_dir.name, 'todos.csv')
+        with open(csv_path, 'w', encoding='utf-8') as csv_file:
+            csv_file.write('task,category,status,date_added\nShop,SHOPPING,done,2025-01-02 10:00\nRead,READING,,\n')
+        json_path = os.path.join(self.temp_dir.name, 'todos.json')
+        with open(json_path, 'w', encoding='utf-8') as json_file:
+            json.dump([{'task': 'Cook'}, {'task': 'Fly', 'category': 'TRAVEL'}], json_file)
+
+        self.assertIn('2 todos added successfully', self.invoke('import', csv_path).output)
+        rejected = self.invoke('import', json_path)
+        self.assertEqual(rejected.exit_code, 1)
+        self.assertIn("Unknown category 'TRAVEL'", rejected.output)
+        self.assertNotIn('Cook', self.invoke('list').output)
+
+    def test_help_does_not_open_the_database(self):
+        self.assertIn('import', self.invoke('--help').output)
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import io
+import json
+import logging
+import os
+import queue
+import sys
+import tempfile
+import unittest
+
+from utils.logging_simp_inv import (BoundedQueueHandler, ColorFormatter, JsonLinesFormatter, LogColors,
+                                    setup_logging, stop_logging)
+
+
+def _record(msg, *args, level=logging.WARNING):
+    return logging.LogRecord('test', level, __file__, 1, msg, args, None)
+
+
+class TestFormatters(unittest.TestCase):
+    def test_color_formatter_does_not_mutate_the_record(self):
+        record = _record('%d rows', 3)
+        colored = ColorFormatter('%(levelname)s %(message)s').format(record)
+
+        self.assertEqual(colored, f'WARNING {LogColors.YELLOW}3 rows{LogColors.RESET}')
+        self.assertEqual(logging.Formatter('%(message)s').format(record), '3 rows')
+
+    def test_json_lines_formatter(self):
+        try:
+            raise ValueError('broken')
+        except ValueError:
+            record = logging.LogRecord('db', logging.ERROR, __file__, 1, 'Query %s failed', ('q',), sys.exc_info())
+
+        entry = json.loads(JsonLinesFormatter().format(record))
+        self.assertEqual((entry['level'], entry['logger'], entry['message']), ('ERROR', 'db', 'Query q failed'))
+        self.assertIn('ValueError: broken', entry['exception'])
+
+
+class TestQueueLogging(unittest.TestCase):
+    def test_full_queue_drops_and_counts(self):
+        handler = BoundedQueueHandler(queue.Queue(maxsize=2))
+        for number in range(5):
+            handler.handle(_record(f'record {number}'))
+        self.assertEqual((handler.queue.qsize(), handler.dropped), (2, 3))
+
+    def test_records_reach_the_handlers_through_the_listener(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            console = io.StringIO()
+            log_file = os.path.join(log_dir, 'test.log')
+            root_level = logging.getLogger().level
+            setup_logging(log_file=log_file, json_lines=True, stream=console)
+            try:
+                logging.getLogger('test').info('Stored %d todos', 2)
+            finally:
+                self.assertEqual(stop_logging(), 0)
+                logging.getLogger().setLevel(root_level)
+
+            with open(log_file) as lines:
+                self.assertEqual(json.loads(lines.readline())['message'], 'Stored 2 todos')
+            self.assertIn('Stored 2 todos', console.getvalue())
+            self.assertFalse(any(isinstance(handler, BoundedQueueHandler) for handler in logging.getLogger().handlers))
+
+    def test_queued_exception_is_written_as_its_own_json_key(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            console = io.StringIO()
+            log_file = os.path.join(log_dir, 'test.log')
+            root_level = logging.getLogger().level
+            setup_logging(log_file=log_file, json_lines=True, stream=console)
+            try:
+                try:
+                    raise ValueError('broken')
+                except ValueError:
+                    logging.getLogger('db').exception('Query %s failed', 'q')
+            finally:
+                stop_logging()
+                logging.getLogger().setLevel(root_level)
+
+            with open(log_file) as lines:
+                entry = json.loads(lines.readline())
+            self.assertEqual(entry['message'], 'Query q failed')
+            self.assertIn('ValueError: broken', entry['exception'])
+            self.assertIn('ValueError: broken', console.getvalue())
@@ -0,0 +1,309 @@
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from lazy_orm.db_manager import DatabaseError, DatabaseManager
+from lazy_orm.migrations import (
+    adopt_user_version, apply_migrations, discover_migrations, get_schema_version, split_statements
+)
+from lazy_orm.pool import ConnectionPool, ConnectionSettings
+from lazy_orm.row_factories import tuple_rows
+from model.todo_model import Status, Todo, to_epoch
+from service import todo_srv
+from service.app_db import import_legacy_databases, open_app_database
+
+# The todos schema of the first release: dates as 'YYYY-MM-DD HH:MM' text and the status as text
+BASELINE_TODOS_SQL = """
+    create table todos
+    (
+        id             INTEGER PRIMARY KEY AUTOINCREMENT,
+        task           TEXT NOT NULL,
+        category       TEXT DEFAULT 'BACKLOG',
+        date_added     TEXT NOT NULL,
+        date_completed TEXT,
+        status         TEXT DEFAULT 'UNDONE'
+    );
+    insert into todos (task, category, date_added, date_completed, status) values
+        ('Buy milk', 'SHOPPING', '2024-03-01 10:00', null, 0),
+        ('Read a book', 'READING', '2024-03-02 11:30', '2024-03-05 08:15', 1),
+        ('Old default', 'BACKLOG', '2024-01-01 00:00', null, 'UNDONE');
+    delete from todos where id = 3;
+    insert into todos (task, category, date_added) values ('Fix the bike', 'MAINTENANCE', '2024-02-01 09:00');
+    insert into todos (task, date_added) values ('Gone', '2024-02-02 09:00');
+    delete from todos where task = 'Gone';
+"""
+
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.migrations_dir = os.path.join(self.temp_dir.name, 'migrations')
+        os.makedirs(self.migrations_dir)
+        self.pool = ConnectionPool(os.path.join(self.temp_dir.name, 'test.db'))
+
+    def write_migration(self, file_name, script):
+        with open(os.path.join(self.migrations_dir, file_name), 'w') as script_file:
+            script_file.write(script)
+
+    def test_applies_pending_migrations_in_order_once(self):
+        self.write_migration('002_add_index.sql', 'create index idx_items_name on items (name);')
+        self.write_migration('001_create.sql', 'create table items (id INTEGER PRIMARY KEY, name TEXT);')
+        self.write_migration('notes.txt', 'ignored')
+        migrations = discover_migrations(self.migrations_dir)
+
+        with self.pool.connection() as connection:
+            self.assertEqual([migration.version for migration in migrations], [1, 2])
+            self.assertEqual(apply_migrations(connection, migrations), 2)
+            self.assertEqual(apply_migrations(connection, migrations), 2)
+            self.assertEqual(get_schema_version(connection), 2)
+
+    def test_failed_migration_keeps_previous_version(self):
+        self.write_migration('001_create.sql', 'create table items (id INTEGER PRIMARY KEY);')
+        self.write_migration('002_broken.sql', 'create table other (id INTEGER); create index broken on missing (x);')
+
+        with self.pool.connection() as connection:
+            with self.assertRaises(Exception):
+                apply_migrations(connection, discover_migrations(self.migrations_dir))
+            self.assertEqual(get_schema_version(connection), 1)
+            tables = connection.execute("SELECT name FROM sqlite_master WHERE name = 'other'").fetchall()
+            self.assertEqual(tables, [])
+
+    def test_scripts_are_split_into_statements(self):
+        script = (
+            "create table items (name TEXT DEFAULT ';'); -- one; two\n"
+            "create trigger items_upper after insert on items begin update items set name = upper(name); end;\n"
+        )
+        connection = sqlite3.connect(':memory:')
+        for statement in split_statements(script):
+            connection.execute(statement)
+        connection.execute("insert into items (name) values ('a;b')")
+        self.assertEqual(connection.execute('select name from items').fetchall(), [('A;B',)])
+        connection.close()
+
+    def test_components_are_versioned_independently(self):
+        self.write_migration('001_create.sql', 'create table if not exists items (id INTEGER PRIMARY KEY);')
+        migrations = discover_migrations(self.migrations_dir)
+
+        with self.pool.connection() as connection:
+            connection.execute('PRAGMA user_version = 1')
+            adopt_user_version(connection, 'legacy')
+            self.assertEqual(apply_migrations(connection, migrations, component='items'), 1)
+            self.assertEqual(get_schema_version(connection, 'legacy'), 1)
+            self.assertEqual(get_schema_version(connection, 'other'), 0)
+
+    def tearDown(self):
+        self.pool.close()
+        self.temp_dir.cleanup()
+
+
+class TestConcurrentMigrations(unittest.TestCase):
+    PROCESSES = 4
+    # Every process waits for the same start time, then opens the application database
+    OPEN_APP_DATABASE = (
+        'import sys, time\n'
+        'from service.app_db import open_app_database\n'
+        'time.sleep(max(0.0, float(sys.argv[2]) - time.time()))\n'
+        'open_app_database(sys.argv[1]).close()\n'
+    )
+
+    def test_processes_opening_a_fresh_database_apply_each_migration_once(self):
+        for round_number in range(3):
+            with tempfile.TemporaryDirectory() as db_dir, self.subTest(round=round_number):
+                start_at = str(time.time() + 1.0)
+                processes = [
+                    subprocess.Popen([sys.executable, '-c', self.OPEN_APP_DATABASE, db_dir, start_at],
+                                     stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+                    for _ in range(self.PROCESSES)
+                ]
+                outcomes = [(process.wait(timeout=60), process.stderr.read()) for process in processes]
+                for process in processes:
+                    process.stdout.close()
+                    process.stderr.close()
+
+                self.assertEqual([code for code, _ in outcomes], [0] * self.PROCESSES,
+                                 [error.strip().splitlines()[-1] for code, error in outcomes if code])
+                with sqlite3.connect(os.path.join(db_dir, 'app')) as connection:
+                    versions = dict(connection.execute('SELECT component, version FROM schema_versions'))
+                connection.close()
+                migrations = discover_migrations(os.path.join(DatabaseManager.DEFAULT_SQL_SCRIPT_DIRECTORY,
+                                                              DatabaseManager.MIGRATIONS_SUBDIRECTORY, 'todos'))
+                self.assertEqual(versions['todos'], migrations[-1].version)
+
+
+class TestLegacyImport(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        connection = sqlite3.connect(os.path.join(self.temp_dir.name, 'todos'))
+        connection.executescript(BASELINE_TODOS_SQL)
+        connection.close()
+        users = DatabaseManager('users', self.temp_dir.name)
+        users.insert_row('users', {'username': 'alex', 'email': 'alex@example.com', 'age': 40})
+        users.close()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_legacy_files_are_imported_once_with_their_ids(self):
+        manager = open_app_database(self.temp_dir.name)
+        self.assertEqual([todo['id'] for todo in todo_srv.query_todos(manager)], [2, 1, 4])
+        self.assertEqual(todo_srv.search_todos(manager, 'bike')[0]['id'], 4)
+        self.assertEqual(manager.fetch_all_rows('users', ['username'], use_cache=False), [{'username': 'alex'}])
+
+        # Ids of deleted legacy todos are not reused, and emptying the tables does not import them again
+        todo_srv.add_todo(manager, Todo('New task'))
+        self.assertEqual(todo_srv.query_todos(manager)[0]['id'], 6)
+        self.assertEqual(todo_srv.delete_todos(manager, [1, 2, 4, 6]), 4)
+        self.assertEqual(import_legacy_databases(manager), {})
+        manager.close()
+
+        manager = open_app_database(self.temp_dir.name)
+        self.assertEqual(todo_srv.query_todos(manager), [])
+        manager.close()
+
+    def test_legacy_file_is_not_merged_into_a_used_table(self):
+        os.rename(os.path.join(self.temp_dir.name, 'todos'), os.path.join(self.temp_dir.name, 'old_todos'))
+        manager = open_app_database(self.temp_dir.name)
+        todo_srv.add_todo(manager, Todo('Already here'))
+        os.rename(os.path.join(self.temp_dir.name, 'old_todos'), os.path.join(self.temp_dir.name, 'todos'))
+
+        with self.assertLogs(level='WARNING') as logs:
+            self.assertEqual(import_legacy_databases(manager), {})
+        self.assertIn("table 'todos' of the application database already has rows", logs.output[-1])
+        self.assertEqual([todo['task'] for todo in todo_srv.query_todos(manager)], ['Already here'])
+        manager.close()
+
+
+class TestHotQueriesUseIndexes(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def test_todo_lookups_use_indexes(self):
+        manager = DatabaseManager('todos', self.temp_dir.name)
+        exists_plan = manager.explain(manager.statements.exists('todos', ('task', 'category')), ['x', 'BACKLOG'])
+        status_plan = manager.explain('SELECT id FROM todos WHERE status = ? ORDER BY date_added', [0])
+
+        self.assertIn('USING COVERING INDEX ux_todos_task_category', ' '.join(exists_plan))
+        self.assertIn('idx_todos_status_date_added', ' '.join(status_plan))
+        self.assertNotIn('USE TEMP B-TREE', ' '.join(status_plan))
+        manager.close()
+
+    def test_filtered_todo_listing_uses_indexes(self):
+        manager = DatabaseManager('todos', self.temp_dir.name)
+        query = manager.statements.select(
+            'todos', ['id', 'task'], ['status'], order_by=['-date_added', '-id'], limit=True, offset=True
+        )
+        plan = ' '.join(manager.explain(query, [0, 50, 100]))
+        stats_plan = ' '.join(manager.explain(manager.statements.count('todos', group_by=['category'])))
+
+        self.assertIn('idx_todos_status_date_added', plan)
+        self.assertNotIn('TEMP B-TREE', plan + stats_plan)
+        manager.close()
+
+    def test_paged_todo_listing_avoids_sorting(self):
+        manager = DatabaseManager('todos', self.temp_dir.name)
+        for where in (['status'], ['category'], ['status', 'category']):
+            query = manager.statements.select('todos', None, where, condition='id > ?', order_by=['id'], limit=True)
+            plan = ' '.join(manager.explain(query, [0] * len(where) + [0, 50]))
+            with self.subTest(where=where):
+                self.assertIn('_id (', plan)
+                self.assertNotIn('TEMP B-TREE', plan)
+        manager.close()
+
+    def test_todo_search_uses_the_full_text_index(self):
+        manager = DatabaseManager('todos', self.temp_dir.name)
+        query = manager.statements.search('todos', 'todos_fts', ['id'], ['status'], snippet=True, limit=True)
+        plan = ' '.join(manager.explain(query, ['[', ']', '…', 8, '"milk"*', 0, 20]))
+
+        self.assertIn('todos_fts VIRTUAL TABLE', plan)
+        self.assertIn('INTEGER PRIMARY KEY', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+        manager.close()
+
+    def test_full_text_migration_indexes_existing_todos(self):
+        sql_dir = DatabaseManager.DEFAULT_SQL_SCRIPT_DIRECTORY
+        migrations = discover_migrations(os.path.join(sql_dir, 'migrations', 'todos'))
+        pool = ConnectionPool(os.path.join(self.temp_dir.name, 'todos'))
+        with pool.connection() as connection:
+            with open(os.path.join(sql_dir, 'create_todos_db.sql')) as script:
+                connection.executescript(script.read())
+            apply_migrations(connection, [migration for migration in migrations if migration.version < 6], 'todos')
+            connection.execute("INSERT INTO todos (task, date_added) VALUES ('Buy milk', 0)")
+            connection.commit()
+            apply_migrations(connection, migrations, 'todos')
+
+            self.assertEqual(connection.execute("SELECT rowid FROM todos_fts WHERE todos_fts MATCH 'milk'").fetchall(),
+                             [(1,)])
+        pool.close()
+
+    def test_baseline_todos_are_converted_to_integer_columns(self):
+        connection = sqlite3.connect(os.path.join(self.temp_dir.name, 'todos'))
+        connection.executescript(BASELINE_TODOS_SQL)
+        connection.close()
+
+        manager = DatabaseManager('todos', self.temp_dir.name)
+        column_types = dict(manager._execute_query(
+            "SELECT name, type FROM pragma_table_info('todos')", fetch_mode=True, row_factory=tuple_rows
+        ))
+        self.assertEqual([column_types[name] for name in ('date_added', 'date_completed', 'status')],
+                         ['INTEGER', 'INTEGER', 'INTEGER'])
+        rows = manager.fetch_rows_if(
+            'todos', '1 = 1', ['id', 'date_added', 'date_completed', 'status'], use_cache=False
+        )
+        self.assertEqual(rows, [
+            {'id': 1, 'date_added': to_epoch('2024-03-01 10:00'), 'date_completed': None, 'status': 0},
+            {'id': 2, 'date_added': to_epoch('2024-03-02 11:30'), 'date_completed': to_epoch('2024-03-05 08:15'),
+             'status': 1},
+            {'id': 4, 'date_added': to_epoch('2024-02-01 09:00'), 'date_completed': None, 'status': 0},
+        ])
+
+        # New rows are stored as integers, and AUTOINCREMENT does not reuse the id of the deleted todo
+        todo_srv.add_todo(manager, Todo('New task'))
+        new_row = manager._execute_query(
+            "SELECT id, typeof(date_added), typeof(status) FROM todos WHERE task = 'New task'", fetch_mode=True,
+            row_factory=tuple_rows
+        )
+        self.assertEqual(new_row, [(6, 'integer', 'integer')])
+        newest_first = [todo.task for todo in todo_srv.query_todos(manager, row_factory=todo_srv.TODO_MODEL_ROWS)]
+        self.assertEqual(newest_first, ['New task', 'Read a book', 'Buy milk', 'Fix the bike'])
+        self.assertEqual(len(todo_srv.query_todos(manager, added_between=(to_epoch('2024-02-15 00:00'), None))), 3)
+        self.assertEqual(todo_srv.search_todos(manager, 'bike')[0]['id'], 4)
+        self.assertEqual(todo_srv.purge_done_todos(manager, older_than=int(time.time())), 1)
+        self.assertEqual(todo_srv.query_todos(manager, status=Status.DONE), [])
+        manager.close()
+
+    def test_user_lookup_uses_indexes(self):
+        manager = DatabaseManager('users', self.temp_dir.name)
+        plan = manager.explain(manager.statements.exists('users', ('username', 'email'), match_any=True), ['a', 'b'])
+
+        self.assertTrue(plan)
+        self.assertFalse(any(step.startswith('SCAN users') for step in plan), plan)
+        manager.close()
+
+    def test_shared_database_lists_user_todos_by_index(self):
+        manager = DatabaseManager(
+            'app', self.temp_dir.name, tables=('users', 'todos'), settings=ConnectionSettings(foreign_keys=True)
+        )
+        plan = manager.explain('SELECT * FROM todos WHERE user_id = ? ORDER BY id', [1])
+
+        self.assertIn('idx_todos_user_id', ' '.join(plan))
+        self.assertNotIn('USE TEMP B-TREE', ' '.join(plan))
+        with self.assertRaises(DatabaseError):
+            manager.insert_row('todos', {'task': 'orphan', 'date_added': 0, 'user_id': 99})
+        manager.close()
+
+    def test_explain_reports_errors(self):
+        manager = DatabaseManager('todos', self.temp_dir.name)
+        with self.assertRaises(DatabaseError):
+            manager.explain('SELECT * FROM missing')
+        manager.close()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
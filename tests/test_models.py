@@ -0,0 +1,39 @@
+import unittest
+
+from model.todo_model import Category, Status, Todo, to_epoch
+from model.user_model import User
+
+
+class TestTodoModel(unittest.TestCase):
+    def test_row_round_trip(self):
+        todo = Todo('Read', Category.READING, 1735725600, None, Status.DONE, 7, user_id=3)
+        row = todo.to_row()
+
+        self.assertEqual(row, (7, 'Read', 'READING', 1735725600, None, 1, 3))
+        self.assertEqual(Todo.from_row(row).to_row(), row)
+
+    def test_from_row_accepts_legacy_text_values(self):
+        todo = Todo.from_row((1, 'Shop', 'SHOPPING', '2025-01-02 10:00', '1735812000', 'UNDONE', None))
+
+        self.assertEqual(todo.date_added, to_epoch('2025-01-02 10:00'))
+        self.assertEqual(todo.date_completed, 1735812000)
+        self.assertIs(todo.status, Status.UNDONE)
+        self.assertIs(Todo.from_row((2, 'x', 'BACKLOG', 1, None, '1', None)).status, Status.DONE)
+
+    def test_defaults_and_slots(self):
+        todo = Todo('Run')
+        self.assertIsInstance(todo.date_added, int)
+        self.assertFalse(hasattr(todo, '__dict__'))
+
+
+class TestUserModel(unittest.TestCase):
+    def test_row_round_trip(self):
+        user = User.from_row((3, 'a@example.com', 'alice', '+100', 30))
+
+        self.assertEqual((user.id, user.username), (3, 'alice'))
+        self.assertEqual(user.to_row(), (3, 'a@example.com', 'alice', '+100', 30))
+        self.assertFalse(hasattr(user, '__dict__'))
+
+
+if __name__ == '__main__':
+    unittest.main()
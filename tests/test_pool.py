@@ -0,0 +1,140 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from lazy_orm.db_manager import DatabaseManager
+from lazy_orm.pool import ConnectionPool, ConnectionSettings, PoolTimeoutError, RetryPolicy
+
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.database_path = os.path.join(self.temp_dir.name, 'pool.db')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_connections_use_configured_pragmas(self):
+        pool = ConnectionPool(self.database_path, settings=ConnectionSettings(synchronous='OFF', cache_size=-1024))
+        with pool.connection() as connection:
+            self.assertEqual(connection.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+            self.assertEqual(connection.execute('PRAGMA synchronous').fetchone()[0], 0)
+            self.assertEqual(connection.execute('PRAGMA cache_size').fetchone()[0], -1024)
+        pool.close()
+
+    def test_nested_checkout_on_one_thread_reuses_the_connection(self):
+        pool = ConnectionPool(self.database_path, pool_size=1)
+        with pool.connection() as outer, pool.connection() as inner:
+            self.assertIs(outer, inner)
+        self.assertEqual(pool.stats().checkouts, 1)
+        pool.close()
+
+    def test_threads_wait_for_a_free_connection(self):
+        pool = ConnectionPool(self.database_path, pool_size=1)
+        held, waited = threading.Event(), []
+
+        def worker():
+            held.wait()
+            with pool.connection():
+                waited.append(True)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        with pool.connection():
+            held.set()
+            thread.join(timeout=0.1)
+        thread.join()
+
+        stats = pool.stats()
+        self.assertEqual(waited, [True])
+        self.assertEqual((stats.checkouts, stats.waits, stats.created), (2, 1, 1))
+        self.assertGreater(stats.wait_time_seconds, 0)
+        pool.close()
+
+    def test_checkout_timeout(self):
+        pool = ConnectionPool(self.database_path, pool_size=1, checkout_timeout=0.01)
+        errors = []
+
+        def worker():
+            try:
+                pool.acquire()
+            except PoolTimeoutError as error:
+                errors.append(error)
+
+        with pool.connection():
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+        self.assertEqual(len(errors), 1)
+        pool.close()
+
+    def test_retry_policy_retries_only_busy_errors(self):
+        attempts = []
+
+        def locked():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise sqlite3.OperationalError('database is locked')
+            return 'ok'
+
+        def broken():
+            attempts.append(1)
+            raise sqlite3.OperationalError('no such table: items')
+
+        self.assertEqual(RetryPolicy(attempts=3, backoff_seconds=0).call(locked), 'ok')
+        self.assertEqual(len(attempts), 3)
+        with self.assertRaises(sqlite3.OperationalError):
+            RetryPolicy(attempts=3, backoff_seconds=0).call(broken)
+        self.assertEqual(len(attempts), 4)
+
+
+class TestDatabaseManagerThreads(unittest.TestCase):
+    def test_manager_is_shared_between_threads(self):
+        with tempfile.TemporaryDirectory() as db_dir:
+            manager = DatabaseManager('items', db_dir, pool_size=4)
+            manager._execute_query('CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)')
+            manager.insert_rows('items', ({'name': f'item-{i}'} for i in range(100)))
+
+            counts = []
+            threads = [threading.Thread(target=lambda: counts.append(manager.get_row_count('items')))
+                       for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(counts, [100] * 8)
+            self.assertLessEqual(manager.pool_stats().created, 4)
+            manager.close()
+
+    def test_busy_commit_is_retried_without_running_the_write_again(self):
+        with tempfile.TemporaryDirectory() as db_dir:
+            manager = DatabaseManager(
+                'items', db_dir, settings=ConnectionSettings(journal_mode='DELETE', busy_timeout_ms=100),
+                retry_policy=RetryPolicy(attempts=4, backoff_seconds=0.05)
+            )
+            manager._execute_query('CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)')
+            attempts = []
+            manager.add_query_hook(lambda event: attempts.append(event.error))
+
+            # A reader holding its shared lock makes the writer's COMMIT fail with "database is locked"
+            reader = sqlite3.connect(os.path.join(db_dir, 'items'), check_same_thread=False)
+            reader.execute('BEGIN')
+            reader.execute('SELECT * FROM items').fetchall()
+            release = threading.Timer(0.25, reader.rollback)
+            release.start()
+            try:
+                manager.insert_row('items', {'name': 'once'})
+            finally:
+                release.join()
+                reader.close()
+
+            self.assertEqual(attempts, [None])
+            self.assertEqual(manager.fetch_rows_if('items', '1 = 1', ['name'], use_cache=False), [{'name': 'once'}])
+            manager.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
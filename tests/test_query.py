@@ -0,0 +1,113 @@
+import tempfile
+import unittest
+
+from lazy_orm.cache import QueryCache
+from lazy_orm.db_manager import DatabaseManager
+from lazy_orm.row_factories import tuple_rows
+
+
+class TestQuerySet(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manager = DatabaseManager('items', self.temp_dir.name, query_cache=QueryCache())
+        self.manager._execute_query(
+            'CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT NOT NULL, size INTEGER, kind TEXT)'
+        )
+        self.manager._execute_query('CREATE INDEX items_by_kind ON items (kind, size)')
+        self.manager.insert_rows('items', [
+            {'name': f'item {i}', 'size': i if i % 4 else None, 'kind': 'a' if i % 2 else 'b'} for i in range(1, 11)
+        ])
+        self.items = self.manager.table('items')
+
+    def ids(self, query):
+        return [row[0] for row in query.only('id').row_factory(tuple_rows)]
+
+    def test_nothing_runs_until_the_query_is_evaluated(self):
+        statements = []
+        self.manager.add_query_hook(lambda event: statements.append(event.query))
+
+        query = self.items.where(kind='a').order_by('-size').only('id', 'name').limit(2)
+        self.assertEqual(statements, [])
+        self.assertEqual(query.fetch(), [{'id': 9, 'name': 'item 9'}, {'id': 7, 'name': 'item 7'}])
+        self.assertEqual(statements, ['SELECT id, name FROM items WHERE kind = ? ORDER BY size DESC LIMIT ?'])
+
+    def test_chaining_leaves_the_source_unchanged(self):
+        kind_a = self.items.where(kind='a')
+        kind_a.where(size__gt=5)
+        kind_a.order_by('-id')[:1]
+
+        self.assertEqual(self.ids(kind_a), [1, 3, 5, 7, 9])
+
+    def test_lookups(self):
+        self.assertEqual(self.ids(self.items.where(size__gte=3, size__lt=7)), [3, 5, 6])
+        self.assertEqual(self.ids(self.items.where(size=None)), [4, 8])
+        self.assertEqual(self.ids(self.items.where(size__ne=None, kind__ne='a')), [2, 6, 10])
+        self.assertEqual(self.ids(self.items.where(id__in=[3, 1, 99])), [1, 3])
+        self.assertEqual(self.ids(self.items.where(id__in=[])), [])
+        self.assertEqual(self.ids(self.items.where('size = ? OR name = ?', 2, 'item 3').where(kind='b')), [2])
+        self.assertEqual(self.ids(self.items.where_any(size=2, name='item 3').where(kind='b')), [2])
+        with self.assertRaises(ValueError):
+            self.items.where(size__like='1%')
+        with self.assertRaises(ValueError):
+            self.items.where(size__lt=None)
+
+    def test_slices_compose_and_indexes_fetch_one_row(self):
+        ordered = self.items.order_by('id')
+
+        self.assertEqual(self.ids(ordered[2:6][1:3]), [4, 5])
+        self.assertEqual(self.ids(ordered[8:]), [9, 10])
+        self.assertEqual(self.ids(ordered.limit(3)[1:10]), [2, 3])
+        self.assertEqual(self.ids(ordered[5:2]), [])
+        self.assertEqual(ordered[3]['name'], 'item 4')
+        self.assertEqual(ordered.where(kind='c').first(), None)
+        with self.assertRaises(IndexError):
+            ordered[10]
+        with self.assertRaises(ValueError):
+            ordered[-1]
+
+    def test_count_and_exists_do_not_fetch_rows(self):
+        statements = []
+        self.manager.add_query_hook(lambda event: statements.append(event.query))
+
+        self.assertEqual(self.items.where(kind='a').count(), 5)
+        self.assertEqual(self.items.where(kind='a')[3:10].count(), 2)
+        self.assertTrue(self.items.where(kind='b')[4:].exists())
+        self.assertFalse(self.items.where(kind='b')[5:].exists())
+        # The sliced count is computed from the cached total
+        self.assertEqual(statements, [
+            'SELECT COUNT(*) AS row_count FROM items WHERE kind = ?',
+            'SELECT 1 FROM items WHERE kind = ? LIMIT 1 OFFSET ?',
+            'SELECT 1 FROM items WHERE kind = ? LIMIT 1 OFFSET ?',
+        ])
+        self.assertEqual(self.items.limit(0).count(), 0)
+
+    def test_values_and_count_by(self):
+        self.assertEqual(self.items.where(id=1).row_factory(tuple_rows).values('name').fetch(), [{'name': 'item 1'}])
+        self.assertEqual(self.items.where(size__gt=5).count_by('kind'), {'a': 2, 'b': 2})
+
+    def test_update_and_delete_invalidate_the_cache(self):
+        kind_b = self.items.where(kind='b')
+        self.assertEqual(kind_b.count(), 5)
+
+        self.assertEqual(kind_b.where(size=None).update(size=0), 2)
+        self.assertEqual(self.items.where(size=0).count(), 2)
+        self.assertEqual(kind_b.delete(), 5)
+        self.assertEqual(kind_b.count(), 0)
+        with self.assertRaises(ValueError):
+            self.items[:1].delete()
+
+    def test_queries_use_the_indexes(self):
+        plan = self.items.where(kind='a', size__gt=3).only('id').explain()
+        self.assertTrue(any('items_by_kind' in step for step in plan), plan)
+
+    def test_truth_value_is_ambiguous(self):
+        with self.assertRaises(TypeError):
+            bool(self.items)
+
+    def tearDown(self):
+        self.manager.close()
+        self.temp_dir.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import sqlite3
+import tempfile
+import unittest
+
+from lazy_orm.db_manager import DatabaseManager
+from lazy_orm.row_factories import dict_rows, model_rows, namedtuple_rows, sqlite_rows, tuple_rows
+from model.todo_model import Category, Status
+from service.todo_srv import TODO_COLUMNS, TODO_MODEL_ROWS, TODOS_TABLE
+
+
+class TestRowFactories(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manager = DatabaseManager(TODOS_TABLE, self.temp_dir.name)
+        with open('SQL/create_todos_db.sql') as script_file, self.manager.connection() as connection:
+            connection.executescript(script_file.read())
+        self.manager.insert_rows(TODOS_TABLE, [
+            {'task': 'Read', 'category': 'READING', 'date_added': 1735725600, 'status': Status.DONE.value},
+            {'task': 'Shop', 'category': 'SHOPPING', 'date_added': 1735812000, 'status': Status.UNDONE.value},
+        ])
+
+    def fetch(self, row_factory):
+        return self.manager.fetch_all_rows(TODOS_TABLE, ['id', 'task'], row_factory)
+
+    def test_representations(self):
+        self.assertEqual(self.fetch(None), [{'id': 1, 'task': 'Read'}, {'id': 2, 'task': 'Shop'}])
+        self.assertEqual(self.fetch(dict_rows)[0], {'id': 1, 'task': 'Read'})
+        self.assertEqual(self.fetch(tuple_rows), [(1, 'Read'), (2, 'Shop')])
+
+        row = self.fetch(sqlite_rows)[1]
+        self.assertIsInstance(row, sqlite3.Row)
+        self.assertEqual((row['task'], row[0]), ('Shop', 2))
+
+        first, second = self.fetch(namedtuple_rows)
+        self.assertEqual((first.id, first.task), (1, 'Read'))
+        self.assertIs(type(first), type(second))
+
+        self.assertEqual(self.fetch(model_rows(lambda row: row[1].upper())), ['READ', 'SHOP'])
+
+    def test_manager_default_factory(self):
+        self.manager.row_factory = tuple_rows
+        self.assertEqual(self.manager.fetch_rows_where(TODOS_TABLE, {'task': 'Shop'}, ['id']), [(2,)])
+        self.assertEqual(self.manager.get_row_count(TODOS_TABLE), 2)
+
+    def test_todo_model_hydration(self):
+        todos = self.manager.fetch_all_rows(TODOS_TABLE, TODO_COLUMNS, TODO_MODEL_ROWS)
+        self.assertEqual([(todo._id, todo.category, todo.status) for todo in todos],
+                         [(1, Category.READING, Status.DONE), (2, Category.SHOPPING, Status.UNDONE)])
+
+    def tearDown(self):
+        self.manager.close()
+        self.temp_dir.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,237 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from lazy_orm.db_manager import DatabaseError, DatabaseManager
+from lazy_orm.pool import ConnectionSettings
+from model.todo_model import Category, Status, Todo
+from service import todo_srv, user_srv
+
+
+class TestTodoService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manager = DatabaseManager(todo_srv.TODOS_TABLE, self.temp_dir.name)
+
+    def test_add_todo_reports_created_or_existing(self):
+        self.assertEqual(todo_srv.add_todo(self.manager, Todo('Read', Category.READING)), 'Todo added successfully.')
+        self.assertEqual(todo_srv.add_todo(self.manager, Todo('Read', Category.READING)), 'Todo already exists!')
+        self.assertEqual(todo_srv.add_todo(self.manager, Todo('Read', Category.BACKLOG)), 'Todo added successfully.')
+
+    def test_duplicates_do_not_use_up_ids(self):
+        todo_srv.add_todo(self.manager, Todo('Read', Category.READING))
+        for _ in range(3):
+            self.assertEqual(todo_srv.add_todo(self.manager, Todo('Read', Category.READING)), 'Todo already exists!')
+        self.assertEqual(todo_srv.insert_todos(self.manager, [Todo('Read', Category.READING), Todo('Shop')]), [None, 2])
+        todo_srv.add_todo(self.manager, Todo('Cook'))
+        self.assertEqual([todo['id'] for todo in todo_srv.query_todos(self.manager)], [3, 2, 1])
+
+    def test_additions_inside_a_transaction_roll_back_together(self):
+        with self.assertRaises(ValueError):
+            with self.manager.transaction() as transaction:
+                todo_srv.add_todo(transaction, Todo('Read', Category.READING))
+                todo_srv.add_todos(transaction, [Todo('Shop', Category.SHOPPING)])
+                raise ValueError('abandon the unit of work')
+
+        self.assertEqual(self.manager.get_row_count(todo_srv.TODOS_TABLE), 0)
+
+    def test_failed_write_returns_none_alone_and_raises_inside_a_transaction(self):
+        todo_srv.add_todo(self.manager, Todo('Read', Category.READING))
+        with patch.object(DatabaseManager, 'delete_rows', side_effect=DatabaseError('disk I/O error')):
+            with self.assertLogs(todo_srv.__name__, 'ERROR'):
+                self.assertIsNone(todo_srv.delete_todos(self.manager, [1]))
+
+            with self.assertRaises(DatabaseError):
+                with self.manager.transaction() as transaction:
+                    todo_srv.add_todo(transaction, Todo('Shop', Category.SHOPPING))
+                    todo_srv.delete_todos(transaction, [1])
+
+        self.assertEqual(self.manager.get_row_count(todo_srv.TODOS_TABLE), 1)
+
+    def test_query_todos_filters_sorts_and_paginates(self):
+        todo_srv.insert_todos(self.manager, [
+            Todo('a', Category.SHOPPING, date_added=100),
+            Todo('b', Category.SHOPPING, date_added=300, status=Status.DONE),
+            Todo('c', Category.SHOPPING, date_added=200),
+            Todo('d', Category.READING, date_added=400),
+        ])
+
+        def tasks(**filters):
+            return [row['task'] for row in todo_srv.query_todos(self.manager, **filters)]
+
+        self.assertEqual(tasks(), ['d', 'b', 'c', 'a'])
+        self.assertEqual(tasks(status=Status.UNDONE, category=Category.SHOPPING), ['c', 'a'])
+        self.assertEqual(tasks(added_between=(200, 400), order_by=['date_added']), ['c', 'b'])
+        self.assertEqual(tasks(order_by=['task'], limit=2, offset=1), ['b', 'c'])
+        self.assertEqual(tasks(offset=3), ['a'])
+        with self.assertRaises(ValueError):
+            tasks(order_by=['-priority'])
+
+    def test_iter_todo_pages_streams_filtered_keyset_pages(self):
+        todo_srv.insert_todos(self.manager, [
+            Todo(f'Task {i}', Category.READING if i % 2 else Category.SHOPPING, date_added=i) for i in range(1, 11)
+        ])
+
+        def pages(**options):
+            return [[row['id'] for row in page] for page in todo_srv.iter_todo_pages(self.manager, **options)]
+
+        self.assertEqual(pages(page_size=4), [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10]])
+        self.assertEqual(pages(category=Category.READING, page_size=2, limit=3), [[1, 3], [5]])
+        self.assertEqual(pages(added_between=(4, 8), page_size=2, after_id=4), [[5, 6], [7]])
+        self.assertEqual(pages(status=Status.DONE), [])
+        self.assertEqual([todo.task for page in todo_srv.iter_todo_pages(
+            self.manager, page_size=3, limit=3, row_factory=todo_srv.TODO_MODEL_ROWS
+        ) for todo in page], ['Task 1', 'Task 2', 'Task 3'])
+
+    def test_todo_stats(self):
+        self.assertEqual(todo_srv.todo_stats(self.manager)['completion_rate'], 0.0)
+        todo_srv.insert_todos(self.manager, [
+            Todo('a', Category.SHOPPING), Todo('b', Category.SHOPPING, status=Status.DONE), Todo('c', Category.READING),
+        ])
+
+        stats = todo_srv.todo_stats(self.manager)
+        self.assertEqual(stats['total'], 3)
+        self.assertEqual(stats['by_status'], {Status.UNDONE: 2, Status.DONE: 1})
+        self.assertEqual((stats['by_category'][Category.SHOPPING], stats['by_category'][Category.BIRTHDAY]), (2, 0))
+        self.assertAlmostEqual(stats['completion_rate'], 1 / 3)
+
+    def test_single_task_edits_report_whether_a_row_changed(self):
+        todo_srv.add_todo(self.manager, Todo('Read 50% of it', Category.READING))
+
+        self.assertTrue(todo_srv.rename_todo(self.manager, 1, 'Read half_of it'))
+        self.assertTrue(todo_srv.complete_todo(self.manager, 1))
+        self.assertFalse(todo_srv.complete_todo(self.manager, 1))
+        self.assertEqual([row['task'] for row in todo_srv.search_todos(self.manager, 'half_')], ['Read half_of it'])
+        self.assertEqual(todo_srv.search_todos(self.manager, '50%'), [])
+        self.assertTrue(todo_srv.delete_todo(self.manager, 1))
+        self.assertFalse(todo_srv.rename_todo(self.manager, 1, 'Gone'))
+
+    def test_search_ranks_filters_and_follows_edits(self):
+        todo_srv.insert_todos(self.manager, [
+            Todo('Buy milk', Category.SHOPPING), Todo('Milk the milk cow', Category.BACKLOG),
+            Todo('Read about milky way', Category.READING), Todo('Café au lait', Category.SHOPPING),
+        ])
+
+        matches = todo_srv.search_todos(self.manager, 'milk', row_factory=todo_srv.TODO_MATCH_ROWS)
+        self.assertEqual([todo.task for todo, _ in matches][0], 'Milk the milk cow')
+        self.assertEqual(len(matches), 3)
+        self.assertEqual(matches[0][1], '«Milk» the «milk» cow')
+        self.assertEqual([row['task'] for row in todo_srv.search_todos(self.manager, 'MILK', Category.SHOPPING)],
+                         ['Buy milk'])
+        self.assertEqual([row['task'] for row in todo_srv.search_todos(self.manager, 'cafe')], ['Café au lait'])
+        self.assertEqual(todo_srv.search_todos(self.manager, '" OR *'), [])
+
+        todo_srv.rename_todo(self.manager, 1, 'Buy oat drink')
+        todo_srv.complete_todo(self.manager, 2)
+        self.assertEqual(todo_srv.search_todos(self.manager, 'milk', status=Status.UNDONE, limit=5)[0]['task'],
+                         'Read about milky way')
+        todo_srv.delete_todo(self.manager, 3)
+        self.assertEqual(todo_srv.search_todos(self.manager, 'milk', status=Status.UNDONE), [])
+        self.assertEqual(todo_srv.search_todos(self.manager, 'oat')[0]['id'], 1)
+
+    def test_bulk_completion_and_purge(self):
+        todo_srv.insert_todos(self.manager, [Todo(f'Task {i}') for i in range(6)], chat_id=1)
+        todo_srv.add_todo(self.manager, Todo('Other chat'), chat_id=2)
+
+        self.assertEqual(todo_srv.complete_todos(self.manager, [1, 2, 3, 7], chat_id=1), 3)
+        self.assertEqual(todo_srv.complete_todos(self.manager, [3, 4]), 1)
+        self.assertEqual(todo_srv.purge_done_todos(self.manager, older_than=0), 0)
+        self.assertEqual(todo_srv.purge_done_todos(self.manager, chat_id=1), 4)
+        self.assertEqual(todo_srv.delete_todos(self.manager, [5, 7]), 2)
+        self.assertEqual([row['id'] for row in todo_srv.query_todos(self.manager)], [6])
+
+    def test_todo_from_record(self):
+        todo = todo_srv.todo_from_record({'task': ' Shop ', 'category': 'shopping', 'status': 'done', 'date_added': ''})
+        self.assertEqual((todo.task, todo.category, todo.status), ('Shop', Category.SHOPPING, Status.DONE))
+        for record in ({'category': 'READING'}, {'task': 'Read', 'category': 'NOVELS'}, {'task': 'Read', 'status': 7}):
+            with self.subTest(record=record), self.assertRaises(ValueError):
+                todo_srv.todo_from_record(record)
+
+    def test_insert_todos_returns_per_row_outcomes(self):
+        todo_srv.add_todo(self.manager, Todo('Shop', Category.SHOPPING))
+        outcomes = todo_srv.insert_todos(self.manager, [
+            Todo('Read', Category.READING), Todo('Shop', Category.SHOPPING), Todo('Read', Category.READING),
+        ])
+
+        self.assertIsInstance(outcomes[0], int)
+        self.assertEqual(outcomes[1:], [None, None])
+        self.assertEqual(self.manager.get_row_count(todo_srv.TODOS_TABLE), 2)
+
+    def tearDown(self):
+        self.manager.close()
+        self.temp_dir.cleanup()
+
+
+class TestSharedDatabase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manager = DatabaseManager(
+            'app', self.temp_dir.name, tables=(user_srv.USERS_TABLE, todo_srv.TODOS_TABLE),
+            settings=ConnectionSettings(foreign_keys=True)
+        )
+
+    def test_user_todos(self):
+        with self.manager.transaction():
+            user_id = self.manager.insert_or_ignore(user_srv.USERS_TABLE, {'username': 'a', 'email': 'a@x', 'age': 1})
+            todo_srv.add_todos(self.manager, [Todo('Read', user_id=user_id), Todo('Shop', user_id=user_id)])
+            todo_srv.add_todo(self.manager, Todo('Other'))
+
+        todos = todo_srv.get_user_todos(self.manager, user_id, todo_srv.TODO_MODEL_ROWS)
+        self.assertEqual([todo.task for todo in todos], ['Read', 'Shop'])
+
+        self.manager.delete_row(user_srv.USERS_TABLE, user_id)
+        self.assertEqual(todo_srv.get_user_todos(self.manager, user_id), [])
+
+    def tearDown(self):
+        self.manager.close()
+        self.temp_dir.cleanup()
+
+
+@patch.object(user_srv, 'validate_and_normalize_email', str.lower)
+@patch('utils.email.CHECK_DELIVERABILITY', False)
+class TestUserService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manager = DatabaseManager(user_srv.USERS_TABLE, self.temp_dir.name)
+
+    def test_add_user_reports_created_or_existing(self):
+        self.assertEqual(user_srv.add_user(self.manager, 'alice', 'a@example.com', 30), 'User added successfully.')
+        self.assertEqual(user_srv.add_user(self.manager, 'alice', 'b@example.com', 30), 'User already exists!')
+        self.assertEqual(user_srv.add_user(self.manager, 'bob', 'A@example.com', 30), 'User already exists!')
+
+    def test_add_users_summarizes_outcomes(self):
+        result = user_srv.add_users(self.manager, [
+            {'username': 'alice', 'email': 'a@example.com', 'age': 30},
+            {'username': 'alice', 'email': 'c@example.com', 'age': 31},
+            {'username': 'bob', 'email': 'b@example.com', 'age': 40},
+        ])
+        self.assertEqual(result, '2 users added successfully, 1 already existed.')
+
+    def test_add_users_skips_invalid_emails_and_adds_the_rest(self):
+        result = user_srv.add_users(self.manager, [
+            {'username': 'alice', 'email': 'a@', 'age': 30},
+            {'username': 'bob', 'email': 'B@Example.com', 'age': 40},
+            {'username': 'carol', 'email': 'carol', 'age': 50},
+        ])
+        self.assertEqual(result, '1 users added successfully, 0 already existed, 2 had an invalid email.')
+        users = self.manager.fetch_rows_if(user_srv.USERS_TABLE, '1 = 1', ['username', 'email'], use_cache=False)
+        self.assertEqual(users, [{'username': 'bob', 'email': 'b@example.com'}])
+
+    def test_insert_users_rejects_the_batch_naming_every_invalid_email(self):
+        with self.assertRaises(user_srv.EmailNotValidError) as raised:
+            user_srv.insert_users(self.manager, [
+                {'username': 'alice', 'email': 'a@', 'age': 30},
+                {'username': 'bob', 'email': 'B@Example.com', 'age': 40},
+                {'username': 'carol', 'email': 'carol', 'age': 50},
+            ])
+        self.assertIn('2 invalid emails: a@:', str(raised.exception))
+        self.assertIn('carol:', str(raised.exception))
+        self.assertEqual(self.manager.get_row_count(user_srv.USERS_TABLE), 0)
+
+    def tearDown(self):
+        self.manager.close()
+        self.temp_dir.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import tempfile
+import unittest
+
+from lazy_orm.db_manager import DatabaseManager
+from lazy_orm.statements import StatementBuilder
+
+
+class TestStatementBuilder(unittest.TestCase):
+    def test_statements_are_parameterized(self):
+        builder = StatementBuilder()
+        self.assertEqual(builder.insert('users', ('username', 'email')),
+                         'INSERT INTO users (username, email) VALUES (?, ?)')
+        self.assertEqual(builder.exists('users', ('username', 'email'), match_any=True),
+                         'SELECT 1 FROM users WHERE username = ? OR email = ? LIMIT 1')
+        self.assertEqual(builder.update('todos', ('status',), ('id',)), 'UPDATE todos SET status = ? WHERE id = ?')
+        self.assertEqual(builder.count('todos'), 'SELECT COUNT(*) AS row_count FROM todos')
+        self.assertEqual(builder.count('todos', group_by=['status'], condition='date_added >= ?'),
+                         'SELECT status, COUNT(*) AS row_count FROM todos WHERE date_added >= ? GROUP BY status')
+        self.assertEqual(builder.select('todos', ['id'], ['status'], order_by=['-date_added', 'id'], limit=True),
+                         'SELECT id FROM todos WHERE status = ? ORDER BY date_added DESC, id LIMIT ?')
+
+    def test_insert_checks_unique_keys_before_drawing_an_id(self):
+        self.assertEqual(
+            StatementBuilder().insert('users', ('username', 'email', 'age'), True, [['username'], ['email']]),
+            'INSERT INTO users (username, email, age) SELECT ?1, ?2, ?3 WHERE NOT EXISTS '
+            '(SELECT 1 FROM users WHERE (username = ?1) OR (email = ?2)) ON CONFLICT DO NOTHING'
+        )
+        with self.assertRaises(ValueError):
+            StatementBuilder().insert('users', ('username',), True, [['email']])
+
+    def test_repeated_statements_hit_the_cache(self):
+        builder = StatementBuilder()
+        first = builder.select('todos', ['id', 'task'], ['category'])
+        second = builder.select('todos', ('id', 'task'), ('category',))
+
+        self.assertIs(first, second)
+        stats = builder.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.size), (1, 1, 1))
+
+    def test_least_recently_used_statement_is_evicted(self):
+        builder = StatementBuilder(cache_size=2)
+        builder.count('a')
+        builder.count('b')
+        builder.count('a')
+        builder.count('c')
+        builder.count('b')
+        self.assertEqual(builder.stats().misses, 4)
+
+    def test_identifiers_are_validated(self):
+        with self.assertRaises(ValueError):
+            StatementBuilder().insert('users', ['name); DROP TABLE users; --'])
+
+    def test_comparisons_only_accept_known_operators(self):
+        builder = StatementBuilder()
+        self.assertEqual(builder.comparison('date_completed', 'IS NOT'), 'date_completed IS NOT ?')
+        self.assertEqual(builder.exists('todos', condition='status = ?', offset=True),
+                         'SELECT 1 FROM todos WHERE status = ? LIMIT 1 OFFSET ?')
+        with self.assertRaises(ValueError):
+            builder.comparison('status', '= 1 OR 1 =')
+
+
+class TestParameterizedLookups(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manager = DatabaseManager('people', self.temp_dir.name)
+        self.manager._execute_query('CREATE TABLE people (id INTEGER PRIMARY KEY, username TEXT, email TEXT)')
+        self.manager.insert_row('people', {'username': 'O"Brien', 'email': "o'brien@example.com"})
+
+    def test_row_exists_binds_values(self):
+        self.assertTrue(self.manager.row_exists('people', {'username': 'O"Brien'}))
+        self.assertTrue(self.manager.row_exists('people', {'username': 'x', 'email': "o'brien@example.com"},
+                                                match_any=True))
+        self.assertFalse(self.manager.row_exists('people', {'username': '" OR "1"="1'}))
+
+    def test_fetch_rows_where_and_params(self):
+        self.assertEqual(self.manager.fetch_rows_where('people', {'username': 'O"Brien'}, ['id']), [{'id': 1}])
+        self.manager.update_rows('people', {'email': 'new@example.com'}, 'id = ?', [1])
+        self.assertEqual(self.manager.fetch_rows_if('people', 'email = ?', ['id'], ['new@example.com']), [{'id': 1}])
+
+    def test_wildcard_column_list_selects_every_column(self):
+        everything = [{'id': 1, 'username': 'O"Brien', 'email': "o'brien@example.com"}]
+        self.assertEqual(self.manager.fetch_all_rows('people', [DatabaseManager.SQL_WILDCARD_ALL_COLUMNS]), everything)
+        self.assertEqual(self.manager.fetch_rows_if('people', 'id = ?', ['*'], [1]), everything)
+        self.assertEqual(self.manager.table('people').only('*').fetch(), everything)
+
+    def tearDown(self):
+        self.manager.close()
+        self.temp_dir.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
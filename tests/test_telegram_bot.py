@@ -0,0 +1,174 @@
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from aiogram.filters import CommandObject
+from aiogram.types import CallbackQuery, Message
+
+from lazy_orm.async_db_manager import AsyncDatabaseManager
+from service.app_db import APP_DB_NAME, APP_SETTINGS, APP_TABLES
+from telegram_bot import handlers
+from telegram_bot.chat_cache import ChatCache
+from telegram_bot.throttling import ThrottlingMiddleware
+
+
+def _message(chat_id):
+    message = MagicMock()
+    message.chat.id = chat_id
+    message.answer = AsyncMock()
+    return message
+
+
+def _command(name, args=None):
+    return CommandObject(prefix='/', command=name, args=args)
+
+
+class TestChatCache(unittest.IsolatedAsyncioTestCase):
+    async def test_invalidation_is_per_chat(self):
+        cache = ChatCache()
+        load = AsyncMock(side_effect=['one', 'two', 'three'])
+
+        self.assertEqual(await cache.get_or_load(1, 'list', load), 'one')
+        self.assertEqual(await cache.get_or_load(2, 'list', load), 'two')
+        cache.invalidate(1)
+        self.assertEqual(await cache.get_or_load(2, 'list', load), 'two')
+        self.assertEqual(await cache.get_or_load(1, 'list', load), 'three')
+        self.assertEqual(cache.stats().hits, 1)
+
+    async def test_values_of_another_revision_are_loaded_again(self):
+        cache = ChatCache()
+        load = AsyncMock(side_effect=['one', 'two', 'three'])
+        revision = AsyncMock(side_effect=[1, 1, 2, None])
+
+        self.assertEqual(await cache.get_or_load(1, 'list', load, revision), 'one')
+        self.assertEqual(await cache.get_or_load(1, 'list', load, revision), 'one')
+        self.assertEqual(await cache.get_or_load(1, 'list', load, revision), 'two')
+        self.assertEqual(await cache.get_or_load(1, 'list', load, revision), 'three')
+
+
+class TestThrottlingMiddleware(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.middleware = ThrottlingMiddleware(rate=1.0, burst=2, coalesce_seconds=1.0, clock=lambda: self.now)
+        self.handler = AsyncMock(return_value='handled')
+
+    async def send(self, text, chat_id=1, user_id=1, media_group_id=None):
+        event = MagicMock(spec=Message, text=text, media_group_id=media_group_id)
+        data = {'event_chat': MagicMock(id=chat_id), 'event_from_user': MagicMock(id=user_id)}
+        return await self.middleware(self.handler, event, data)
+
+    async def test_repeated_updates_are_coalesced(self):
+        self.assertEqual(await self.send('/list'), 'handled')
+        self.assertIsNone(await self.send('/list'))
+        self.assertEqual(await self.send('/list', chat_id=2), 'handled')
+        self.assertEqual(await self.send('photo', media_group_id='album'), 'handled')
+        self.assertIsNone(await self.send('other photo', media_group_id='album'))
+
+        self.now += 1.5
+        self.assertEqual(await self.send('/list'), 'handled')
+        self.assertEqual(self.handler.await_count, 4)
+        self.assertEqual(self.middleware.stats().coalesced, 2)
+
+    async def test_the_same_command_of_another_user_in_the_chat_is_handled(self):
+        self.assertEqual(await self.send('/done 3', chat_id=-100, user_id=1), 'handled')
+        self.assertEqual(await self.send('/done 3', chat_id=-100, user_id=2), 'handled')
+        self.assertIsNone(await self.send('/done 3', chat_id=-100, user_id=2))
+        self.assertEqual(self.middleware.stats().coalesced, 1)
+
+    async def test_token_bucket_limits_each_user(self):
+        results = [await self.send(f'/add task {number}') for number in range(4)]
+        self.assertEqual(results, ['handled', 'handled', None, None])
+        self.assertEqual(await self.send('/add task', user_id=2), 'handled')
+
+        self.now += 1.0
+        self.assertEqual(await self.send('/add task 4'), 'handled')
+        self.assertIsNone(await self.send('/add task 5'))
+        self.assertEqual(self.middleware.stats().throttled, 3)
+
+    async def test_dropped_callback_queries_are_answered(self):
+        def press(data):
+            return MagicMock(spec=CallbackQuery, data=data, answer=AsyncMock())
+
+        data = {'event_chat': MagicMock(id=1), 'event_from_user': MagicMock(id=1)}
+        handled, coalesced = press('done:1'), press('done:1')
+        await self.middleware(self.handler, handled, data)
+        await self.middleware(self.handler, coalesced, data)
+        throttled = press('done:2')
+        await self.middleware(self.handler, press('done:3'), data)
+        await self.middleware(self.handler, throttled, data)
+
+        handled.answer.assert_not_awaited()
+        coalesced.answer.assert_awaited_once_with(None)
+        throttled.answer.assert_awaited_once_with(ThrottlingMiddleware.SLOW_DOWN_TEXT)
+
+
+class TestTodoHandlers(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = AsyncDatabaseManager(APP_DB_NAME, self.temp_dir.name, tables=APP_TABLES, settings=APP_SETTINGS)
+        self.chat_cache = ChatCache()
+
+    async def asyncTearDown(self):
+        await self.db.close()
+        self.temp_dir.cleanup()
+
+    async def send(self, handler, chat_id, name, args=None):
+        message = _message(chat_id)
+        await handler(message, _command(name, args), db=self.db, chat_cache=self.chat_cache)
+        return message.answer.await_args.args[0]
+
+    async def stats(self, chat_id):
+        message = _message(chat_id)
+        await handlers.cmd_stats(message, db=self.db, chat_cache=self.chat_cache)
+        return message.answer.await_args.args[0]
+
+    async def test_chats_keep_separate_lists(self):
+        self.assertIn('Todo added successfully.', await self.send(handlers.cmd_add, 1, 'add', 'shopping Buy milk'))
+        self.assertIn('Todo added successfully.', await self.send(handlers.cmd_add, 2, 'add', 'shopping Buy milk'))
+        await self.send(handlers.cmd_add, 2, 'add', 'Call mom')
+
+        self.assertEqual(await self.send(handlers.cmd_list, 1, 'list'), '• 1. Buy milk [shopping]')
+        self.assertEqual(
+            await self.send(handlers.cmd_list, 2, 'list'), '• 3. Call mom [backlog]\n• 2. Buy milk [shopping]'
+        )
+        self.assertEqual(await self.send(handlers.cmd_done, 1, 'done', '2'), 'There is no undone task 2 in this chat.')
+
+    async def test_search_finds_the_chat_todos_by_words(self):
+        await self.send(handlers.cmd_add, 1, 'add', 'shopping Buy oat milk')
+        await self.send(handlers.cmd_add, 2, 'add', 'shopping Buy milk')
+
+        message = _message(1)
+        await handlers.cmd_search(message, _command('search', 'MIL'), db=self.db)
+        self.assertEqual(message.answer.await_args.args[0], '• 1. Buy oat «milk» [shopping]')
+
+    async def test_writes_invalidate_the_cached_list(self):
+        await self.send(handlers.cmd_add, 1, 'add', 'reading Dune')
+        await self.send(handlers.cmd_list, 1, 'list')
+        self.assertEqual(await self.send(handlers.cmd_done, 1, 'done', '1'), 'Task 1 done!')
+
+        self.assertEqual(await self.send(handlers.cmd_list, 1, 'list'), 'Nothing to do. Add a task with /add.')
+        self.assertEqual(await self.send(handlers.cmd_list, 1, 'list', 'all'), '✓ 1. Dune [reading]')
+        self.assertEqual(await self.stats(1), '1 of 1 tasks done (100%)\nreading: 1')
+
+
+    async def test_lists_follow_writes_of_other_bot_processes(self):
+        # Another polling process: its own connections, worker threads and chat cache
+        other_db = AsyncDatabaseManager(APP_DB_NAME, self.temp_dir.name, tables=APP_TABLES, settings=APP_SETTINGS)
+        other_chat_cache = ChatCache()
+        try:
+            await self.send(handlers.cmd_add, 1, 'add', 'reading Dune')
+            self.assertEqual(await self.send(handlers.cmd_list, 1, 'list'), '• 1. Dune [reading]')
+            self.assertEqual(await self.stats(1), '0 of 1 tasks done (0%)\nreading: 1')
+
+            message = _message(1)
+            await handlers.cmd_add(message, _command('add', 'Call mom'), db=other_db, chat_cache=other_chat_cache)
+            await handlers.cmd_done(message, _command('done', '1'), db=other_db, chat_cache=other_chat_cache)
+
+            self.assertEqual(await self.send(handlers.cmd_list, 1, 'list'), '• 2. Call mom [backlog]')
+            self.assertEqual(await self.stats(1), '1 of 2 tasks done (50%)\nbacklog: 1\nreading: 1')
+        finally:
+            await other_db.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,17 +1,109 @@
-from email_validator import validate_email, EmailNotValidError
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from threading import Lock
+from typing import Iterable, List, NamedTuple, Optional, Tuple
 
+from email_validator import EmailNotValidError, caching_resolver, validate_email
 
-def validate_and_normalize_email(email: str) -> str:
+# Whether validation also looks up the domain's mail servers. Set EMAIL_CHECK_DELIVERABILITY=0 for an
+# offline, syntax-only check that never touches the network.
+CHECK_DELIVERABILITY = os.getenv('EMAIL_CHECK_DELIVERABILITY', '1') != '0'
+# Addresses whose outcome, valid or not, is remembered per deliverability mode
+EMAIL_CACHE_SIZE = 100_000
+# Threads validating a batch at once; only deliverability checks wait on DNS, so only they use the pool
+VALIDATION_WORKERS = 16
+DNS_TIMEOUT_SECONDS = 5
+
+_dns_resolver = None
+_dns_resolver_lock = Lock()
+
+
+class EmailCheck(NamedTuple):
+    """The outcome of validating one address: the normalized address, or the reason it is not valid."""
+    email: str
+    normalized: Optional[str]
+    error: Optional[str]
+
+    @property
+    def valid(self) -> bool:
+        return self.error is None
+
+
+def _resolver():
+    # One resolver for every check, so repeated domains are answered from its DNS cache
+    global _dns_resolver
+    with _dns_resolver_lock:
+        if _dns_resolver is None:
+            _dns_resolver = caching_resolver(timeout=DNS_TIMEOUT_SECONDS)
+        return _dns_resolver
+
+
+@lru_cache(maxsize=EMAIL_CACHE_SIZE)
+def _check(email: str, check_deliverability: bool) -> Tuple[Optional[str], Optional[str]]:
+    try:
+        validated = validate_email(
+            email, check_deliverability=check_deliverability,
+            dns_resolver=_resolver() if check_deliverability else None
+        )
+    except EmailNotValidError as e:
+        return None, str(e)
+    return validated.normalized.lower(), None
+
+
+def check_email(email: str, check_deliverability: Optional[bool] = None) -> EmailCheck:
     """
     :param email: The email address to be validated and normalized.
     :type email: str
+    :param check_deliverability: Whether to look up the domain's mail servers; defaults to CHECK_DELIVERABILITY.
+    :type check_deliverability: Optional[bool]
+    :return: The outcome of the validation. Outcomes, including invalid ones, are cached.
+    :rtype: EmailCheck
+    """
+    if check_deliverability is None:
+        check_deliverability = CHECK_DELIVERABILITY
+    normalized, error = _check(email, check_deliverability)
+    return EmailCheck(email, normalized, error)
+
+
+def validate_and_normalize_email(email: str, check_deliverability: Optional[bool] = None) -> str:
+    """
+    :param email: The email address to be validated and normalized.
+    :type email: str
+    :param check_deliverability: Whether to look up the domain's mail servers; defaults to CHECK_DELIVERABILITY.
+    :type check_deliverability: Optional[bool]
     :return: The validated and normalized email address in lowercase format.
     :rtype: str
     :raises EmailNotValidError: If the provided email address is not valid.
     """
-    try:
-        validated_email = validate_email(email).normalized
-        normalized_email = validated_email.lower()
-        return normalized_email
-    except EmailNotValidError as e:
-        raise EmailNotValidError(f'Invalid email: {e}')
+    result = check_email(email, check_deliverability)
+    if not result.valid:
+        raise EmailNotValidError(f'Invalid email: {result.error}')
+    return result.normalized
+
+
+def validate_many(emails: Iterable[str], check_deliverability: Optional[bool] = None,
+                  workers: int = VALIDATION_WORKERS) -> List[EmailCheck]:
+    """
+    :param emails: The email addresses to be validated and normalized.
+    :type emails: Iterable[str]
+    :param check_deliverability: Whether to look up the domains' mail servers; defaults to CHECK_DELIVERABILITY.
+    :type check_deliverability: Optional[bool]
+    :param workers: The number of threads waiting on DNS lookups at once.
+    :type workers: int
+    :return: One outcome per address, in order. Invalid addresses do not stop the batch; each distinct
+        address is validated once.
+    :rtype: List[EmailCheck]
+    """
+    emails = list(emails)
+    if check_deliverability is None:
+        check_deliverability = CHECK_DELIVERABILITY
+    unique = list(dict.fromkeys(emails))
+
+    if check_deliverability and len(unique) > 1 and workers > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(unique))) as executor:
+            outcomes = dict(zip(unique, executor.map(lambda email: _check(email, True), unique)))
+    else:
+        # A syntax check is pure CPU work: threads would only contend for the interpreter
+        outcomes = {email: _check(email, check_deliverability) for email in unique}
+    return [EmailCheck(email, *outcomes[email]) for email in emails]
@@ -1,8 +1,16 @@
+import atexit
+import copy
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import List, Optional, TextIO
 
 LOG_NAME = 'simple_inventory.log'
 LOGGER_LEVEL = logging.INFO
+# Records waiting for the writer thread; beyond that they are dropped or the caller blocks, see setup_logging
+DEFAULT_QUEUE_SIZE = 10_000
 
 
 class LogColors:
@@ -15,7 +23,11 @@ class LogColors:
 
 
 class ColorFormatter(logging.Formatter):
-    """Custom formatter to add colors based on log level."""
+    """Custom formatter to add colors based on log level.
+
+    The record is copied before its message is colored, so handlers formatting the same record
+    afterwards never see the escape sequences.
+    """
     LEVEL_COLORS = {
         logging.DEBUG: LogColors.BLUE,
         logging.INFO: LogColors.BLUE,
@@ -26,8 +38,67 @@ class ColorFormatter(logging.Formatter):
 
     def format(self, record):
         color = self.LEVEL_COLORS.get(record.levelno, LogColors.RESET)
-        record.msg = f'{color}{record.msg}{LogColors.RESET}'
-        return super().format(record)
+        colored = copy.copy(record)
+        colored.msg = f'{color}{record.getMessage()}{LogColors.RESET}'
+        colored.args = None
+        return super().format(colored)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats every record as one JSON object per line, for log shippers and jq."""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record, self.datefmt),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """A QueueHandler for a bounded queue that either drops records or blocks when the queue is full.
+
+    Dropping keeps the logging threads from ever waiting on the log writer; the drops are counted
+    and reported when logging stops.
+    """
+
+    def __init__(self, log_queue: queue.Queue, block: bool = False):
+        super().__init__(log_queue)
+        self.block = block
+        self.dropped = 0
+
+    def enqueue(self, record):
+        if self.block:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record):
+        """Merges the arguments into the message but keeps the exception for the listener's formatters.
+
+        The stock prepare appends the traceback to the message and clears exc_info and exc_text, so
+        a formatter such as JsonLinesFormatter could no longer emit it separately. The queue stays in
+        this process, so the record is not pickled and exc_info can be kept; the traceback is then
+        rendered on the writer thread.
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[BoundedQueueHandler] = None
 
 
 def get_formatter():
@@ -37,25 +108,91 @@ def get_formatter():
     return log_format, date_format
 
 
-def setup_logging():
+def build_handlers(log_file: str = LOG_NAME, json_lines: bool = False,
+                   stream: Optional[TextIO] = None) -> List[logging.Handler]:
+    """ Creates the handlers that write the log: a rotating file and the console.
+
+    Args:
+        log_file (str): The path of the log file.
+        json_lines (bool): Write the file as JSON lines instead of plain text.
+        stream (Optional[TextIO]): The console stream. Defaults to sys.stderr.
+    """
+    log_format, date_format = get_formatter()
+
+    # File handler with log rotation
+    file_handler = RotatingFileHandler(log_file, maxBytes=10_000_000, backupCount=5)
+    if json_lines:
+        file_handler.setFormatter(JsonLinesFormatter(datefmt=date_format))
+    else:
+        file_handler.setFormatter(logging.Formatter(log_format, date_format))
+
+    # Console handler
+    console_handler = logging.StreamHandler(stream or sys.stderr)
+    console_handler.setFormatter(ColorFormatter(log_format, date_format))
+    return [file_handler, console_handler]
+
+
+def setup_logging(level: int = LOGGER_LEVEL, log_file: str = LOG_NAME, json_lines: bool = False,
+                  queue_size: int = DEFAULT_QUEUE_SIZE, block: bool = False,
+                  stream: Optional[TextIO] = None) -> QueueListener:
     """ Configures the logging system for the application.
-     Sets up the root logger to log messages to both a rotating file and the console with a specific format.
-     """
+
+    The root logger only puts records on a bounded queue; a background thread formats them and
+    writes them to a rotating file and the console. Logging calls, including those in query and
+    bot handler code, therefore never wait for file I/O or rotation. Calling it again replaces the
+    previous configuration.
+
+    Args:
+        level (int): The root logger level.
+        log_file (str): The path of the log file.
+        json_lines (bool): Write the file as JSON lines instead of plain text.
+        queue_size (int): The maximum number of records waiting to be written.
+        block (bool): When the queue is full, make the logging thread wait instead of dropping the record.
+        stream (Optional[TextIO]): The console stream. Defaults to sys.stderr.
+
+    Returns:
+        QueueListener: The running writer thread; stop_logging stops it, at the latest on exit.
+    """
+    global _listener, _queue_handler
+    stop_logging()
 
     # Get the root logger
     logger = logging.getLogger()
-    logger.setLevel(LOGGER_LEVEL)
+    logger.setLevel(level)
 
-    log_format, date_format = get_formatter()
-    file_formatter = logging.Formatter(log_format, date_format)
-    console_formatter = ColorFormatter(log_format, date_format)
+    log_queue = queue.Queue(maxsize=queue_size)
+    _queue_handler = BoundedQueueHandler(log_queue, block=block)
+    logger.addHandler(_queue_handler)
 
-    # File handler with log rotation
-    file_handler = RotatingFileHandler(LOG_NAME, maxBytes=10_000_000, backupCount=5)
-    file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+    _listener = QueueListener(log_queue, *build_handlers(log_file, json_lines, stream), respect_handler_level=True)
+    _listener.start()
+    return _listener
 
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
+
+def stop_logging() -> int:
+    """ Writes the queued records, stops the writer thread and closes its handlers.
+
+    Returns:
+        int: The number of records dropped because the queue was full.
+    """
+    global _listener, _queue_handler
+    if _listener is None:
+        return 0
+
+    logging.getLogger().removeHandler(_queue_handler)
+    _listener.stop()
+    if _queue_handler.dropped:
+        dropped = logging.makeLogRecord({
+            'name': __name__, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+            'msg': f'{_queue_handler.dropped} log records were dropped because the log queue was full.'
+        })
+        for handler in _listener.handlers:
+            handler.handle(dropped)
+    for handler in _listener.handlers:
+        handler.close()
+    dropped_count = _queue_handler.dropped
+    _listener = _queue_handler = None
+    return dropped_count
+
+
+atexit.register(stop_logging)